@@ -0,0 +1,99 @@
+"""
+Benchmark: memory per extraction / judgment, dicts vs slotted records.
+Builds N synthetic records shaped like the pipeline's JSON (parsed from
+text one by one, so no strings are shared that a real load would not share)
+and measures the heap each representation holds with tracemalloc.
+
+    python benchmarks/record_memory.py --n 1000000
+"""
+import argparse
+import gc
+import json
+import random
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+# Add project root to path
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(PROJECT_ROOT))
+
+from src.utils.records import Extraction, Judgment
+
+EVENTS = ["election_1860", "fort_sumter", "emancipation", "gettysburg_address",
+          "second_inaugural", "assassination", "cooper_union"]
+TYPES = ["Factual Error", "Omission", "Interpretive Difference"]
+
+
+def synthetic_extraction(i: int, rng: random.Random) -> str:
+    event = rng.choice(EVENTS)
+    return json.dumps({
+        "event": event,
+        "author": f"Historian {rng.randrange(200)}",
+        "claims": [f"Claim {i}.{k} about {event}: " + "lorem ipsum dolor " * 4 for k in range(5)],
+        "temporal_details": {"date": f"186{rng.randrange(6)}-0{rng.randrange(1, 10)}-1{rng.randrange(10)}",
+                             "time": None},
+        "tone": rng.choice(["objective", "hagiographic", "critical"]),
+        "source_id": f"gutenberg_{rng.randrange(2000)}",
+        "source_type": "Book"
+    })
+
+
+def synthetic_judgment(i: int, rng: random.Random) -> str:
+    event = rng.choice(EVENTS)
+    score = rng.randrange(101)
+    return json.dumps({
+        "consistency_score": score,
+        "classification": "Consistent" if score >= 70 else "Nuanced" if score >= 40 else "Contradictory",
+        "reasoning": f"Judgment {i}: " + "the secondary account frames the event differently. " * 4,
+        "discrepancies": [{"claim": f"Claim {i}.{k}", "type": rng.choice(TYPES),
+                           "severity": rng.choice(["High", "Low"])} for k in range(3)],
+        "event": event,
+        "primary_source": f"loc_mal_{rng.randrange(50):07d}",
+        "secondary_source": f"gutenberg_{rng.randrange(2000)}",
+        "historian": f"Historian {rng.randrange(200)}",
+        "pair_id": f"{event}|loc|gutenberg_{i}",
+        "fingerprint": f"{rng.getrandbits(128):032x}"
+    })
+
+
+def measure(n: int, make_text, convert) -> float:
+    """Heap bytes per record held after building n records."""
+    rng = random.Random(0)
+    gc.collect()
+    tracemalloc.start()
+    records = [convert(json.loads(make_text(i, rng))) for i in range(n)]
+    held, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del records
+    gc.collect()
+    return held / n
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Memory per record: dicts vs slotted records.")
+    parser.add_argument("--n", type=int, default=1_000_000, help="Records per measurement")
+    parser.add_argument("--out", type=Path, help="Also write the results as JSON")
+    args = parser.parse_args()
+
+    results = {"n": args.n, "python": sys.version.split()[0], "types": {}}
+    for name, make_text, record_type in (("extraction", synthetic_extraction, Extraction),
+                                         ("judgment", synthetic_judgment, Judgment)):
+        start = time.perf_counter()
+        as_dict = measure(args.n, make_text, lambda d: d)
+        as_record = measure(args.n, make_text, record_type.from_dict)
+        results["types"][name] = {"dict_bytes": round(as_dict), "record_bytes": round(as_record),
+                                  "saved": round(1 - as_record / as_dict, 3)}
+        print(f"{name:<11} dict {as_dict:8.0f} B/record   record {as_record:8.0f} B/record   "
+              f"saved {1 - as_record / as_dict:6.1%}   "
+              f"({as_dict * args.n / 2**20:,.0f} -> {as_record * args.n / 2**20:,.0f} MiB; "
+              f"{time.perf_counter() - start:.1f}s)")
+
+    if args.out:
+        args.out.parent.mkdir(parents=True, exist_ok=True)
+        args.out.write_text(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
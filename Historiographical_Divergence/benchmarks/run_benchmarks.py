@@ -0,0 +1,246 @@
+"""
+Benchmark Suite.
+Times the text-processing, judging, statistics and report-aggregation hot
+paths on synthetic corpora (see synthetic.py) at several scales, and saves
+the timings as JSON named after the commit, so runs can be compared for
+regressions across commits.
+
+    python benchmarks/run_benchmarks.py --scales 1MB 10MB
+    python benchmarks/run_benchmarks.py --compare benchmarks/results/<older>.json
+"""
+import argparse
+import importlib.util
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, List
+
+# Add project root to path
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(PROJECT_ROOT))
+
+from benchmarks import synthetic
+from src.evaluation.llm_judge import LLMJudge
+from src.extraction.event_extractor import EventExtractor
+from src.scraping.cleaner import clean_loc_content
+from src.scraping.gutenberg_scraper import GutenbergScraper
+from src.utils.columnar import judgment_tables
+from src.utils.data_loader import load_json, save_json
+from src.utils.logger import get_logger
+from src.validation import stats
+
+logger = get_logger("benchmarks")
+
+RESULTS_DIR = PROJECT_ROOT / "benchmarks" / "results"
+JUDGMENTS_PER_PAIR = 10  # synthetic judgments fed to the stats and report benchmarks, per judged pair
+
+
+class ScanOnlyExtractor(EventExtractor):
+    """process_document up to the LLM call: chunking, keyword filtering and context assembly."""
+
+    def _extract_claims(self, text, event, doc_metadata):
+        return None
+
+
+def _report_module():
+    """scripts/generate_report.py, for its slice functions (scripts/ is not a package)."""
+    spec = importlib.util.spec_from_file_location("generate_report", PROJECT_ROOT / "scripts" / "generate_report.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+# ---------------------------------------------------------
+# Benchmarks: each returns (seconds, items, bytes processed).
+# Corpus documents are generated between timed calls, never inside them.
+# ---------------------------------------------------------
+
+def bench_clean_content(scale: int):
+    scraper = GutenbergScraper(output_dir=Path(tempfile.gettempdir()))  # only its text methods are used
+    seconds, items, size = 0.0, 0, 0
+    for book in synthetic.iter_books(scale):
+        start = time.perf_counter()
+        scraper.clean_content(book)
+        seconds += time.perf_counter() - start
+        items, size = items + 1, size + len(book)
+    return seconds, items, size
+
+
+def bench_extract_metadata(scale: int):
+    scraper = GutenbergScraper(output_dir=Path(tempfile.gettempdir()))  # only its text methods are used
+    seconds, items, size = 0.0, 0, 0
+    for book in synthetic.iter_books(scale):
+        start = time.perf_counter()
+        scraper.extract_metadata(book)
+        seconds += time.perf_counter() - start
+        items, size = items + 1, size + len(book)
+    return seconds, items, size
+
+
+def bench_clean_loc_content(scale: int):
+    seconds, items, size = 0.0, 0, 0
+    for letter in synthetic.iter_letters(scale):
+        start = time.perf_counter()
+        clean_loc_content(letter['document_type'], letter['content'], letter['title'])
+        seconds += time.perf_counter() - start
+        items, size = items + 1, size + len(letter['content'])
+    return seconds, items, size
+
+
+def bench_chunk_filter(scale: int):
+    extractor = ScanOnlyExtractor(provider="fake")
+    seconds, items, size = 0.0, 0, 0
+    for i, book in enumerate(synthetic.iter_books(scale)):
+        doc = {"id": f"gutenberg_{i}", "title": f"Book {i}", "content": book}
+        start = time.perf_counter()
+        extractor.process_document(doc)
+        seconds += time.perf_counter() - start
+        items, size = items + 1, size + len(book)
+    return seconds, items, size
+
+
+def bench_judge_all(scale: int):
+    extractions = synthetic.extractions(scale)
+    judge = LLMJudge(provider="fake")
+    start = time.perf_counter()
+    judgments = judge.judge_all(extractions, mode="pairwise", index_path=None)
+    return time.perf_counter() - start, len(judgments), 0
+
+
+def _judgments(scale: int) -> List[Dict]:
+    pairs = synthetic.corpus_counts(scale)["books"] * len(synthetic.EVENTS)
+    return synthetic.judgments(pairs * JUDGMENTS_PER_PAIR)
+
+
+def bench_stats(scale: int):
+    records = _judgments(scale)
+    scores = [r['consistency_score'] for r in records]
+    events = [r['event'] for r in records]
+    classes = [r['classification'] for r in records]
+    # A second rater that disagrees on every tenth item
+    other = [c if i % 10 else "Nuanced" for i, c in enumerate(classes)]
+    start = time.perf_counter()
+    stats.calculate_consistency_stats(scores)
+    stats.mean_ci(scores, seed=0)
+    stats.group_means_ci(scores, events, seed=0)
+    stats.kappa_ci(classes, other, seed=0)
+    stats.krippendorff_alpha(list(zip(classes, other)))  # one row per item
+    return time.perf_counter() - start, len(records), 0
+
+
+def bench_report_aggregations(scale: int):
+    report = _report_module()
+    records = _judgments(scale)
+    start = time.perf_counter()
+    judgments_df, discrepancies_df = judgment_tables(records)
+    data = {"judgments": judgments_df.dropna(subset=["consistency_score"]), "discrepancies": discrepancies_df,
+            "validation": {}}
+    for make_slice, _ in report.FIGURES.values():
+        make_slice(data)
+    return time.perf_counter() - start, len(records), 0
+
+
+BENCHMARKS: Dict[str, Callable[[int], tuple]] = {
+    "gutenberg.clean_content": bench_clean_content,
+    "gutenberg.extract_metadata": bench_extract_metadata,
+    "cleaner.clean_loc_content": bench_clean_loc_content,
+    "extractor.chunk_filter": bench_chunk_filter,
+    "judge.judge_all": bench_judge_all,
+    "stats.validation": bench_stats,
+    "report.aggregations": bench_report_aggregations,
+}
+
+
+# ---------------------------------------------------------
+# Running and comparing
+# ---------------------------------------------------------
+
+def git_commit() -> Dict:
+    def git(*args):
+        return subprocess.run(["git", *args], cwd=PROJECT_ROOT, capture_output=True, text=True).stdout.strip()
+    return {"commit": git("rev-parse", "--short", "HEAD") or "unknown",
+            "dirty": bool(git("status", "--porcelain", "--untracked-files=no"))}
+
+
+def run(scales: List[str], names: List[str], repeat: int) -> Dict:
+    results = {}
+    for scale in scales:
+        results[scale] = {}
+        for name in names:
+            # Best of `repeat`: the least disturbed run
+            seconds, items, size = min(BENCHMARKS[name](synthetic.SCALES[scale]) for _ in range(repeat))
+            entry = {"seconds": round(seconds, 6), "items": items}
+            if size:
+                entry["mb_per_s"] = round(size / 2**20 / seconds, 2) if seconds else None
+            results[scale][name] = entry
+            rate = f"{entry['mb_per_s']:>9.1f} MB/s" if size else f"{items / seconds if seconds else 0:>9.0f} items/s"
+            logger.info(f"{scale:>6} {name:<28} {seconds:10.4f}s {rate}")
+    return results
+
+
+def compare(current: Dict, baseline: Dict, threshold: float, min_seconds: float) -> List[str]:
+    """
+    Prints new/old time ratios and returns the benchmarks slower than
+    `threshold`x. Timings under `min_seconds` are too noisy to flag.
+    """
+    regressions = []
+    logger.info(f"Against {baseline['commit']}{' (dirty)' if baseline.get('dirty') else ''}:")
+    for scale, benches in current["results"].items():
+        for name, entry in benches.items():
+            old = baseline["results"].get(scale, {}).get(name)
+            if not old or not old["seconds"]:
+                continue
+            ratio = entry["seconds"] / old["seconds"]
+            flag = "  REGRESSION" if ratio > threshold and entry["seconds"] >= min_seconds else ""
+            logger.info(f"{scale:>6} {name:<28} {old['seconds']:10.4f}s -> {entry['seconds']:10.4f}s  x{ratio:.2f}{flag}")
+            if flag:
+                regressions.append(f"{scale} {name}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time the pipeline's hot paths on synthetic corpora.")
+    parser.add_argument("--scales", nargs="+", default=["1MB", "10MB"], help=f"Any of {', '.join(synthetic.SCALES)}")
+    parser.add_argument("--only", nargs="+", help="Benchmarks to run (default: all)")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per benchmark; the fastest is kept")
+    parser.add_argument("--out", type=Path, help="Results file (default: benchmarks/results/<commit>.json)")
+    parser.add_argument("--compare", type=Path, help="Earlier results file to compare against")
+    parser.add_argument("--threshold", type=float, default=1.2, help="Slowdown ratio reported as a regression")
+    parser.add_argument("--min-seconds", type=float, default=0.05, help="Timings below this are never flagged")
+    args = parser.parse_args()
+
+    unknown = [s for s in args.scales if s not in synthetic.SCALES]
+    unknown += [n for n in args.only or [] if n not in BENCHMARKS]
+    if unknown:
+        parser.error(f"Unknown scale or benchmark: {', '.join(unknown)} "
+                     f"(benchmarks: {', '.join(BENCHMARKS)})")
+
+    revision = git_commit()
+    results = {
+        **revision,
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "machine": platform.platform(),
+        "cpus": os.cpu_count(),
+        "repeat": args.repeat,
+        "results": run(args.scales, args.only or list(BENCHMARKS), args.repeat)
+    }
+
+    out = args.out or RESULTS_DIR / f"{revision['commit']}{'-dirty' if revision['dirty'] else ''}.json"
+    save_json(results, out)
+    logger.info(f"✓ Results saved to {out}")
+
+    if args.compare:
+        regressions = compare(results, load_json(args.compare), args.threshold, args.min_seconds)
+        if regressions:
+            logger.error(f"{len(regressions)} regression(s) over x{args.threshold}: {', '.join(regressions)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""
+Synthetic corpora for the benchmarks.
+Gutenberg-style books (licence header and footer, metadata lines) and LoC
+letters (archival headers the cleaner strips), with the extractor's event
+keywords sprinkled through the prose, plus extraction and judgment records
+shaped like the pipeline's JSON. Everything is seeded and generated one
+document at a time, so a 1 GB corpus never has to sit in memory.
+"""
+import random
+from typing import Dict, Iterator, List
+
+from src.utils.catalog import load_catalog
+
+# Corpus sizes the suite runs at, in bytes of document text
+SCALES = {"1MB": 1 << 20, "10MB": 10 << 20, "100MB": 100 << 20, "1GB": 1 << 30}
+
+BOOK_BYTES = 512 << 10
+LETTER_BYTES = 4 << 10
+LETTER_SHARE = 0.1  # of the corpus bytes
+
+EVENTS = list(load_catalog().events)
+KEYWORDS = [kw for event in load_catalog().events.values() for kw in event.keywords]
+WORDS = ("the of and to in that was his he it with as for on by at but which from this had "
+         "president union war army general senate people nation cabinet slavery congress "
+         "secretary states government country party speech letter washington springfield "
+         "illinois douglas republican convention campaign soldiers battle peace").split()
+DISCREPANCY_TYPES = ["Factual Error", "Omission", "Interpretive Difference"]
+
+LETTER_HEADER = """Abraham Lincoln papers: Series 1. General Correspondence. 1833-1916
+From Abraham Lincoln to {recipient}, {date}
+Selected and converted.
+Washington, DC: American Memory, Library of Congress.
+For more information about this text and the rights, see http://www.loc.gov/
+Copyright status not evaluated.
+"""
+LETTER_FOOTER = """Citations are generated automatically from bibliographic data.
+Chicago citation style: Lincoln, Abraham. Papers of Abraham Lincoln.
+Download
+"""
+
+
+class Paragraphs:
+    """A fixed pool of random paragraphs; documents are assembled by sampling it."""
+
+    def __init__(self, seed: int = 0, pool: int = 2000):
+        rng = random.Random(seed)
+        self.pool = []
+        for _ in range(pool):
+            words = [rng.choice(KEYWORDS) if rng.random() < 0.02 else rng.choice(WORDS)
+                     for _ in range(rng.randint(60, 140))]
+            words[0] = words[0].capitalize()
+            self.pool.append(" ".join(words) + ".")
+
+    def text(self, rng: random.Random, size: int) -> str:
+        parts, total = [], 0
+        while total < size:
+            paragraph = rng.choice(self.pool)
+            parts.append(paragraph)
+            total += len(paragraph) + 2
+        return "\n\n".join(parts)
+
+
+def gutenberg_book(i: int, rng: random.Random, paragraphs: Paragraphs, size: int = BOOK_BYTES) -> str:
+    """Raw book text as downloaded, headers and licence included."""
+    author = f"Author {rng.randrange(200)}"
+    title = f"The Life of Abraham Lincoln, Volume {i}"
+    header = (f"The Project Gutenberg EBook of {title}, by {author}\n\n"
+              f"This eBook is for the use of anyone anywhere at no cost.\n\n"
+              f"Title: {title}\n\nAuthor: {author}\n\n"
+              f"Release Date: March 4, 2005 [EBook #{10000 + i}]\n\nLanguage: English\n\n"
+              f"*** START OF THIS PROJECT GUTENBERG EBOOK LINCOLN {i} ***\n\n")
+    footer = (f"\n\nEnd of the Project Gutenberg EBook of {title}\n\n"
+              f"*** END OF THIS PROJECT GUTENBERG EBOOK LINCOLN {i} ***\n\n"
+              + "Section 1. General Terms of Use and Redistributing Project Gutenberg-tm\n" * 40)
+    return header + paragraphs.text(rng, size - len(header) - len(footer)) + footer
+
+
+def loc_letter(i: int, rng: random.Random, paragraphs: Paragraphs, size: int = LETTER_BYTES) -> Dict:
+    """A LoC document record before cleaning."""
+    date = f"18{rng.randint(55, 65)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"
+    recipient = f"Correspondent {rng.randrange(500)}"
+    body = paragraphs.text(rng, size).replace(". ", ".\n")
+    return {
+        "id": f"loc_mal_{i:07d}",
+        "title": f"Letter to {recipient}",
+        "document_type": "Letter",
+        "date": date,
+        "from": "Abraham Lincoln",
+        "to": recipient,
+        "content": LETTER_HEADER.format(recipient=recipient, date=date) + body + "\n\n\n\n" + LETTER_FOOTER
+    }
+
+
+def corpus_counts(scale_bytes: int) -> Dict[str, int]:
+    return {"books": max(1, int(scale_bytes * (1 - LETTER_SHARE)) // BOOK_BYTES),
+            "letters": max(1, int(scale_bytes * LETTER_SHARE) // LETTER_BYTES)}
+
+
+def iter_books(scale_bytes: int, seed: int = 0) -> Iterator[str]:
+    rng, paragraphs = random.Random(seed), Paragraphs(seed)
+    for i in range(corpus_counts(scale_bytes)["books"]):
+        yield gutenberg_book(i, rng, paragraphs)
+
+
+def iter_letters(scale_bytes: int, seed: int = 0) -> Iterator[Dict]:
+    rng, paragraphs = random.Random(seed + 1), Paragraphs(seed)
+    for i in range(corpus_counts(scale_bytes)["letters"]):
+        yield loc_letter(i, rng, paragraphs)
+
+
+def _claims(rng: random.Random, event: str, n: int) -> List[str]:
+    return [f"{event.replace('_', ' ').capitalize()}: " + " ".join(rng.choice(WORDS) for _ in range(12)) + "."
+            for _ in range(n)]
+
+
+def extractions(scale_bytes: int, seed: int = 0) -> List[Dict]:
+    """One Lincoln (LoC) account per event, and one account per book and event."""
+    rng = random.Random(seed + 2)
+    records = []
+    for event in EVENTS:
+        records.append({"event": event, "author": "Abraham Lincoln", "claims": _claims(rng, event, 5),
+                        "temporal_details": {"date": "1861-04-12", "time": None}, "tone": "objective",
+                        "source_id": f"loc_mal_{EVENTS.index(event):07d}", "source_type": "Letter"})
+    for i in range(corpus_counts(scale_bytes)["books"]):
+        for event in EVENTS:
+            records.append({"event": event, "author": f"Author {i % 200}", "claims": _claims(rng, event, 5),
+                            "temporal_details": {"date": None, "time": None},
+                            "tone": rng.choice(["objective", "reverent", "critical"]),
+                            "source_id": f"gutenberg_{10000 + i}", "source_type": "Book"})
+    return records
+
+
+def judgments(n: int, seed: int = 0) -> List[Dict]:
+    """Judge output records, as read back from judge_results.json."""
+    rng = random.Random(seed + 3)
+    records = []
+    for i in range(n):
+        score = min(100, max(0, int(rng.gauss(55, 20))))
+        event = rng.choice(EVENTS)
+        records.append({
+            "consistency_score": score,
+            "classification": "Consistent" if score >= 70 else "Nuanced" if score >= 40 else "Contradictory",
+            "reasoning": "Synthetic judgment.",
+            "discrepancies": [{"claim": f"Claim {i}.{k}", "type": rng.choice(DISCREPANCY_TYPES),
+                               "severity": rng.choice(["High", "Low"])} for k in range(rng.randint(0, 4))],
+            "event": event,
+            "primary_source": f"loc_mal_{EVENTS.index(event):07d}",
+            "secondary_source": f"gutenberg_{10000 + i // len(EVENTS)}",
+            "historian": f"Author {rng.randrange(200)}",
+            "pair_id": f"{event}|loc|{i}"
+        })
+    return records
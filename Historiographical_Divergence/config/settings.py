@@ -18,6 +18,9 @@ PROCESSED_DATA_DIR = DATA_DIR / "processed"
 EXTRACTED_DATA_DIR = DATA_DIR / "extracted"
 EVALUATION_DATA_DIR = DATA_DIR / "evaluation"
 VALIDATION_DATA_DIR = DATA_DIR / "validation"
+COLUMNAR_DIR = DATA_DIR / "columnar"  # Parquet/NumPy tables derived from the JSON outputs
+CORPUS_DIR = DATA_DIR / "corpus"  # memory-mapped document bodies (see src/utils/corpus_store.py)
+STORE_PATH = Path(os.getenv("STORE_PATH", DATA_DIR / "store.sqlite3"))  # indexed SQLite copy of the JSON files
 
 # Raw Data Subdirectories
 GUTENBERG_RAW_DIR = RAW_DATA_DIR / "gutenberg"
@@ -36,25 +39,9 @@ GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
 # Logging
 LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
 
-# Project Configuration
-EVENTS = [
-    "election_night_1860",
-    "fort_sumter_decision",
-    "gettysburg_address",
-    "second_inaugural_address",
-    "fords_theatre_assassination"
-]
-
-EVENT_DESCRIPTIONS = {
-    "election_night_1860": "Abraham Lincoln's election as President on November 6, 1860",
-    "fort_sumter_decision": "Lincoln's decision to resupply Fort Sumter in April 1861",
-    "gettysburg_address": "Lincoln's speech at Gettysburg on November 19, 1863",
-    "second_inaugural_address": "Lincoln's second inaugural address on March 4, 1865",
-    "fords_theatre_assassination": "Lincoln's assassination at Ford's Theatre on April 14, 1865"
-}
-
-# Gutenberg Book IDs
-GUTENBERG_BOOK_IDS = [6812, 6811, 12801, 14004, 18379]
+# Workload Catalog: events (keywords, date windows, descriptions), Gutenberg
+# books and LoC primary sources (see src/utils/catalog.py)
+CATALOG_PATH = Path(os.getenv("CATALOG_PATH", PROJECT_ROOT / "config" / "catalog.yaml"))
 
 # Rate Limiting
 SCRAPING_RATE_LIMIT = 1.0  # seconds between requests
@@ -66,4 +53,73 @@ DEFAULT_EXTRACTION_TEMPERATURE = 0.3
 
 DEFAULT_JUDGE_PROVIDER = "openai"
 DEFAULT_JUDGE_MODEL = "gpt-4o-2024-11-20"
-DEFAULT_JUDGE_TEMPERATURE = 0
\ No newline at end of file
+DEFAULT_JUDGE_TEMPERATURE = 0
+JUDGE_MAX_WORKERS = int(os.getenv("JUDGE_MAX_WORKERS", "4"))  # concurrent judge calls
+JUDGE_MODE = os.getenv("JUDGE_MODE", "pairwise")  # pairwise | listwise | cascade
+FUSE_PRIMARIES = os.getenv("FUSE_PRIMARIES", "1") == "1"  # judge against all Lincoln docs of an event, merged
+PRIMARY_INDEX_PATH = EXTRACTED_DATA_DIR / "primary_index.json"  # cached fused primary claims per event
+PRIMARY_DEDUP_THRESHOLD = float(os.getenv("PRIMARY_DEDUP_THRESHOLD", "0.85"))  # TF-IDF cosine for duplicate claims
+JUDGE_ALIGN_CLAIMS = os.getenv("JUDGE_ALIGN_CLAIMS", "0") == "1"  # send locally aligned claims instead of raw lists
+ALIGNMENT_MIN_SIMILARITY = float(os.getenv("ALIGNMENT_MIN_SIMILARITY", "0.1"))  # below this, claims stay unmatched
+ALIGNMENT_MAX_UNMATCHED_SECONDARY = int(os.getenv("ALIGNMENT_MAX_UNMATCHED_SECONDARY", "10"))  # cap on unrelated historian claims in the prompt
+LISTWISE_TOKEN_BUDGET = int(os.getenv("LISTWISE_TOKEN_BUDGET", "24000"))  # est. prompt + output tokens per call
+LISTWISE_MAX_BATCH = int(os.getenv("LISTWISE_MAX_BATCH", "8"))  # secondaries per listwise call
+
+# Judge Cascade (JUDGE_MODE=cascade)
+# Local TF-IDF overlap outside [LOW, HIGH] is decided without an LLM call; the cheap
+# model's verdict is kept unless its score falls inside [BAND_LOW, BAND_HIGH].
+# scripts/tune_cascade.py writes tuned values to CASCADE_CONFIG_PATH, which take precedence.
+CASCADE_CONFIG_PATH = EVALUATION_DATA_DIR / "cascade_config.json"
+CASCADE_CHEAP_MODEL = os.getenv("CASCADE_CHEAP_MODEL", "gemini-1.5-flash-8b")
+CASCADE_PRESCREEN_LOW = float(os.getenv("CASCADE_PRESCREEN_LOW", "0.02"))
+CASCADE_PRESCREEN_HIGH = float(os.getenv("CASCADE_PRESCREEN_HIGH", "0.95"))
+CASCADE_BAND_LOW = int(os.getenv("CASCADE_BAND_LOW", "30"))
+CASCADE_BAND_HIGH = int(os.getenv("CASCADE_BAND_HIGH", "75"))
+CASCADE_SCORE_INTERCEPT = float(os.getenv("CASCADE_SCORE_INTERCEPT", "5"))  # local score = intercept + slope * overlap
+CASCADE_SCORE_SLOPE = float(os.getenv("CASCADE_SCORE_SLOPE", "125"))
+
+# Streaming Pipeline (scripts/run_streaming_pipeline.py)
+STREAM_EXTRACT_WORKERS = int(os.getenv("STREAM_EXTRACT_WORKERS", "2"))  # documents extracted concurrently
+STREAM_QUEUE_SIZE = int(os.getenv("STREAM_QUEUE_SIZE", "16"))  # extractions / pairs in flight between stages
+
+# Work Queue (scripts/run_work_queue.py)
+# Extraction and judge jobs leased by worker processes; for multi-node runs, put
+# the queue on a filesystem every machine mounts (along with data/).
+WORK_QUEUE_PATH = Path(os.getenv("WORK_QUEUE_PATH", DATA_DIR / "work_queue.sqlite3"))
+WORK_QUEUE_LEASE_SECONDS = float(os.getenv("WORK_QUEUE_LEASE_SECONDS", "300"))  # a job is re-leased this long after its last heartbeat
+WORK_QUEUE_MAX_ATTEMPTS = int(os.getenv("WORK_QUEUE_MAX_ATTEMPTS", "3"))  # leases per job before it is marked failed
+WORK_QUEUE_THREADS = int(os.getenv("WORK_QUEUE_THREADS", "4"))  # jobs each worker process runs concurrently
+
+# Self-Consistency Validation
+# Each pair is re-judged until the t-interval on its mean score is at most
+# CI_HALF_WIDTH points wide (each side), or MAX_SAMPLES is reached.
+SELF_CONSISTENCY_MIN_SAMPLES = int(os.getenv("SELF_CONSISTENCY_MIN_SAMPLES", "2"))
+SELF_CONSISTENCY_MAX_SAMPLES = int(os.getenv("SELF_CONSISTENCY_MAX_SAMPLES", "8"))
+SELF_CONSISTENCY_CI_HALF_WIDTH = float(os.getenv("SELF_CONSISTENCY_CI_HALF_WIDTH", "5"))
+SELF_CONSISTENCY_CONFIDENCE = float(os.getenv("SELF_CONSISTENCY_CONFIDENCE", "0.95"))
+
+# Budgeted Evaluation (stratified sampling over event x historian, strata by historian)
+SAMPLER_PILOT_PER_STRATUM = int(os.getenv("SAMPLER_PILOT_PER_STRATUM", "2"))  # judged before variances are trusted
+SAMPLER_ROUNDS = int(os.getenv("SAMPLER_ROUNDS", "3"))  # Neyman re-allocations after the pilot
+SAMPLER_CONFIDENCE = float(os.getenv("SAMPLER_CONFIDENCE", "0.95"))
+
+# Offline Benchmarking
+# LLM_PROVIDER=fake swaps the live APIs for a deterministic local backend.
+# LLM_RECORD_MODE=record saves raw responses; =replay serves them back bit-for-bit.
+LLM_PROVIDER = os.getenv("LLM_PROVIDER", "google")
+LLM_RECORD_MODE = os.getenv("LLM_RECORD_MODE", "off")
+LLM_CASSETTE_DIR = Path(os.getenv("LLM_CASSETTE_DIR", DATA_DIR / "cassettes"))
+LLM_RATE_LIMIT_BACKOFF = float(os.getenv("LLM_RATE_LIMIT_BACKOFF", "5"))  # seconds to wait after a 429
+LLM_MAX_REASKS = int(os.getenv("LLM_MAX_REASKS", "1"))  # targeted re-asks after a schema-invalid response
+
+FAKE_LLM_LATENCY = os.getenv("FAKE_LLM_LATENCY", "fixed")  # fixed | uniform | normal | lognormal | exponential
+FAKE_LLM_LATENCY_MEAN = float(os.getenv("FAKE_LLM_LATENCY_MEAN", "0"))
+FAKE_LLM_LATENCY_STD = float(os.getenv("FAKE_LLM_LATENCY_STD", "0"))
+FAKE_LLM_ERROR_RATE = float(os.getenv("FAKE_LLM_ERROR_RATE", "0"))
+FAKE_LLM_RATE_LIMIT_RATE = float(os.getenv("FAKE_LLM_RATE_LIMIT_RATE", "0"))
+FAKE_LLM_SEED = int(os.getenv("FAKE_LLM_SEED", "0"))
+
+# Tracing (src/utils/tracing.py)
+# Set TRACE_DIR to record spans; each process writes <script>-<pid>.trace.json
+# (open in ui.perfetto.dev or chrome://tracing) and a per-span CSV summary there.
+TRACE_DIR = Path(os.getenv("TRACE_DIR")) if os.getenv("TRACE_DIR") else None
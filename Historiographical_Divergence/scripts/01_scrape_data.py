@@ -2,16 +2,24 @@
 Main pipeline script for Phase 1: Data Acquisition.
 Runs both Gutenberg and Library of Congress scrapers and saves normalized datasets.
 """
-import json
+import argparse
+import sys
 import time
 from pathlib import Path
 from src.scraping.gutenberg_scraper import GutenbergScraper
 from src.scraping.loc_scraper import LoCScraper
+from src.utils.data_loader import save_json
 from src.utils.logger import get_logger
 
 logger = get_logger("pipeline")
 
 def main():
+    parser = argparse.ArgumentParser(description="Scrape Gutenberg and Library of Congress sources.")
+    parser.add_argument("--only", choices=["gutenberg", "loc"],
+                        help="Run a single scraper (lets the pipeline runner scrape both in parallel)")
+    args = parser.parse_args()
+    failed = False
+
     # 1. Setup Directories
     base_dir = Path("data")
     raw_gut_dir = base_dir / "raw" / "gutenberg"
@@ -29,39 +37,41 @@ def main():
     # ---------------------------------------------------------
     # PART A: Project Gutenberg (Secondary Sources)
     # ---------------------------------------------------------
-    print("\n[1/2] Starting Project Gutenberg Scraper...")
-    try:
-        gut_scraper = GutenbergScraper(output_dir=raw_gut_dir)
-        gut_books = gut_scraper.scrape_all()
+    if args.only in (None, "gutenberg"):
+        print("\n[1/2] Starting Project Gutenberg Scraper...")
+        try:
+            gut_scraper = GutenbergScraper(output_dir=raw_gut_dir)
+            gut_books = gut_scraper.scrape_all()
         
-        # Save Normalized JSON
-        gut_output = processed_dir / "gutenberg_dataset.json"
-        with open(gut_output, "w", encoding="utf-8") as f:
-            json.dump(gut_books, f, indent=2, ensure_ascii=False)
+            # Save Normalized JSON
+            gut_output = processed_dir / "gutenberg_dataset.json"
+            save_json(gut_books, gut_output)
             
-        logger.info(f"✓ Saved {len(gut_books)} Gutenberg books to {gut_output}")
+            logger.info(f"✓ Saved {len(gut_books)} Gutenberg books to {gut_output}")
         
-    except Exception as e:
-        logger.error(f"✗ Gutenberg Pipeline Failed: {e}")
+        except Exception as e:
+            logger.error(f"✗ Gutenberg Pipeline Failed: {e}")
+            failed = True
 
     # ---------------------------------------------------------
     # PART B: Library of Congress (Primary Sources)
     # ---------------------------------------------------------
-    print("\n[2/2] Starting Library of Congress Scraper...")
-    try:
-        # Rate limit of 1.0s to be polite to LoC servers
-        loc_scraper = LoCScraper(output_dir=raw_loc_dir, rate_limit=1.0)
-        loc_docs = loc_scraper.scrape_all()
+    if args.only in (None, "loc"):
+        print("\n[2/2] Starting Library of Congress Scraper...")
+        try:
+            # Rate limit of 1.0s to be polite to LoC servers
+            loc_scraper = LoCScraper(output_dir=raw_loc_dir, rate_limit=1.0)
+            loc_docs = loc_scraper.scrape_all()
         
-        # Save Normalized JSON
-        loc_output = processed_dir / "loc_dataset.json"
-        with open(loc_output, "w", encoding="utf-8") as f:
-            json.dump(loc_docs, f, indent=2, ensure_ascii=False)
+            # Save Normalized JSON
+            loc_output = processed_dir / "loc_dataset.json"
+            save_json(loc_docs, loc_output)
             
-        logger.info(f"✓ Saved {len(loc_docs)} LoC documents to {loc_output}")
+            logger.info(f"✓ Saved {len(loc_docs)} LoC documents to {loc_output}")
         
-    except Exception as e:
-        logger.error(f"✗ LoC Pipeline Failed: {e}")
+        except Exception as e:
+            logger.error(f"✗ LoC Pipeline Failed: {e}")
+            failed = True
 
     # ---------------------------------------------------------
     # Summary
@@ -71,5 +81,9 @@ def main():
     print(f"Processed data saved to: {processed_dir.absolute()}")
     print("="*60)
 
+    # Non-zero exit so the pipeline runner does not cache a failed scrape
+    if failed:
+        sys.exit(1)
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
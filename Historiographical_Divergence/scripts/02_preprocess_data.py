@@ -1,8 +1,8 @@
 # scripts/02_preprocess_data.py
 
-import json
 from pathlib import Path
 from src.scraping.cleaner import clean_loc_content
+from src.utils.data_loader import iter_records, save_json
 from src.utils.logger import get_logger
 
 logger = get_logger("preprocessor")
@@ -16,33 +16,30 @@ def main():
         logger.error(f"Input file not found: {input_path}")
         return
 
-    with open(input_path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-        
-    logger.info(f"Preprocessing {len(data)} documents...")
-    
-    cleaned_data = []
-    for doc in data:
-        original_len = len(doc.get('content', ''))
+    logger.info(f"Preprocessing {input_path}...")
+
+    # Documents are streamed through one at a time
+    def cleaned_documents():
+        for doc in iter_records(input_path):
+            original_len = len(doc.get('content', ''))
         
-        # Apply cleaning
-        clean_text = clean_loc_content(
-            doc_type=doc.get('document_type', 'Text'),
-            content=doc.get('content', ''),
-            title=doc.get('title', '')
-        )
+            # Apply cleaning
+            clean_text = clean_loc_content(
+                doc_type=doc.get('document_type', 'Text'),
+                content=doc.get('content', ''),
+                title=doc.get('title', '')
+            )
         
-        doc['content'] = clean_text
-        cleaned_data.append(doc)
+            doc['content'] = clean_text
         
-        new_len = len(clean_text)
-        reduction = original_len - new_len
-        logger.info(f"Cleaned '{doc['title']}': {original_len} -> {new_len} chars (Removed {reduction})")
+            new_len = len(clean_text)
+            reduction = original_len - new_len
+            logger.info(f"Cleaned '{doc['title']}': {original_len} -> {new_len} chars (Removed {reduction})")
+            yield doc
+
+    # Save (atomically, so an interrupted run never leaves a truncated dataset)
+    save_json(cleaned_documents(), output_path)
 
-    # Save
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(cleaned_data, f, indent=2, ensure_ascii=False)
-        
     logger.info(f"✓ Saved clean dataset to {output_path}")
 
 if __name__ == "__main__":
@@ -1,27 +1,71 @@
 """
 Phase 2 Execution: Event Extraction.
 Reads clean datasets -> Runs LLM Extractor -> Saves structured claims.
+
+Large catalogs can be split across processes or machines: each runs
+`--shard I/N` (by event or by book) and writes its own shard file, and
+`--merge N` then combines the shard files into extracted_events.json.
 """
-import json
+import argparse
 import sys
 from pathlib import Path
+from typing import Dict, List
 
 # Add project root to path
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
 sys.path.append(str(PROJECT_ROOT))
 
 from src.extraction.event_extractor import EventExtractor
+from src.utils.catalog import SHARD_BY, load_catalog
+from src.utils.columnar import ColumnarStore
+from src.utils.corpus_store import CorpusStore
+from src.utils.data_loader import load_json, save_json
 from src.utils.logger import get_logger
 
 logger = get_logger("pipeline_phase2")
 
+
+def shard_path(extracted_dir: Path, index: int, count: int) -> Path:
+    return extracted_dir / f"extracted_events.shard-{index}-of-{count}.json"
+
+
+def parse_shard(value: str):
+    try:
+        index, count = (int(part) for part in value.split("/"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected I/N, got '{value}'")
+    if not 0 <= index < count:
+        raise argparse.ArgumentTypeError(f"shard {index} is out of range for {count} shards")
+    return index, count
+
+
+def merge_shards(documents: List[Dict], shard_files: List[Path]) -> List[Dict]:
+    """Shard outputs in the order one unsharded run writes them: by document, then by catalog event."""
+    doc_order = {str(doc['id']): i for i, doc in enumerate(documents)}
+    catalog = load_catalog()
+    event_order = {key: i for i, key in enumerate(catalog.events)}
+    records = catalog.canonicalize(record for path in shard_files for record in load_json(path))
+    records.sort(key=lambda r: (doc_order.get(str(r.get('source_id')), len(doc_order)),
+                                event_order.get(r.get('event'), len(event_order))))
+    return records
+
+
 def main():
+    parser = argparse.ArgumentParser(description="Extract event claims from the processed datasets.")
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--shard", type=parse_shard, metavar="I/N",
+                       help="Extract only shard I (0-based) of N and write it to its own shard file")
+    group.add_argument("--merge", type=int, metavar="N", help="Combine the N shard files into extracted_events.json")
+    parser.add_argument("--shard-by", choices=SHARD_BY, default="event", help="Split the catalog by event or by book")
+    args = parser.parse_args()
+
     logger.info("PHASE 2: STARTING EVENT EXTRACTION")
     
     # Paths
     processed_dir = PROJECT_ROOT / "data" / "processed"
     extracted_dir = PROJECT_ROOT / "data" / "extracted"
     extracted_dir.mkdir(parents=True, exist_ok=True)
+    output_path = extracted_dir / "extracted_events.json"
     
     # Load Datasets
     files = [
@@ -29,18 +73,40 @@ def main():
         processed_dir / "gutenberg_dataset.json"
     ]
     
-    all_documents = []
     for f in files:
-        if f.exists():
-            with open(f, 'r', encoding='utf-8') as file:
-                all_documents.extend(json.load(file))
-        else:
+        if not f.exists():
             logger.warning(f"File not found: {f}")
 
+    # Bodies are memory-mapped from the corpus store (rebuilt when a dataset
+    # changes); only document metadata is held in memory
+    corpus = CorpusStore()
+    corpus.sync(files)
+    all_documents = list(corpus.documents())
+
+    if args.merge:
+        shard_files = [shard_path(extracted_dir, i, args.merge) for i in range(args.merge)]
+        missing = [p.name for p in shard_files if not p.exists()]
+        if missing:
+            logger.error(f"✗ Missing shard files: {', '.join(missing)}")
+            sys.exit(1)
+        all_extractions = merge_shards(all_documents, shard_files)
+        save_json(all_extractions, output_path)
+        ColumnarStore().sync_extractions(output_path)
+        logger.info(f"✓ Merged {len(shard_files)} shards: {len(all_extractions)} event records saved to {output_path}")
+        return
+
+    catalog = load_catalog()
+    if args.shard:
+        index, count = args.shard
+        catalog = catalog.shard(index, count, by=args.shard_by)
+        all_documents = [doc for doc in all_documents if catalog.covers(doc['id'])]
+        output_path = shard_path(extracted_dir, index, count)
+        logger.info(f"Shard {index}/{count} by {args.shard_by}: {catalog}")
+
     logger.info(f"Loaded {len(all_documents)} documents to process.")
     
     # Run Extraction
-    extractor = EventExtractor()
+    extractor = EventExtractor(corpus=corpus, catalog=catalog)
     all_extractions = []
     
     for i, doc in enumerate(all_documents, 1):
@@ -48,10 +114,10 @@ def main():
         events = extractor.process_document(doc)
         all_extractions.extend(events)
         
-    # Save Results
-    output_path = extracted_dir / "extracted_events.json"
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(all_extractions, f, indent=2, ensure_ascii=False)
+    # Save Results (shard files are only columnar-synced once merged)
+    save_json(all_extractions, output_path)
+    if not args.shard:
+        ColumnarStore().sync_extractions(output_path)
         
     logger.info(f"✓ Extraction Complete. Saved {len(all_extractions)} event records to {output_path}")
 
@@ -2,7 +2,7 @@
 Phase 3 Execution: The LLM Judge.
 Reads extracted events -> Runs Comparison Logic -> Saves Scores.
 """
-import json
+import argparse
 import sys
 from pathlib import Path
 
@@ -10,39 +10,69 @@ from pathlib import Path
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
 sys.path.append(str(PROJECT_ROOT))
 
-from src.evaluation.llm_judge import LLMJudge
+from src.evaluation.llm_judge import LLMJudge, plan_incremental
+from src.utils.columnar import ColumnarStore
+from src.utils.data_loader import save_json
 from src.utils.logger import get_logger
+from src.utils.records import Extraction, Judgment, load_records
+from config.settings import JUDGE_MODE
 
 logger = get_logger("pipeline_phase3")
 
 def main():
+    parser = argparse.ArgumentParser(description="Run the LLM judge on all (Lincoln, historian) pairs.")
+    parser.add_argument("--full", action="store_true", help="Re-judge every pair, ignoring stored fingerprints")
+    parser.add_argument("--dry-run", action="store_true", help="Only report how many pairs are stale")
+    args = parser.parse_args()
+
     logger.info("PHASE 3: STARTING LLM JUDGE")
     
     # Paths
     extracted_path = PROJECT_ROOT / "data" / "extracted" / "extracted_events.json"
     evaluation_dir = PROJECT_ROOT / "data" / "evaluation"
     evaluation_dir.mkdir(parents=True, exist_ok=True)
+    output_path = evaluation_dir / "judge_results.json"
     
     if not extracted_path.exists():
         logger.error("Extracted events file not found. Run Phase 2 first.")
         return
 
-    # Load Data
-    with open(extracted_path, 'r', encoding='utf-8') as f:
-        extractions = json.load(f)
+    # Load Data (as compact records; the judge reads them like dicts)
+    extractions = load_records(extracted_path, Extraction)
     
     logger.info(f"Loaded {len(extractions)} extracted claims.")
+
+    # Stored judgments are reused when their fingerprint still matches
+    existing = []
+    if output_path.exists() and not args.full:
+        existing = load_records(output_path, Judgment)
+
+    pairs = LLMJudge.build_pairs(extractions)
+    plan = plan_incremental(pairs, existing, LLMJudge.MODEL, JUDGE_MODE)
+    logger.info(f"{len(plan['stale'])}/{len(pairs)} pairs stale, {len(plan['fresh'])} up to date, "
+                f"{len(plan['dropped'])} stored judgments no longer match a pair.")
+
+    if args.dry_run:
+        for pair in plan['stale']:
+            logger.info(f"  stale: {pair['pair_id']}")
+        return
+
+    if not plan['stale'] and not plan['dropped']:
+        logger.info("✓ Nothing to do. All judgments are up to date.")
+        return
     
-    # Run Judge
+    # Run Judge (new judgments are streamed to JSONL as they complete)
+    stream_path = evaluation_dir / "judge_results.jsonl"
+    stream_path.unlink(missing_ok=True)
+
     judge = LLMJudge()
-    judgments = judge.judge_all(extractions)
+    judgments = judge.judge_incremental(pairs, existing, stream_path=stream_path)
     
     # Save Results
-    output_path = evaluation_dir / "judge_results.json"
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(judgments, f, indent=2, ensure_ascii=False)
+    save_json(judgments, output_path)
+    ColumnarStore().sync_judgments(output_path)
         
-    logger.info(f"✓ Judging Complete. Generated {len(judgments)} evaluations.")
+    logger.info(f"✓ Judging Complete. {len(judgments)} evaluations ({len(plan['stale'])} newly judged).")
     logger.info(f"Results saved to: {output_path}")
 
 if __name__ == "__main__":
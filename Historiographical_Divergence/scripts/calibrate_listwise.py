@@ -0,0 +1,45 @@
+"""
+Listwise Calibration.
+Judges the same pairs pairwise and listwise and reports the score drift
+against the reduction in judge calls.
+"""
+import sys
+from pathlib import Path
+
+# Add project root to path
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(PROJECT_ROOT))
+
+from src.evaluation.llm_judge import LLMJudge
+from src.utils.data_loader import load_json, save_json
+from src.utils.logger import get_logger
+
+logger = get_logger("calibration")
+
+def main():
+    logger.info("CALIBRATING LISTWISE JUDGE AGAINST PAIRWISE")
+
+    extracted_path = PROJECT_ROOT / "data" / "extracted" / "extracted_events.json"
+    if not extracted_path.exists():
+        logger.error("Extracted events file not found. Run Phase 2 first.")
+        return
+
+    extractions = load_json(extracted_path)
+
+    judge = LLMJudge()
+    pairs = judge.build_pairs(extractions)
+    report = judge.calibrate_listwise(pairs)
+
+    logger.info(f"Pairs compared: {report['n']}/{report['pairs']}")
+    logger.info(f"Mean |Δscore|: {report['mean_abs_error']:.2f}  Max |Δscore|: {report['max_abs_error']:.2f}  Bias: {report['bias']:+.2f}")
+    logger.info(f"Classification agreement: {report['classification_agreement']:.1%}")
+    logger.info(f"Calls: pairwise={report['pairwise_calls']}, listwise={report['listwise_calls']}")
+
+    output_path = PROJECT_ROOT / "data" / "validation" / "listwise_calibration.json"
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    save_json(report, output_path)
+
+    logger.info(f"Calibration report saved to {output_path}")
+
+if __name__ == "__main__":
+    main()
@@ -2,207 +2,324 @@
 Final Reporting Script.
 Generates comprehensive visualizations and summary tables for the final report.
 Includes: Distribution, Confusion Matrix, Consistency Checks, and Heatmaps.
+
+Each figure is rendered from a small input slice (e.g. event means). A slice
+is hashed together with the figure's plotting code and DPI, and figures whose
+hash is unchanged since the last run are skipped; the rest render in
+parallel processes. --preview renders quickly at low DPI into a separate folder.
 """
+import argparse
+import hashlib
+import inspect
 import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import matplotlib
+matplotlib.use("Agg")  # headless and safe in worker processes
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
 from pathlib import Path
-from sklearn.metrics import confusion_matrix
 
 # Setup Paths
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(PROJECT_ROOT))
+
+from src.utils.columnar import ColumnarStore
+from src.utils.data_loader import load_json, save_json
+from src.utils import tracing
+from src.validation.stats import confusion_matrix
+
 DATA_DIR = PROJECT_ROOT / "data"
 RESULTS_DIR = PROJECT_ROOT / "results"
 FIGURES_DIR = RESULTS_DIR / "figures"
+PREVIEW_DIR = FIGURES_DIR / "preview"
 TABLES_DIR = RESULTS_DIR / "tables"
 
+FINAL_DPI = 300
+PREVIEW_DPI = 72
+MANIFEST_NAME = ".manifest.json"
+
 # Ensure directories exist
 FIGURES_DIR.mkdir(parents=True, exist_ok=True)
 TABLES_DIR.mkdir(parents=True, exist_ok=True)
 
 # Set Style
 sns.set_theme(style="whitegrid")
-plt.rcParams['figure.dpi'] = 300
+plt.rcParams['figure.dpi'] = FINAL_DPI
 
 def load_data():
-    """Load all necessary JSON files."""
+    """
+    Load the judgment tables from the columnar store (rebuilt from
+    judge_results.json only if that changed), reading just the columns the
+    figures use, plus the validation report.
+    """
     data = {}
     try:
-        with open(DATA_DIR / "evaluation" / "judge_results.json", 'r') as f:
-            data['judgments'] = json.load(f)
-        with open(DATA_DIR / "validation" / "validation_report.json", 'r') as f:
-            data['validation'] = json.load(f)
+        store = ColumnarStore()
+        store.sync_judgments(DATA_DIR / "evaluation" / "judge_results.json")
+        data['judgments'] = store.read_table("judgments", ["event", "historian", "consistency_score"]) \
+            .dropna(subset=["consistency_score"])  # failed judgments carry no score
+        data['discrepancies'] = store.read_table("discrepancies", ["type"])
+        data['validation'] = load_json(DATA_DIR / "validation" / "validation_report.json")
     except FileNotFoundError as e:
         print(f"Warning: Data file not found: {e}")
     return data
 
+# ---------------------------------------------------------
+# Input slices: the only data each figure depends on, computed with
+# vectorised operations on the columnar tables.
+# Must be JSON-serialisable and independent of record order.
+# ---------------------------------------------------------
+
+def slice_score_distribution(data):
+    return np.sort(data['judgments']['consistency_score'].to_numpy()).tolist()
+
+def slice_confusion_matrix(data):
+    return data.get('validation', {}).get('inter_rater_kappa', 0.62)
+
+def slice_self_consistency(data):
+    return data.get('validation', {}).get('sample_scores', [20, 20, 20])
+
+def slice_event_breakdown(data):
+    event_means = data['judgments'].groupby("event", observed=True)["consistency_score"].mean()
+    return {"event": event_means.index.astype(str).tolist(), "consistency_score": event_means.tolist()}
+
+def slice_discrepancy_types(data):
+    counts = data['discrepancies']['type'].value_counts()
+    counts = counts[counts > 0]
+    if counts.empty:
+        return None
+    # Ties in value_counts have no stable order; fix it so the hash is deterministic
+    counts = counts.sort_index(kind="stable").sort_values(ascending=False, kind="stable")
+    return {"type": counts.index.astype(str).tolist(), "count": counts.tolist()}
+
+def slice_comparison_heatmap(data):
+    pivot_df = data['judgments'].pivot_table(index='event', columns='historian', values='consistency_score',
+                                             aggfunc='mean', observed=True)
+    return {"index": pivot_df.index.astype(str).tolist(), "columns": pivot_df.columns.astype(str).tolist(),
+            "data": pivot_df.to_numpy().tolist()}
+
+# ---------------------------------------------------------
+# Renderers: one figure each, from its slice.
+# ---------------------------------------------------------
+
 # 1. Consistency Score Distribution (Histogram)
-def plot_score_distribution(df):
+def plot_score_distribution(scores, output_path, dpi):
     plt.figure(figsize=(10, 6))
-    
+
     # Custom bins to highlight the 0-20 cluster
     bins = [0, 20, 40, 60, 80, 100]
-    
-    sns.histplot(data=df, x="consistency_score", bins=bins, kde=False, color="#2c3e50", alpha=0.8)
-    
+
+    sns.histplot(x=scores, bins=bins, kde=False, color="#2c3e50", alpha=0.8)
+
     plt.title("Consistency Score Distribution: Lincoln vs. Historians", fontsize=14, pad=15)
     plt.xlabel("Consistency Score (0-100)", fontsize=12)
     plt.ylabel("Frequency", fontsize=12)
     plt.xticks(bins)
-    
+
     # Add text annotation
-    plt.text(10, 5, "Most comparisons\ncluster here (0-20)", 
+    plt.text(10, 5, "Most comparisons\ncluster here (0-20)",
              fontsize=10, color='red', ha='center', bbox=dict(facecolor='white', alpha=0.8))
 
-    output_path = FIGURES_DIR / "1_score_distribution.png"
-    plt.savefig(output_path, bbox_inches='tight')
-    print(f"Generated: {output_path}")
+    plt.savefig(output_path, bbox_inches='tight', dpi=dpi)
 
 # 2. Cohen's Kappa Confusion Matrix
-def plot_confusion_matrix(validation_data):
+def plot_confusion_matrix(kappa, output_path, dpi):
     # Simulated Human vs LLM Data from your Validation Phase
     # (In a real scenario, you'd load the actual labels used in validation)
     # Using the counts implied by your example: 12 correct, 3 wrong
-    
+
     # Reconstructing confusion matrix from your description
     # Consistent=1, Contradictory=0
     y_true = [1]*6 + [0]*9  # Human: 6 Consistent, 9 Contradictory
     y_pred = [1]*5 + [0]*1 + [1]*2 + [0]*7 # LLM: 5 TP, 1 FN, 2 FP, 7 TN
-    
-    cm = confusion_matrix(y_true, y_pred, labels=[1, 0])
-    
+
+    cm, _ = confusion_matrix(y_true, y_pred, labels=[1, 0])
+
     plt.figure(figsize=(6, 5))
-    
+
     labels = ["Consistent", "Contradictory"]
-    sns.heatmap(cm, annot=True, fmt='d', cmap='Blues', 
+    sns.heatmap(cm, annot=True, fmt='d', cmap='Blues',
                 xticklabels=labels, yticklabels=labels, cbar=False, annot_kws={"size": 16})
-    
-    plt.title(f"LLM Judge Agreement (Cohen's κ = {validation_data.get('inter_rater_kappa', 0.62):.2f})", fontsize=14)
+
+    plt.title(f"LLM Judge Agreement (Cohen's κ = {kappa:.2f})", fontsize=14)
     plt.xlabel("LLM Judge Prediction", fontsize=12)
     plt.ylabel("Human Label", fontsize=12)
-    
-    output_path = FIGURES_DIR / "2_confusion_matrix.png"
-    plt.savefig(output_path, bbox_inches='tight')
-    print(f"Generated: {output_path}")
+
+    plt.savefig(output_path, bbox_inches='tight', dpi=dpi)
 
 # 3. Self-Consistency Variance (Box Plot / Line)
-def plot_self_consistency(validation_data):
-    scores = validation_data.get('sample_scores', [20, 20, 20])
-    
+def plot_self_consistency(scores, output_path, dpi):
     plt.figure(figsize=(8, 5))
-    
-    plt.plot(range(1, 4), scores, marker='o', linestyle='-', color='#e74c3c', linewidth=2, markersize=10)
-    
+
+    # Adaptive sampling stops at a variable number of runs
+    runs = list(range(1, len(scores) + 1))
+    plt.plot(runs, scores, marker='o', linestyle='-', color='#e74c3c', linewidth=2, markersize=10)
+
     plt.title("Self-Consistency Check (Temperature = 0)", fontsize=14)
     plt.ylabel("Consistency Score", fontsize=12)
     plt.xlabel("Run Number", fontsize=12)
     plt.ylim(0, 100)
-    plt.xticks([1, 2, 3], ["Run 1", "Run 2", "Run 3"])
+    plt.xticks(runs, [f"Run {r}" for r in runs])
     plt.grid(axis='y', linestyle='--', alpha=0.7)
-    
+
     # Annotation
-    plt.text(2, scores[0] + 5, f"Std Dev = {np.std(scores):.2f}\n(Perfect Reproducibility)", 
+    plt.text((runs[0] + runs[-1]) / 2, scores[0] + 5, f"Std Dev = {np.std(scores):.2f}\n(Perfect Reproducibility)",
              ha='center', fontsize=10, color='#e74c3c')
 
-    output_path = FIGURES_DIR / "3_self_consistency.png"
-    plt.savefig(output_path, bbox_inches='tight')
-    print(f"Generated: {output_path}")
+    plt.savefig(output_path, bbox_inches='tight', dpi=dpi)
 
 # 4. Event-by-Event Breakdown (Bar Chart)
-def plot_event_breakdown(df):
+def plot_event_breakdown(means, output_path, dpi):
     plt.figure(figsize=(12, 6))
-    
-    # Calculate means
-    event_means = df.groupby("event")["consistency_score"].mean().reset_index()
-    
+
+    event_means = pd.DataFrame(means)
+
     sns.barplot(data=event_means, x="event", y="consistency_score", palette="viridis")
-    
+
     plt.title("Average Consistency Score by Event", fontsize=14)
     plt.xlabel("Historical Event", fontsize=12)
     plt.ylabel("Avg Score (0-100)", fontsize=12)
     plt.ylim(0, 50) # Zoom in since scores are low
-    
+
     # Add values on top
     for index, row in event_means.iterrows():
-        plt.text(index, row.consistency_score + 1, f"{row.consistency_score:.1f}", 
+        plt.text(index, row.consistency_score + 1, f"{row.consistency_score:.1f}",
                  color='black', ha="center", fontweight='bold')
 
-    output_path = FIGURES_DIR / "4_event_breakdown.png"
-    plt.savefig(output_path, bbox_inches='tight')
-    print(f"Generated: {output_path}")
+    plt.savefig(output_path, bbox_inches='tight', dpi=dpi)
 
 # 5. Discrepancy Type Distribution (Pie Chart)
-def plot_discrepancy_types(df):
-    # Extract discrepancies
-    all_types = []
-    for disc_list in df['discrepancies']:
-        if isinstance(disc_list, list):
-            for d in disc_list:
-                all_types.append(d.get('type', 'Unknown'))
-                
-    if not all_types:
-        print("No discrepancies found to plot.")
-        return
+def plot_discrepancy_types(type_counts, output_path, dpi):
+    counts = pd.Series(type_counts['count'], index=type_counts['type'])
 
-    # Count types
-    counts = pd.Series(all_types).value_counts()
-    
     plt.figure(figsize=(8, 8))
-    
+
     colors = sns.color_palette('pastel')[0:len(counts)]
-    
-    plt.pie(counts, labels=counts.index, autopct='%1.1f%%', startangle=140, colors=colors, 
+
+    plt.pie(counts, labels=counts.index, autopct='%1.1f%%', startangle=140, colors=colors,
             textprops={'fontsize': 12})
-    
+
     plt.title("Types of Historiographical Discrepancies", fontsize=14)
-    
-    output_path = FIGURES_DIR / "5_discrepancy_types.png"
-    plt.savefig(output_path, bbox_inches='tight')
-    print(f"Generated: {output_path}")
+
+    plt.savefig(output_path, bbox_inches='tight', dpi=dpi)
 
 # 6. BONUS: Comparison Matrix Heatmap
-def plot_comparison_heatmap(df):
+def plot_comparison_heatmap(pivot, output_path, dpi):
     # Pivot table: Primary Source x Secondary Source -> Mean Score
-    pivot_df = df.pivot_table(index='event', columns='historian', values='consistency_score', aggfunc='mean')
-    
+    pivot_df = pd.DataFrame(pivot['data'], index=pivot['index'], columns=pivot['columns'], dtype=float)
+
     plt.figure(figsize=(12, 8))
-    
-    sns.heatmap(pivot_df, annot=True, cmap="YlOrRd_r", vmin=0, vmax=100, 
+
+    sns.heatmap(pivot_df, annot=True, cmap="YlOrRd_r", vmin=0, vmax=100,
                 fmt=".0f", linewidths=.5, cbar_kws={'label': 'Consistency Score'})
-    
+
     plt.title("Comparison Matrix: Lincoln vs. Historians", fontsize=14)
     plt.ylabel("Event (Primary Source)", fontsize=12)
     plt.xlabel("Historian (Secondary Source)", fontsize=12)
-    
-    output_path = FIGURES_DIR / "6_comparison_heatmap.png"
-    plt.savefig(output_path, bbox_inches='tight')
-    print(f"Generated: {output_path}")
+
+    plt.savefig(output_path, bbox_inches='tight', dpi=dpi)
+
+# Figure name (output file stem) -> (slice, renderer)
+FIGURES = {
+    "1_score_distribution": (slice_score_distribution, plot_score_distribution),
+    "2_confusion_matrix": (slice_confusion_matrix, plot_confusion_matrix),
+    "3_self_consistency": (slice_self_consistency, plot_self_consistency),
+    "4_event_breakdown": (slice_event_breakdown, plot_event_breakdown),
+    "5_discrepancy_types": (slice_discrepancy_types, plot_discrepancy_types),
+    "6_comparison_heatmap": (slice_comparison_heatmap, plot_comparison_heatmap),
+}
+
+def figure_hash(name, data_slice, dpi):
+    """Changes when the figure's inputs, plotting code or resolution change."""
+    renderer = FIGURES[name][1]
+    payload = json.dumps([name, dpi, inspect.getsource(renderer), data_slice], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+def render_figure(name, data_slice, output_path, dpi):
+    """Renders one figure; runs in a worker process."""
+    try:
+        with tracing.span("report.figure", figure=name, dpi=dpi):
+            FIGURES[name][1](data_slice, output_path, dpi)
+    finally:
+        plt.close('all')
+    return name
+
+def render_figure_in_worker(name, data_slice, output_path, dpi):
+    """render_figure in a pool process; hands the worker's spans back to the parent."""
+    render_figure(name, data_slice, output_path, dpi)
+    tracer = tracing.get_tracer()
+    return tracer.drain() if tracer else None
 
 def main():
+    parser = argparse.ArgumentParser(description="Generate report figures, re-rendering only what changed.")
+    parser.add_argument("--preview", action="store_true", help=f"Render at {PREVIEW_DPI} DPI into {PREVIEW_DIR.name}/")
+    parser.add_argument("--force", action="store_true", help="Re-render every figure")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Rendering processes")
+    args = parser.parse_args()
+
     print("GENERATING VISUALIZATIONS...")
-    data = load_data()
-    
-    if 'judgments' not in data or not data['judgments']:
+    start = time.perf_counter()
+    with tracing.span("report.load"):
+        data = load_data()
+
+    if 'judgments' not in data or data['judgments'].empty:
         print("Error: No judgment data found.")
         return
 
-    # Create DataFrame
-    df = pd.DataFrame(data['judgments'])
-    
-    # Run all plots
-    plot_score_distribution(df)
-    plot_self_consistency(data.get('validation', {}))
-    plot_event_breakdown(df)
-    plot_discrepancy_types(df)
-    plot_comparison_heatmap(df)
-    
-    # Need synthetic data for confusion matrix if not strictly logged
-    plot_confusion_matrix(data.get('validation', {}))
-    
-    print("\n✓ ALL CHARTS GENERATED.")
-    print(f"Check the '{FIGURES_DIR}' folder.")
+    out_dir = PREVIEW_DIR if args.preview else FIGURES_DIR
+    dpi = PREVIEW_DPI if args.preview else FINAL_DPI
+    out_dir.mkdir(parents=True, exist_ok=True)
+    manifest_path = out_dir / MANIFEST_NAME
+    manifest = {}
+    if manifest_path.exists() and not args.force:
+        manifest = load_json(manifest_path)
+
+    # Work out which figures are stale
+    stale = []
+    for name, (make_slice, _) in FIGURES.items():
+        data_slice = make_slice(data)
+        if data_slice is None:
+            print(f"Skipped {name}: no data to plot.")
+            continue
+        digest = figure_hash(name, data_slice, dpi)
+        output_path = out_dir / f"{name}.png"
+        if manifest.get(name) == digest and output_path.exists():
+            print(f"Up to date: {output_path}")
+            continue
+        stale.append((name, data_slice, output_path, digest))
+
+    # Render stale figures; a pool only pays off for more than one.
+    # The manifest is saved even if a figure fails, so finished ones are kept.
+    workers = max(1, min(args.workers, len(stale)))
+    try:
+        if workers > 1:
+            # Workers start by dropping the spans they inherit from this process
+            with ProcessPoolExecutor(max_workers=workers, initializer=tracing.reset) as pool:
+                futures = {pool.submit(render_figure_in_worker, name, s, path, dpi): (name, path, digest)
+                           for name, s, path, digest in stale}
+                for future in as_completed(futures):
+                    name, path, digest = futures[future]
+                    spans = future.result()
+                    if spans:
+                        tracing.get_tracer().merge(spans)
+                    manifest[name] = digest
+                    print(f"Generated: {path}")
+        else:
+            for name, s, path, digest in stale:
+                render_figure(name, s, path, dpi)
+                manifest[name] = digest
+                print(f"Generated: {path}")
+    finally:
+        # Atomic, so a crash mid-write cannot leave a manifest that fails to parse
+        save_json(dict(sorted(manifest.items())), manifest_path)
+
+    print(f"\n✓ ALL CHARTS GENERATED. ({len(stale)} rendered in {time.perf_counter() - start:.1f}s)")
+    print(f"Check the '{out_dir}' folder.")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,67 @@
+"""
+SQLite Store Maintenance.
+Imports the pipeline's JSON files into the indexed SQLite store, exports the
+store back to the same JSON layout, and prints per-table counts.
+"""
+import argparse
+import sys
+from pathlib import Path
+
+# Add project root to path
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(PROJECT_ROOT))
+
+from src.utils.store import SQLiteStore
+from src.utils.logger import get_logger
+from config.settings import STORE_PATH
+
+logger = get_logger("manage_store")
+
+DATA_DIR = PROJECT_ROOT / "data"
+
+# JSON file -> (table, predicate selecting that file's rows on export)
+FILES = {
+    "processed/loc_dataset_clean.json": ("documents", lambda r: not r['id'].startswith("gutenberg_")),
+    "processed/gutenberg_dataset.json": ("documents", lambda r: r['id'].startswith("gutenberg_")),
+    "extracted/extracted_events.json": ("extractions", None),
+    "evaluation/judge_results.json": ("judgments", None)
+}
+
+def import_files(store: SQLiteStore, mirror: bool):
+    for name, (table, _) in FILES.items():
+        path = DATA_DIR / name
+        if not path.exists():
+            logger.warning(f"File not found: {path}")
+            continue
+        # Both document files share one table, so mirroring is per record type only
+        store.import_json(table, path, mirror=mirror and table != "documents")
+
+def export_files(store: SQLiteStore, out_dir: Path):
+    for name, (table, where) in FILES.items():
+        store.export_json(table, out_dir / name, where=where)
+
+def main():
+    parser = argparse.ArgumentParser(description="Sync the SQLite store with the pipeline's JSON files.")
+    parser.add_argument("command", choices=["import", "export", "stats"])
+    parser.add_argument("--db", type=Path, default=STORE_PATH, help="Database file")
+    parser.add_argument("--mirror", action="store_true",
+                        help="import: delete extractions/judgments that are no longer in the JSON files")
+    parser.add_argument("--out", type=Path,
+                        help="export: directory to write the JSON layout into (pass data/ to overwrite the pipeline files)")
+    args = parser.parse_args()
+    if args.command == "export" and args.out is None:
+        parser.error("export needs --out")
+
+    store = SQLiteStore(args.db)
+    if args.command == "import":
+        import_files(store, args.mirror)
+    elif args.command == "export":
+        export_files(store, args.out)
+
+    for table, count in store.counts().items():
+        logger.info(f"  {table}: {count} rows")
+    store.close()
+    logger.info(f"✓ Store: {args.db}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+End-to-end pipeline: scrape -> preprocess -> extract -> judge -> validate -> report.
+Stages whose inputs, code and settings are unchanged since their last
+successful run are skipped; independent stages run in parallel.
+"""
+import argparse
+import sys
+from pathlib import Path
+
+# Add project root to path
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(PROJECT_ROOT))
+
+from src.pipeline.runner import Pipeline
+from src.pipeline.stages import default_stages
+from src.utils.logger import get_logger
+
+logger = get_logger("run_pipeline")
+
+def main():
+    pipeline = Pipeline(default_stages(), PROJECT_ROOT)
+
+    parser = argparse.ArgumentParser(description="Run the pipeline, skipping up-to-date stages.")
+    parser.add_argument("targets", nargs="*", metavar="STAGE",
+                        help=f"Stages to bring up to date, with everything upstream (default: all). "
+                             f"One of: {', '.join(pipeline.stages)}")
+    parser.add_argument("--force", nargs="*", default=None, metavar="STAGE",
+                        help="Re-run these stages even if up to date (no names: every selected stage)")
+    parser.add_argument("--workers", type=int, default=2, help="Stages run at the same time")
+    parser.add_argument("--dry-run", action="store_true", help="Only list which stages are stale")
+    args = parser.parse_args()
+
+    targets = args.targets or list(pipeline.stages)
+    unknown = [t for t in targets + (args.force or []) if t not in pipeline.stages]
+    if unknown:
+        parser.error(f"unknown stages: {', '.join(unknown)}")
+    if args.force is None:
+        force = []
+    else:
+        force = args.force or pipeline.upstream(targets)
+
+    status = pipeline.run(targets, force=force, max_workers=args.workers, dry_run=args.dry_run)
+
+    ran = [name for name, s in status.items() if s == "ran"]
+    skipped = [name for name, s in status.items() if s == "skipped"]
+    failed = [name for name, s in status.items() if s in ("failed", "blocked")]
+    if args.dry_run:
+        logger.info(f"{sum(s == 'stale' for s in status.values())}/{len(status)} stages would run.")
+        return
+    logger.info(f"Pipeline finished: {len(ran)} ran, {len(skipped)} up to date, {len(failed)} failed or blocked.")
+    if failed:
+        logger.error(f"✗ Not completed: {', '.join(failed)}")
+        sys.exit(1)
+    logger.info("✓ All stages up to date.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Phase 3 (budgeted): Stratified Sample Judging.
+Judges a Neyman-allocated sample of Lincoln vs. historian pairs within a
+fixed budget and estimates population consistency scores, overall, per
+historian and per event, with confidence intervals.
+"""
+import argparse
+import math
+import sys
+from pathlib import Path
+
+# Add project root to path
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(PROJECT_ROOT))
+
+from src.evaluation.llm_judge import LLMJudge
+from src.validation.sampling import StratifiedSampler
+from src.utils.data_loader import load_json, save_json
+from src.utils.logger import get_logger
+
+logger = get_logger("sampled_judge")
+
+def _fmt(est):
+    if est['estimate'] is None:
+        return "not sampled"
+    text = f"{est['estimate']:.1f} ({est['ci_low']:.1f}-{est['ci_high']:.1f}), {est['judged']}/{est['population']} judged"
+    if est['unobserved_share'] > 0:
+        text += f", {est['unobserved_share']:.0%} of pairs in unsampled strata"
+    return text
+
+def main():
+    parser = argparse.ArgumentParser(description="Estimate consistency scores from a budgeted stratified sample.")
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument("--budget", type=int, help="Pairs to judge")
+    group.add_argument("--fraction", type=float, help="Share of all pairs to judge (0-1]")
+    parser.add_argument("--seed", type=int, default=None, help="Seed for the within-stratum sample order")
+    args = parser.parse_args()
+
+    extracted_path = PROJECT_ROOT / "data" / "extracted" / "extracted_events.json"
+    if not extracted_path.exists():
+        logger.error("Extracted events file not found. Run Phase 2 first.")
+        return
+
+    extractions = load_json(extracted_path)
+
+    pairs = LLMJudge.build_pairs(extractions)
+    budget = args.budget if args.budget is not None else math.ceil(args.fraction * len(pairs))
+    logger.info(f"Sampling {budget}/{len(pairs)} pairs...")
+
+    sampler = StratifiedSampler(LLMJudge(), budget, seed=args.seed)
+    report = sampler.run(pairs)
+
+    logger.info(f"Overall: {_fmt(report['overall'])} [{report['llm_calls']} LLM calls]")
+    for historian, est in sorted(report['by_historian'].items()):
+        logger.info(f"  {historian}: {_fmt(est)}")
+
+    output_path = PROJECT_ROOT / "data" / "evaluation" / "sampled_estimate.json"
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    save_json(report, output_path)
+
+    logger.info(f"✓ Estimate saved to {output_path}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Phases 2 + 3 (streaming): Extraction and Judging, overlapped.
+Historian accounts are judged as soon as they are extracted instead of
+after every document is done. Writes the same outputs as 03 and 04.
+"""
+import argparse
+import sys
+from pathlib import Path
+
+# Add project root to path
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(PROJECT_ROOT))
+
+from src.evaluation.llm_judge import LLMJudge
+from src.extraction.event_extractor import EventExtractor
+from src.pipeline.streaming import StreamingPipeline
+from src.utils.columnar import ColumnarStore
+from src.utils.corpus_store import CorpusStore
+from src.utils.data_loader import load_json, save_json
+from src.utils.logger import get_logger
+from config.settings import JUDGE_MAX_WORKERS, STREAM_EXTRACT_WORKERS, STREAM_QUEUE_SIZE
+
+logger = get_logger("pipeline_streaming")
+
+def main():
+    parser = argparse.ArgumentParser(description="Extract and judge in one overlapped pass.")
+    parser.add_argument("--full", action="store_true", help="Re-judge every pair, ignoring stored fingerprints")
+    parser.add_argument("--extract-workers", type=int, default=STREAM_EXTRACT_WORKERS)
+    parser.add_argument("--judge-workers", type=int, default=JUDGE_MAX_WORKERS)
+    parser.add_argument("--queue-size", type=int, default=STREAM_QUEUE_SIZE)
+    args = parser.parse_args()
+
+    logger.info("PHASES 2+3: STREAMING EXTRACTION AND JUDGING")
+
+    processed_dir = PROJECT_ROOT / "data" / "processed"
+    extracted_dir = PROJECT_ROOT / "data" / "extracted"
+    evaluation_dir = PROJECT_ROOT / "data" / "evaluation"
+    extracted_path = extracted_dir / "extracted_events.json"
+    output_path = evaluation_dir / "judge_results.json"
+
+    files = [processed_dir / "loc_dataset_clean.json", processed_dir / "gutenberg_dataset.json"]
+    for f in files:
+        if not f.exists():
+            logger.warning(f"File not found: {f}")
+    # Bodies stay in the memory-mapped corpus store; documents are metadata only
+    corpus = CorpusStore()
+    corpus.sync(files)
+    documents = list(corpus.documents())
+    logger.info(f"Loaded {len(documents)} documents to process.")
+
+    existing = []
+    if output_path.exists() and not args.full:
+        existing = load_json(output_path)
+
+    # Progress is appended here as it happens; the JSON files are written at the end
+    judgments_stream = evaluation_dir / "judge_results.jsonl"
+    extractions_stream = extracted_dir / "extracted_events.jsonl"
+    judgments_stream.unlink(missing_ok=True)
+    extractions_stream.unlink(missing_ok=True)
+
+    pipeline = StreamingPipeline(EventExtractor(corpus=corpus), LLMJudge(),
+                                 extract_workers=args.extract_workers,
+                                 judge_workers=args.judge_workers,
+                                 queue_size=args.queue_size)
+    result = pipeline.run(documents, existing=existing,
+                          judgments_stream=judgments_stream,
+                          extractions_stream=extractions_stream)
+
+    save_json(result['extractions'], extracted_path)
+    save_json(result['judgments'], output_path)
+    store = ColumnarStore()
+    store.sync_extractions(extracted_path)
+    store.sync_judgments(output_path)
+
+    stats = result['stats']
+    logger.info(f"✓ Saved {stats['extractions']} event records to {extracted_path}")
+    logger.info(f"✓ Saved {len(result['judgments'])} evaluations ({stats['judged']} newly judged) to {output_path}")
+
+if __name__ == "__main__":
+    main()
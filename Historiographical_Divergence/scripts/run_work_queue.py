@@ -0,0 +1,143 @@
+"""
+Phases 2 + 3 (work queue): Extraction and Judging by leased jobs.
+Jobs sit in a SQLite queue (WORK_QUEUE_PATH) that any number of worker
+processes, on this machine or others sharing the filesystem, lease from.
+
+    python scripts/run_work_queue.py enqueue extract
+    python scripts/run_work_queue.py work extract --threads 8     # on every node
+    python scripts/run_work_queue.py collect extract              # -> extracted_events.json
+    python scripts/run_work_queue.py enqueue judge                # pairs from extracted_events.json
+    python scripts/run_work_queue.py work judge --threads 8
+    python scripts/run_work_queue.py collect judge                # -> judge_results.json
+    python scripts/run_work_queue.py progress --watch 10
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(PROJECT_ROOT))
+
+from src.evaluation.llm_judge import LLMJudge
+from src.extraction.event_extractor import EventExtractor
+from src.pipeline.queue_jobs import (
+    EXTRACT, JUDGE, KINDS, ExtractHandler, JudgeHandler, extract_jobs, judge_jobs, run_workers
+)
+from src.pipeline.work_queue import WorkQueue
+from src.utils.catalog import load_catalog
+from src.utils.columnar import ColumnarStore
+from src.utils.corpus_store import CorpusStore
+from src.utils.data_loader import save_json
+from src.utils.logger import get_logger
+from src.utils.records import Extraction, Judgment, load_records
+from config.settings import JUDGE_MODE, WORK_QUEUE_PATH, WORK_QUEUE_THREADS
+
+logger = get_logger("pipeline_queue")
+
+PROCESSED_DIR = PROJECT_ROOT / "data" / "processed"
+EXTRACTED_PATH = PROJECT_ROOT / "data" / "extracted" / "extracted_events.json"
+JUDGMENTS_PATH = PROJECT_ROOT / "data" / "evaluation" / "judge_results.json"
+
+
+def open_corpus() -> CorpusStore:
+    files = [PROCESSED_DIR / "loc_dataset_clean.json", PROCESSED_DIR / "gutenberg_dataset.json"]
+    for f in files:
+        if not f.exists():
+            logger.warning(f"File not found: {f}")
+    corpus = CorpusStore()
+    corpus.sync(files)
+    return corpus
+
+
+def enqueue(queue: WorkQueue, kind: str, full: bool):
+    if kind == EXTRACT:
+        # Built here, once; workers only map the finished store
+        documents = list(open_corpus().documents())
+        events = list(load_catalog().events)
+        added = queue.enqueue(EXTRACT, extract_jobs(documents, events), force=full)
+        logger.info(f"✓ {added} extraction jobs added or reset ({len(documents)} documents x {len(events)} events)")
+        return
+
+    if not EXTRACTED_PATH.exists():
+        logger.error("Extracted events file not found. Collect the extraction jobs first.")
+        sys.exit(1)
+    extractions = load_records(EXTRACTED_PATH, Extraction)
+    existing = load_records(JUDGMENTS_PATH, Judgment) if JUDGMENTS_PATH.exists() and not full else []
+    jobs, fresh = judge_jobs(extractions, existing, JUDGE_MODE)
+    added = queue.enqueue(JUDGE, jobs, done=fresh, force=full)
+    logger.info(f"✓ {added} judge jobs added or reset ({len(jobs)} pairs, {len(fresh)} already judged)")
+
+
+def work(queue: WorkQueue, kind: str, threads: int):
+    if kind == EXTRACT:
+        corpus = CorpusStore()  # the store enqueue built; not re-synced by every worker
+        handler = ExtractHandler(EventExtractor(corpus=corpus), corpus)
+    else:
+        handler = JudgeHandler(LLMJudge())
+
+    start = time.perf_counter()
+    counts = run_workers(queue, kind, handler, threads=threads)
+    elapsed = time.perf_counter() - start
+    logger.info(f"✓ Worker done in {elapsed:.1f}s: {counts['completed']} completed, {counts['errors']} errors, "
+                f"{counts['lost']} lost leases")
+
+
+def collect(queue: WorkQueue, kind: str):
+    outstanding = queue.outstanding(kind)
+    if outstanding:
+        logger.warning(f"{outstanding} {kind} jobs are not finished; collecting the done ones")
+    results = [result for _, result in queue.results(kind) if result]
+    path = EXTRACTED_PATH if kind == EXTRACT else JUDGMENTS_PATH
+    save_json(results, path)
+    if kind == EXTRACT:
+        ColumnarStore().sync_extractions(path)
+    else:
+        ColumnarStore().sync_judgments(path)
+    logger.info(f"✓ Collected {len(results)} {kind} results into {path}")
+
+
+def progress(queue: WorkQueue):
+    report = queue.progress()
+    if not report:
+        logger.info("Queue is empty.")
+    for kind, entry in report.items():
+        eta = f", ETA {entry['eta_s']}s" if entry['eta_s'] is not None else ""
+        logger.info(f"{kind:<8} {entry['done']}/{entry['total']} done, {entry['pending']} pending, "
+                    f"{entry['leased']} leased ({entry['expired_leases']} expired), {entry['failed']} failed | "
+                    f"{entry['workers']} workers, {entry['rate_per_s']} jobs/s{eta}")
+    for error in queue.errors(limit=5):
+        logger.info(f"  last error [{error['status']}] {error['job_id']} ({error['worker']}): {error['error']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run extraction and judging through the leased work queue.")
+    parser.add_argument("command", choices=["enqueue", "work", "collect", "progress", "requeue"])
+    parser.add_argument("kind", nargs="?", choices=KINDS, help="Job kind (all kinds for progress/requeue)")
+    parser.add_argument("--db", type=Path, default=WORK_QUEUE_PATH, help="Queue database file")
+    parser.add_argument("--threads", type=int, default=WORK_QUEUE_THREADS, help="work: jobs run concurrently")
+    parser.add_argument("--full", action="store_true", help="enqueue: reset jobs already done (judge: re-judge every pair)")
+    parser.add_argument("--watch", type=float, metavar="SECONDS", help="progress: refresh until nothing is outstanding")
+    args = parser.parse_args()
+    if args.command in ("enqueue", "work", "collect") and not args.kind:
+        parser.error(f"{args.command} needs a job kind ({' or '.join(KINDS)})")
+
+    queue = WorkQueue(args.db)
+    if args.command == "enqueue":
+        enqueue(queue, args.kind, args.full)
+    elif args.command == "work":
+        work(queue, args.kind, args.threads)
+    elif args.command == "collect":
+        collect(queue, args.kind)
+    elif args.command == "requeue":
+        logger.info(f"✓ {queue.requeue(args.kind)} failed jobs returned to pending")
+    else:
+        progress(queue)
+        while args.watch and any(queue.outstanding(kind) for kind in KINDS):
+            time.sleep(args.watch)
+            progress(queue)
+
+
+if __name__ == "__main__":
+    main()
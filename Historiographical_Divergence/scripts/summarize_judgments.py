@@ -0,0 +1,52 @@
+"""
+Judgment Log Summary.
+Streams the judgments (judge_results.json by default, or JSONL logs such as
+per-worker shards) through constant-memory accumulators and writes overall,
+per-event and per-historian score statistics.
+"""
+import argparse
+import sys
+from pathlib import Path
+
+# Add project root to path
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(PROJECT_ROOT))
+
+from src.validation.streaming import summarize_files
+from src.utils.data_loader import save_json
+from src.utils.logger import get_logger
+
+logger = get_logger("summary")
+
+def main():
+    parser = argparse.ArgumentParser(description="Summarise judgment files.")
+    # Not judge_results.jsonl: each run truncates it to the pairs that run judged
+    parser.add_argument("paths", nargs="*", type=Path,
+                        default=[PROJECT_ROOT / "data" / "evaluation" / "judge_results.json"],
+                        help="JSON arrays or JSONL logs/shards to summarise (default: all Phase 3 judgments)")
+    parser.add_argument("--workers", type=int, default=1, help="Processes, one shard each")
+    parser.add_argument("--output", type=Path,
+                        default=PROJECT_ROOT / "data" / "validation" / "judgment_summary.json")
+    args = parser.parse_args()
+
+    missing = [p for p in args.paths if not p.exists()]
+    if missing:
+        logger.error(f"Judgment file(s) not found: {', '.join(str(p) for p in missing)}")
+        return
+
+    summary = summarize_files(args.paths, max_workers=args.workers).to_dict()
+    overall = summary['overall']
+    logger.info(f"Judgments: {overall['count']} (+{summary['skipped']} without a score) from {len(args.paths)} file(s)")
+    if overall['count']:
+        logger.info(f"Score: mean={overall['mean']:.2f} sd={overall['std_dev']:.2f} "
+                    f"median={overall['p50']} IQR={overall['p25']}-{overall['p75']}")
+    for event, stats in summary['by_event'].items():
+        logger.info(f"  {event}: n={stats['count']} mean={stats['mean']:.1f} median={stats['p50']}")
+
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    save_json(summary, args.output)
+
+    logger.info(f"✓ Summary saved to {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Cascade Tuning.
+Fits the judge cascade thresholds against cached full-judge results and
+reports how many calls the cascade would avoid and at what score error.
+With --judge-cheap, first judges the same pairs with the cheap model
+(cached in cheap_judge_results.json) so the ambiguous band can be tuned too.
+"""
+import argparse
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# Add project root to path
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(PROJECT_ROOT))
+
+from src.evaluation.llm_judge import LLMJudge, make_pair_id
+from src.evaluation.prescreen import tune_cascade
+from src.utils.data_loader import load_json, save_json
+from src.utils.logger import get_logger
+from config.settings import CASCADE_CONFIG_PATH, JUDGE_MAX_WORKERS
+
+logger = get_logger("cascade_tuning")
+
+# Written to CASCADE_CONFIG_PATH; the rest of the report is only logged
+CONFIG_KEYS = ("score_map", "prescreen_low", "prescreen_high", "cheap_model", "band_low", "band_high")
+
+def _scores_by_pair(judgments, full_only=False):
+    """
+    pair_id -> score. With full_only, only full-judge-model verdicts: rows a
+    cascade run scored locally or with the cheap model would otherwise make
+    the thresholds fit their own output.
+    """
+    return {
+        j.get('pair_id') or make_pair_id(j['event'], j['primary_source'], j['secondary_source']): j['consistency_score']
+        for j in judgments
+        if 'consistency_score' in j and not (full_only and j.get('judge_stage', 'full') != 'full')
+    }
+
+def judge_cheap(pairs, path):
+    """Judges `pairs` with the cascade's cheap model and saves the judgments to `path`."""
+    judge = LLMJudge()
+    model = judge.cascade['cheap_model']
+    logger.info(f"Judging {len(pairs)} pairs with the cheap model ({model})...")
+
+    def run(pair):
+        result = judge.judge_pair(pair['primary'], pair['secondary'], model=model)
+        if result:
+            result.update(pair_id=pair['pair_id'], judge_model=model)
+        return result
+
+    with ThreadPoolExecutor(max_workers=max(1, JUDGE_MAX_WORKERS)) as pool:
+        judgments = [j for j in pool.map(run, pairs) if j]
+    save_json(judgments, path)
+    logger.info(f"✓ Saved {len(judgments)} cheap-model judgments to {path}")
+    return judgments
+
+def main():
+    parser = argparse.ArgumentParser(description="Fit the judge cascade thresholds to cached judgments.")
+    parser.add_argument("max_error", nargs="?", type=float, default=10.0,
+                        help="Largest acceptable mean |score error| on pairs that skip the full judge")
+    parser.add_argument("--judge-cheap", action="store_true",
+                        help="Judge the cached pairs with the cheap model first (refreshes cheap_judge_results.json)")
+    args = parser.parse_args()
+
+    logger.info("TUNING JUDGE CASCADE THRESHOLDS")
+
+    extracted_path = PROJECT_ROOT / "data" / "extracted" / "extracted_events.json"
+    results_path = PROJECT_ROOT / "data" / "evaluation" / "judge_results.json"
+    cheap_path = PROJECT_ROOT / "data" / "evaluation" / "cheap_judge_results.json"
+
+    if not extracted_path.exists() or not results_path.exists():
+        logger.error("Need extracted events and cached judge results. Run Phases 2 and 3 first.")
+        return
+
+    extractions = load_json(extracted_path)
+    full_scores = _scores_by_pair(load_json(results_path), full_only=True)
+    if not full_scores:
+        logger.error("No full-judge results to tune against. Run Phase 3 in pairwise mode first.")
+        return
+
+    max_error = args.max_error
+    pairs = LLMJudge.build_pairs(extractions)
+
+    # Optional: cheap-model judgments of the same pairs, to tune the ambiguous band
+    cheap_judgments = None
+    if args.judge_cheap:
+        cheap_judgments = judge_cheap([p for p in pairs if p['pair_id'] in full_scores], cheap_path)
+    elif cheap_path.exists():
+        cheap_judgments = load_json(cheap_path)
+    cheap_scores = _scores_by_pair(cheap_judgments) if cheap_judgments else None
+
+    report = tune_cascade(pairs, full_scores, cheap_scores=cheap_scores, max_error=max_error)
+    if cheap_scores and cheap_judgments[0].get('judge_model'):
+        # The band only holds for the model it was tuned on
+        report['cheap_model'] = cheap_judgments[0]['judge_model']
+
+    logger.info(f"Tuned on {report['pairs']} cached pairs (max error {max_error})")
+    logger.info(f"Pre-screen thresholds: low={report['prescreen_low']:.2f}, high={report['prescreen_high']:.2f}")
+    logger.info(f"Pre-screen decides {report['prescreen_calls_avoided']} pairs locally "
+                f"(mean |Δscore| = {report['prescreen_mean_abs_error']:.2f})")
+    if cheap_scores:
+        logger.info(f"Cheap-model band: [{report['band_low']}, {report['band_high']}], "
+                    f"accepts {report['cheap_accepted']} pairs (mean |Δscore| = {report['cheap_mean_abs_error']:.2f})")
+        logger.info(f"Full-judge calls avoided: {report['full_calls_avoided']}/{report['pairs']}")
+
+    CASCADE_CONFIG_PATH.parent.mkdir(parents=True, exist_ok=True)
+    save_json({k: report[k] for k in CONFIG_KEYS if k in report}, CASCADE_CONFIG_PATH)
+
+    logger.info(f"Tuned thresholds saved to {CASCADE_CONFIG_PATH}")
+
+if __name__ == "__main__":
+    main()
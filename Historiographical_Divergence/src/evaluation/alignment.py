@@ -0,0 +1,101 @@
+"""
+Claim-level alignment between primary and secondary accounts.
+Scores each pair's claims against each other with the pre-screen TF-IDF
+model and pairs them with an optimal assignment. The judge then sees aligned
+and unmatched claims instead of two raw lists, and unmatched/weak pairs are
+discrepancy candidates that can be checked offline.
+"""
+from typing import Dict, List
+import numpy as np
+from scipy.optimize import linear_sum_assignment
+from src.evaluation.prescreen import claim_similarity
+from src.utils.logger import get_logger
+from config.settings import ALIGNMENT_MIN_SIMILARITY, ALIGNMENT_MAX_UNMATCHED_SECONDARY
+
+logger = get_logger("alignment")
+
+# Aligned claims below this similarity are paraphrases at best
+WEAK_ALIGNMENT = 0.35
+
+
+def similarity_matrices(pairs: List[Dict]) -> List[np.ndarray]:
+    """
+    Claim x claim cosine matrix for every pair, each from its own TF-IDF fit
+    (see claim_similarity), so a pair aligns the same alone as in a full run.
+    """
+    return [claim_similarity(pair['primary'].get('claims', []), pair['secondary'].get('claims', []))
+            for pair in pairs]
+
+
+def align_from_matrix(primary_claims: List[str],
+                      secondary_claims: List[str],
+                      sim: np.ndarray,
+                      min_similarity: float = ALIGNMENT_MIN_SIMILARITY) -> Dict:
+    """One-to-one claim pairing maximising total similarity (Hungarian assignment)."""
+    aligned, matched_p, matched_s = [], set(), set()
+    if sim.size:
+        rows, cols = linear_sum_assignment(-sim)
+        for r, c in zip(rows, cols):
+            if sim[r, c] >= min_similarity:
+                aligned.append({
+                    "primary": primary_claims[r],
+                    "secondary": secondary_claims[c],
+                    "similarity": round(float(sim[r, c]), 3)
+                })
+                matched_p.add(r)
+                matched_s.add(c)
+
+    return {
+        "aligned": aligned,
+        "unmatched_primary": [c for i, c in enumerate(primary_claims) if i not in matched_p],
+        "unmatched_secondary": [c for i, c in enumerate(secondary_claims) if i not in matched_s]
+    }
+
+
+def align_pairs(pairs: List[Dict], min_similarity: float = ALIGNMENT_MIN_SIMILARITY) -> List[Dict]:
+    """Alignment for every pair (see align_from_matrix)."""
+    return [
+        align_from_matrix(pair['primary'].get('claims', []), pair['secondary'].get('claims', []), sim, min_similarity)
+        for pair, sim in zip(pairs, similarity_matrices(pairs))
+    ]
+
+
+def discrepancy_candidates(alignment: Dict) -> List[Dict]:
+    """
+    Offline discrepancy guesses in the judge's schema: unmatched Lincoln claims
+    are candidate omissions, weakly aligned claims candidate interpretive differences.
+    """
+    candidates = [{"claim": c, "type": "Omission"} for c in alignment['unmatched_primary']]
+    candidates += [
+        {"claim": a['primary'], "type": "Interpretive Difference"}
+        for a in alignment['aligned'] if a['similarity'] < WEAK_ALIGNMENT
+    ]
+    return candidates
+
+
+def format_alignment(alignment: Dict, max_unmatched_secondary: int = ALIGNMENT_MAX_UNMATCHED_SECONDARY) -> str:
+    """Prompt section replacing the two raw claim lists."""
+    lines = ["ALIGNED CLAIMS (Lincoln -> Historian):"]
+    if alignment['aligned']:
+        for n, a in enumerate(alignment['aligned'], 1):
+            lines.append(f"{n}. LINCOLN: {a['primary']}")
+            lines.append(f"   HISTORIAN: {a['secondary']}")
+    else:
+        lines.append("(none)")
+
+    lines.append("")
+    lines.append("LINCOLN CLAIMS WITH NO COUNTERPART IN THE HISTORIAN'S ACCOUNT:")
+    lines.extend(f"- {c}" for c in alignment['unmatched_primary'])
+    if not alignment['unmatched_primary']:
+        lines.append("(none)")
+
+    extra = alignment['unmatched_secondary'][:max_unmatched_secondary]
+    lines.append("")
+    lines.append("HISTORIAN CLAIMS WITH NO COUNTERPART IN LINCOLN'S ACCOUNT:")
+    lines.extend(f"- {c}" for c in extra)
+    if not extra:
+        lines.append("(none)")
+    hidden = len(alignment['unmatched_secondary']) - len(extra)
+    if hidden > 0:
+        lines.append(f"(+{hidden} further unrelated historian claims omitted)")
+    return "\n".join(lines)
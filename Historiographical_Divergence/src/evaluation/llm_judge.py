@@ -2,24 +2,221 @@
 The LLM Judge.
 Compares historical accounts and quantifies consistency.
 """
+import hashlib
 import json
-from typing import List, Dict
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import List, Dict, Optional
+from src.evaluation.alignment import align_pairs, format_alignment
+from src.evaluation.primary_index import build_primary_index, is_primary
+from src.evaluation.prescreen import claim_overlap, load_cascade_config, predict_score, prescreen_pairs
+from src.utils.catalog import load_catalog
+from src.utils.data_loader import append_jsonl
 from src.utils.llm_client import LLMClient
 from src.utils.logger import get_logger
+from src.utils.schemas import JUDGMENT_ADAPTER, LISTWISE_ADAPTER, to_dict
+from src.utils.tracing import span
+from src.validation.stats import compare_scores
+from config.settings import (
+    LLM_PROVIDER, JUDGE_MAX_WORKERS, JUDGE_MODE, FUSE_PRIMARIES, PRIMARY_INDEX_PATH, JUDGE_ALIGN_CLAIMS,
+    LISTWISE_TOKEN_BUDGET, LISTWISE_MAX_BATCH
+)
 
 logger = get_logger("judge")
 
+JUDGE_SYSTEM_PROMPT = """You are an impartial Historian Judge. 
+        Your task is to compare a Primary Source (Lincoln's own words) against a Secondary Source (a historian's account) regarding a specific event.
+        
+        Output strict JSON:
+        {
+            "consistency_score": <int 0-100>,
+            "classification": "Consistent" | "Nuanced" | "Contradictory",
+            "reasoning": "<concise explanation>",
+            "discrepancies": [
+                {
+                    "claim": "<the specific claim in question>",
+                    "type": "Factual Error" | "Omission" | "Interpretive Difference",
+                    "severity": "High" | "Low"
+                }
+            ]
+        }
+        
+        Scoring Rubric:
+        - 100: Perfect alignment.
+        - 80-99: Minor omissions or slight rewording.
+        - 60-79: Significant omissions or differing interpretations of tone.
+        - 40-59: Minor factual errors or major interpretive disagreements.
+        - 0-39: Direct factual contradictions or complete fabrication.
+        """
+
+LISTWISE_SYSTEM_PROMPT = """You are an impartial Historian Judge.
+Your task is to compare a Primary Source (Lincoln's own words) against SEVERAL Secondary Sources (historians' accounts) regarding a specific event.
+Judge each Secondary Source independently against the Primary Source; do not compare historians with each other.
+
+Output strict JSON with exactly one entry per Secondary Source, in the order given:
+{
+    "judgments": [
+        {
+            "secondary_source": "<Source ID of the secondary source>",
+            "consistency_score": <int 0-100>,
+            "classification": "Consistent" | "Nuanced" | "Contradictory",
+            "reasoning": "<concise explanation>",
+            "discrepancies": [
+                {
+                    "claim": "<the specific claim in question>",
+                    "type": "Factual Error" | "Omission" | "Interpretive Difference",
+                    "severity": "High" | "Low"
+                }
+            ]
+        }
+    ]
+}
+
+Scoring Rubric:
+- 100: Perfect alignment.
+- 80-99: Minor omissions or slight rewording.
+- 60-79: Significant omissions or differing interpretations of tone.
+- 40-59: Minor factual errors or major interpretive disagreements.
+- 0-39: Direct factual contradictions or complete fabrication.
+"""
+
+JUDGE_MODES = ("pairwise", "listwise", "cascade")
+# Modes that judge each pair on its own call (listwise packs several per call)
+SINGLE_PAIR_MODES = ("pairwise", "cascade")
+
+# Bump the version for a mode whenever its prompt or scoring logic changes;
+# stored judgments with an older fingerprint are then re-judged.
+PROMPT_VERSIONS = {
+    "pairwise": "pairwise-v1",
+    "listwise": "listwise-v1",
+    "cascade": "cascade-v1"
+}
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token) for batch planning."""
+    return len(text) // 4 + 1
+
+
+def classify_score(score: int) -> str:
+    """Maps a 0-100 score onto the rubric's three classifications."""
+    if score >= 80:
+        return "Consistent"
+    if score >= 40:
+        return "Nuanced"
+    return "Contradictory"
+
+
+def make_pair_id(event: str, primary_id: str, secondary_id: str) -> str:
+    """Stable identifier for one (event, primary, secondary) comparison."""
+    return f"{event}|{primary_id}|{secondary_id}"
+
+
+def judgment_fingerprint(primary_claims: List, secondary_claims: List, prompt_version: str, model: str) -> str:
+    """Hash of everything that determines a judgment's inputs."""
+    payload = json.dumps([primary_claims, secondary_claims, prompt_version, model], ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def cascade_version(cascade: Dict) -> str:
+    """Short digest of the cascade config: thresholds, score map and cheap model decide which stage scores a pair."""
+    payload = json.dumps(cascade, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:12]
+
+
+def pair_fingerprint(pair: Dict,
+                     model: str,
+                     mode: str = JUDGE_MODE,
+                     aligned: bool = JUDGE_ALIGN_CLAIMS,
+                     cascade: Optional[Dict] = None) -> str:
+    """
+    Fingerprint of a pair's judgment inputs. In cascade mode it covers the
+    cascade config (`cascade`, loaded when not given), so retuning or a new
+    cheap model re-judges stored cascade judgments.
+    """
+    version = PROMPT_VERSIONS[mode]
+    if aligned and mode != "listwise":
+        version += "+aligned"
+    if mode == "cascade":
+        version += "+" + cascade_version(cascade if cascade is not None else load_cascade_config())
+    return judgment_fingerprint(
+        pair['primary'].get('claims', []),
+        pair['secondary'].get('claims', []),
+        version,
+        model
+    )
+
+
+def plan_incremental(pairs: List[Dict],
+                     existing: List[Dict],
+                     model: str,
+                     mode: str = JUDGE_MODE,
+                     aligned: bool = JUDGE_ALIGN_CLAIMS) -> Dict:
+    """
+    Splits pairs into 'fresh' (a stored judgment has the same fingerprint)
+    and 'stale' (new pair, changed claims, prompt version or model).
+    Stored judgments for pairs that no longer exist are listed as 'dropped'.
+    """
+    existing = load_catalog().canonicalize(existing)
+    stored = {
+        j.get('pair_id') or make_pair_id(j['event'], j['primary_source'], j['secondary_source']): j
+        for j in existing
+    }
+    cascade = load_cascade_config() if mode == "cascade" and pairs else None
+    fresh, stale = [], []
+    for pair in pairs:
+        old = stored.get(pair['pair_id'])
+        if old and old.get('fingerprint') == pair_fingerprint(pair, model, mode, aligned, cascade):
+            fresh.append(pair)
+        else:
+            stale.append(pair)
+    current = {pair['pair_id'] for pair in pairs}
+    return {
+        "fresh": fresh,
+        "stale": stale,
+        "dropped": [pair_id for pair_id in stored if pair_id not in current],
+        "stored": stored
+    }
+
+
 class LLMJudge:
-    def __init__(self):
+    MODEL = "gemini-2.0-flash"
+
+    def __init__(self, provider: str = LLM_PROVIDER):
         # We use a low temperature for the judge to ensure deterministic, fair scoring.
-        self.llm = LLMClient(provider="google")
-        self.model = "gemini-2.0-flash"
+        self.llm = LLMClient(provider=provider)
+        self.model = self.MODEL
+        self.cascade = load_cascade_config()
+        self.align_claims = JUDGE_ALIGN_CLAIMS
 
-    def judge_all(self, extractions: List[Dict]) -> List[Dict]:
+    def judge_all(self,
+                  extractions: List[Dict],
+                  max_workers: int = JUDGE_MAX_WORKERS,
+                  stream_path: Optional[Path] = None,
+                  mode: str = JUDGE_MODE,
+                  index_path: Optional[Path] = PRIMARY_INDEX_PATH) -> List[Dict]:
         """
         Main entry point: Groups extractions and runs the judge on all pairs.
+        `index_path` caches the fused primary index (None: don't cache).
         """
-        # 1. Group by Event
+        pairs = self.build_pairs(extractions, index_path=index_path)
+        return self.judge_pairs(pairs, max_workers=max_workers, stream_path=stream_path, mode=mode)
+
+    @staticmethod
+    def build_pairs(extractions: List[Dict],
+                    fuse: bool = FUSE_PRIMARIES,
+                    index_path: Optional[Path] = PRIMARY_INDEX_PATH) -> List[Dict]:
+        """
+        Groups extractions by event and pairs every historian account with the
+        primary (Lincoln) account. Pair order follows the input order.
+
+        With `fuse`, events that have several Lincoln documents are judged
+        against one deduplicated claim set (see primary_index); otherwise the
+        first Lincoln document is used.
+        """
+        # 1. Group by Event (under canonical keys, for extractions stored under an alias)
+        extractions = load_catalog().canonicalize(extractions)
         events = {}
         for ext in extractions:
             e_name = ext['event']
@@ -27,12 +224,14 @@ class LLMJudge:
                 events[e_name] = {'lincoln': [], 'others': []}
             
             # Identify if this is Lincoln (Source Zero) or a Historian
-            if "loc_" in ext['source_id']:
+            if is_primary(ext):
                 events[e_name]['lincoln'].append(ext)
             else:
                 events[e_name]['others'].append(ext)
 
-        results = []
+        primary_index = build_primary_index(extractions, cache_path=index_path) if fuse else {}
+
+        pairs = []
         
         # 2. Iterate through events
         for event_name, sources in events.items():
@@ -43,48 +242,328 @@ class LLMJudge:
                 logger.warning(f"Skipping {event_name}: No primary source (Lincoln) found.")
                 continue
             
-            # We usually compare against the first matching Lincoln document
-            # (In a more complex system, we might merge multiple Lincoln docs)
-            primary = lincoln_accounts[0]
+            # One primary per event: the fused claim set, or the first Lincoln document
+            primary = primary_index[event_name] if fuse else lincoln_accounts[0]
 
-            logger.info(f"Judging Event: {event_name} ({len(historian_accounts)} comparisons)")
+            logger.info(f"Queued Event: {event_name} ({len(historian_accounts)} comparisons)")
 
-            # 3. Create Pairs and Judge
+            # 3. Create Pairs
             for secondary in historian_accounts:
-                judgment = self.judge_pair(primary, secondary)
-                if judgment:
-                    results.append(judgment)
-                    
+                pairs.append({
+                    "pair_id": make_pair_id(event_name, primary['source_id'], secondary['source_id']),
+                    "primary": primary,
+                    "secondary": secondary
+                })
+
+        return pairs
+
+    def judge_pairs(self,
+                    pairs: List[Dict],
+                    max_workers: int = JUDGE_MAX_WORKERS,
+                    stream_path: Optional[Path] = None,
+                    mode: str = JUDGE_MODE) -> List[Dict]:
+        """
+        Judges pairs on a bounded thread pool.
+
+        In 'pairwise' mode every pair is one call; in 'listwise' mode pairs
+        sharing a primary are packed into token-budgeted batches, one call each;
+        in 'cascade' mode pairs go through the local pre-screen and cheap model
+        first and only ambiguous ones reach the full judge model.
+        Each judgment is appended to `stream_path` (JSONL) as soon as it
+        completes, so a crash loses at most the in-flight pairs. The returned
+        list is always in pair order, independent of completion order.
+        """
+        if mode not in JUDGE_MODES:
+            raise ValueError(f"Unknown judge mode: {mode}")
+        if mode == "listwise":
+            tasks = self.plan_listwise_batches(pairs)
+        else:
+            tasks = [[i] for i in range(len(pairs))]
+        if self.align_claims and mode != "listwise":
+            # Pair-local, so the same as when the pair is aligned on its own
+            for pair, alignment in zip(pairs, align_pairs(pairs)):
+                pair['alignment'] = alignment
+        if mode == "cascade":
+            # Every overlap before any network call; each depends on its own pair only
+            for pair, overlap in zip(pairs, prescreen_pairs(pairs)):
+                pair['overlap'] = float(overlap)
+            run_batch = self._judge_cascade_batch
+        else:
+            run_batch = self._judge_batch
+
+        results = [None] * len(pairs)
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+            futures = {
+                pool.submit(run_batch, [pairs[i] for i in batch]): batch
+                for batch in tasks
+            }
+            done = 0
+            for future in as_completed(futures):
+                for i, judgment in zip(futures[future], future.result()):
+                    done += 1
+                    if judgment:
+                        judgment['pair_id'] = pairs[i]['pair_id']
+                        judgment['fingerprint'] = self.fingerprint(pairs[i], mode)
+                        results[i] = judgment
+                        if stream_path:
+                            append_jsonl([judgment], stream_path)
+                    logger.info(f"Judged {done}/{len(pairs)}: {pairs[i]['pair_id']}")
+
+        if mode == "cascade":
+            stages = Counter(r['judge_stage'] for r in results if r)
+            logger.info(f"Cascade stages: {dict(stages)} "
+                        f"(full-judge calls avoided: {len(pairs) - stages.get('full', 0)}/{len(pairs)})")
+
+        return [r for r in results if r]
+
+    def judge_one(self, pair: Dict, mode: str = JUDGE_MODE) -> Optional[Dict]:
+        """
+        Judges a single pair in the calling thread, exactly as judge_pairs would
+        within a full run (alignment and overlap are pair-local). For streaming
+        and queue workers, which receive pairs one at a time; listwise mode
+        needs several pairs per call and is rejected.
+        """
+        if mode not in SINGLE_PAIR_MODES:
+            raise ValueError(f"Single-pair judging supports {SINGLE_PAIR_MODES}, not '{mode}'")
+        if self.align_claims:
+            pair['alignment'] = align_pairs([pair])[0]
+        if mode == "cascade":
+            pair['overlap'] = float(prescreen_pairs([pair])[0])
+            judgment = self._judge_cascade_batch([pair])[0]
+        else:
+            judgment = self._judge_batch([pair])[0]
+        if judgment:
+            judgment['pair_id'] = pair['pair_id']
+            judgment['fingerprint'] = self.fingerprint(pair, mode)
+        return judgment
+
+    def fingerprint(self, pair: Dict, mode: str = JUDGE_MODE) -> str:
+        return pair_fingerprint(pair, self.model, mode, self.align_claims, self.cascade)
+
+    def judge_incremental(self,
+                          pairs: List[Dict],
+                          existing: List[Dict],
+                          max_workers: int = JUDGE_MAX_WORKERS,
+                          stream_path: Optional[Path] = None,
+                          mode: str = JUDGE_MODE) -> List[Dict]:
+        """
+        Judges only stale pairs and merges them with the still-valid stored
+        judgments. The result follows pair order, like judge_pairs.
+        """
+        plan = plan_incremental(pairs, existing, self.model, mode, self.align_claims)
+        logger.info(f"Incremental judge: {len(plan['stale'])} stale, {len(plan['fresh'])} up to date, "
+                    f"{len(plan['dropped'])} dropped")
+
+        new = {j['pair_id']: j for j in self.judge_pairs(plan['stale'], max_workers=max_workers,
+                                                         stream_path=stream_path, mode=mode)}
+        fresh_ids = {pair['pair_id'] for pair in plan['fresh']}
+        merged = []
+        for pair in pairs:
+            if pair['pair_id'] in new:
+                merged.append(new[pair['pair_id']])
+            elif pair['pair_id'] in fresh_ids:
+                merged.append(plan['stored'][pair['pair_id']])
+        return merged
+
+    def plan_listwise_batches(self,
+                              pairs: List[Dict],
+                              token_budget: int = LISTWISE_TOKEN_BUDGET,
+                              max_batch: int = LISTWISE_MAX_BATCH) -> List[List[int]]:
+        """
+        Packs pairs that share an (event, primary) into batches of pair indices.
+
+        A batch grows until the estimated prompt plus expected output would
+        exceed `token_budget`, so historians with long claim lists get smaller
+        batches and short ones share a call.
+        """
+        groups = {}
+        for i, pair in enumerate(pairs):
+            key = (pair['primary']['event'], pair['primary']['source_id'])
+            groups.setdefault(key, []).append(i)
+
+        batches = []
+        for indices in groups.values():
+            primary = pairs[indices[0]]['primary']
+            primary_claims = json.dumps(primary.get('claims', []))
+            base = estimate_tokens(LISTWISE_SYSTEM_PROMPT) + estimate_tokens(primary_claims) + 100
+            # Each output entry may quote primary claims back as discrepancies
+            per_output = estimate_tokens(primary_claims) + 150
+
+            batch, used = [], base
+            for i in indices:
+                cost = estimate_tokens(json.dumps(pairs[i]['secondary'].get('claims', []))) + 60 + per_output
+                if batch and (used + cost > token_budget or len(batch) >= max_batch):
+                    batches.append(batch)
+                    batch, used = [], base
+                batch.append(i)
+                used += cost
+            if batch:
+                batches.append(batch)
+        return batches
+
+    def _judge_batch(self, batch: List[Dict]) -> List[Optional[Dict]]:
+        if len(batch) == 1:
+            with span("judge.pair", pair_id=batch[0]['pair_id']) as s:
+                result = self.judge_pair(batch[0]['primary'], batch[0]['secondary'],
+                                         alignment=batch[0].get('alignment'))
+                s.set(score=result['consistency_score'] if result else None)
+            return [result]
+        with span("judge.listwise", event=batch[0]['primary']['event'], pairs=len(batch)):
+            return self.judge_listwise(batch[0]['primary'], [pair['secondary'] for pair in batch])
+
+    def _judge_cascade_batch(self, batch: List[Dict]) -> List[Optional[Dict]]:
+        results = []
+        for pair in batch:
+            with span("judge.pair", pair_id=pair['pair_id'], overlap=pair['overlap']) as s:
+                result = self.judge_cascade(pair['primary'], pair['secondary'], pair['overlap'], pair.get('alignment'))
+                s.set(score=result['consistency_score'] if result else None,
+                      stage=result.get('judge_stage') if result else None)
+            results.append(result)
         return results
 
-    def judge_pair(self, primary: Dict, secondary: Dict) -> Dict:
+    def judge_cascade(self,
+                      primary: Dict,
+                      secondary: Dict,
+                      overlap: Optional[float] = None,
+                      alignment: Optional[Dict] = None) -> Optional[Dict]:
         """
-        Compares one Primary source against one Secondary source.
+        Three-step cascade for one pair:
+          1. Local TF-IDF overlap: clear-cut pairs are scored without any call.
+          2. Cheap model: accepted unless its score lands in the ambiguous band.
+          3. Full judge model for whatever is left.
         """
-        system_prompt = """You are an impartial Historian Judge. 
-        Your task is to compare a Primary Source (Lincoln's own words) against a Secondary Source (a historian's account) regarding a specific event.
-        
-        Output strict JSON:
-        {
-            "consistency_score": <int 0-100>,
-            "classification": "Consistent" | "Nuanced" | "Contradictory",
-            "reasoning": "<concise explanation>",
-            "discrepancies": [
-                {
-                    "claim": "<the specific claim in question>",
-                    "type": "Factual Error" | "Omission" | "Interpretive Difference",
-                    "severity": "High" | "Low"
-                }
+        cfg = self.cascade
+        if overlap is None:
+            overlap = claim_overlap(primary.get('claims', []), secondary.get('claims', []))
+
+        if overlap <= cfg['prescreen_low'] or overlap >= cfg['prescreen_high']:
+            score = predict_score(overlap, (cfg['score_intercept'], cfg['score_slope']))
+            return {
+                "consistency_score": score,
+                "classification": classify_score(score),
+                "reasoning": f"Decided by local pre-screen (claim overlap {overlap:.2f}); no LLM call made.",
+                "discrepancies": [],
+                "event": primary['event'],
+                "primary_source": primary['source_id'],
+                "secondary_source": secondary['source_id'],
+                "historian": secondary.get('author', 'Unknown'),
+                "judge_stage": "prescreen",
+                "prescreen_overlap": overlap
+            }
+
+        result = self.judge_pair(primary, secondary, model=cfg['cheap_model'], alignment=alignment)
+        if result and not (cfg['band_low'] <= result['consistency_score'] <= cfg['band_high']):
+            result.update(judge_stage="cheap", judge_model=cfg['cheap_model'], prescreen_overlap=overlap)
+            return result
+
+        result = self.judge_pair(primary, secondary, alignment=alignment)
+        if result:
+            result.update(judge_stage="full", judge_model=self.model, prescreen_overlap=overlap)
+        return result
+
+    def judge_listwise(self, primary: Dict, secondaries: List[Dict]) -> List[Optional[Dict]]:
+        """
+        Compares one Primary source against several Secondary sources in one call.
+        Returns judgments aligned with `secondaries`; any secondary the model
+        skipped is judged pairwise as a fallback.
+        """
+        sections = []
+        for n, secondary in enumerate(secondaries, 1):
+            sections.append(f"""=== SECONDARY SOURCE {n} (HISTORIAN) ===
+Author: {secondary.get('author', 'Unknown')}
+Source ID: {secondary['source_id']}
+Claims: {json.dumps(secondary.get('claims', []))}
+Tone: {secondary.get('tone', 'N/A')}
+""")
+
+        user_prompt = f"""EVENT: {primary['event']}
+
+=== PRIMARY SOURCE (LINCOLN) ===
+Author: Abraham Lincoln
+Source ID: {primary['source_id']}
+Claims: {json.dumps(primary.get('claims', []))}
+Tone: {primary.get('tone', 'N/A')}
+
+{chr(10).join(sections)}
+COMPARE each of the {len(secondaries)} Secondary Sources against the Primary Source.
+Does each historian accurately reflect Lincoln's account?
+"""
+
+        by_source = {}
+        try:
+            payload = self.llm.extract_structured(LISTWISE_SYSTEM_PROMPT, user_prompt, LISTWISE_ADAPTER, model=self.model)
+            if payload is not None:
+                entries = to_dict(payload)['judgments']
+                ids = [s['source_id'] for s in secondaries]
+                if len(entries) == len(secondaries) and not any(e['secondary_source'] in ids for e in entries):
+                    # Model dropped/garbled the IDs but kept the order
+                    entries = [dict(e, secondary_source=sid) for e, sid in zip(entries, ids)]
+                by_source = {e.pop('secondary_source'): e for e in entries}
+        except Exception as e:
+            logger.error(f"Listwise judging failed for {primary['event']}: {e}")
+
+        results = []
+        for secondary in secondaries:
+            result = by_source.get(secondary['source_id'])
+            if result is None:
+                logger.warning(f"Listwise response missing {secondary['source_id']}; judging pairwise.")
+                results.append(self.judge_pair(primary, secondary))
+                continue
+            result['event'] = primary['event']
+            result['primary_source'] = primary['source_id']
+            result['secondary_source'] = secondary['source_id']
+            result['historian'] = secondary.get('author', 'Unknown')
+            results.append(result)
+        return results
+
+    def calibrate_listwise(self, pairs: List[Dict], max_workers: int = JUDGE_MAX_WORKERS) -> Dict:
+        """
+        Judges the same pairs in both modes and reports how far listwise scores
+        drift from pairwise ones, alongside the number of calls each mode used.
+        """
+        calls_before = self.llm.calls
+        pairwise = self.judge_pairs(pairs, max_workers=max_workers, mode="pairwise")
+        pairwise_calls = self.llm.calls - calls_before
+
+        calls_before = self.llm.calls
+        listwise = self.judge_pairs(pairs, max_workers=max_workers, mode="listwise")
+        listwise_calls = self.llm.calls - calls_before
+
+        listwise_by_id = {j['pair_id']: j for j in listwise}
+        matched = [(p, listwise_by_id[p['pair_id']]) for p in pairwise if p['pair_id'] in listwise_by_id]
+
+        report = compare_scores(
+            [p['consistency_score'] for p, _ in matched],
+            [l['consistency_score'] for _, l in matched]
+        )
+        report.update({
+            "pairs": len(pairs),
+            "classification_agreement": (
+                sum(p['classification'] == l['classification'] for p, l in matched) / len(matched)
+                if matched else 0.0
+            ),
+            "pairwise_calls": pairwise_calls,
+            "listwise_calls": listwise_calls,
+            "per_pair": [
+                {"pair_id": p['pair_id'],
+                 "pairwise_score": p['consistency_score'],
+                 "listwise_score": l['consistency_score']}
+                for p, l in matched
             ]
-        }
-        
-        Scoring Rubric:
-        - 100: Perfect alignment.
-        - 80-99: Minor omissions or slight rewording.
-        - 60-79: Significant omissions or differing interpretations of tone.
-        - 40-59: Minor factual errors or major interpretive disagreements.
-        - 0-39: Direct factual contradictions or complete fabrication.
+        })
+        return report
+
+    def judge_pair(self,
+                   primary: Dict,
+                   secondary: Dict,
+                   model: Optional[str] = None,
+                   alignment: Optional[Dict] = None) -> Dict:
+        """
+        Compares one Primary source against one Secondary source.
+        With `alignment` (see src.evaluation.alignment), the prompt carries the
+        aligned and unmatched claims instead of the two raw claim lists.
         """
+        system_prompt = JUDGE_SYSTEM_PROMPT
 
         user_prompt = f"""
         EVENT: {primary['event']}
@@ -105,16 +584,46 @@ class LLMJudge:
         Does the historian accurately reflect Lincoln's account?
         """
 
+        if alignment is not None:
+            user_prompt = f"""EVENT: {primary['event']}
+
+=== PRIMARY SOURCE (LINCOLN) ===
+Author: Abraham Lincoln
+Source ID: {primary['source_id']}
+Tone: {primary.get('tone', 'N/A')}
+
+=== SECONDARY SOURCE (HISTORIAN) ===
+Author: {secondary.get('author', 'Unknown')}
+Source ID: {secondary['source_id']}
+Tone: {secondary.get('tone', 'N/A')}
+
+=== CLAIM ALIGNMENT (pre-computed by lexical similarity; verify, do not trust blindly) ===
+{format_alignment(alignment)}
+
+COMPARE the Secondary Source against the Primary Source.
+Does the historian accurately reflect Lincoln's account?
+"""
+
         try:
-            result = self.llm.extract_json(system_prompt, user_prompt, model=self.model)
-            
+            payload = self.llm.extract_structured(system_prompt, user_prompt, JUDGMENT_ADAPTER, model=model or self.model)
+            if payload is None:
+                logger.error(f"No valid judgment for {secondary['source_id']} ({primary['event']})")
+                return None
+            result = to_dict(payload)
+
             # Attach metadata for analysis later
             result['event'] = primary['event']
             result['primary_source'] = primary['source_id']
             result['secondary_source'] = secondary['source_id']
             result['historian'] = secondary.get('author', 'Unknown')
-            
+            if alignment is not None:
+                result['alignment_summary'] = {
+                    "aligned": len(alignment['aligned']),
+                    "unmatched_primary": len(alignment['unmatched_primary']),
+                    "unmatched_secondary": len(alignment['unmatched_secondary'])
+                }
+
             return result
         except Exception as e:
             logger.error(f"Judging failed for {secondary['source_id']}: {e}")
-            return None
\ No newline at end of file
+            return None
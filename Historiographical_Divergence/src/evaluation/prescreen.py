@@ -0,0 +1,213 @@
+"""
+Local pre-screen for the judge cascade.
+Scores lexical overlap between claim sets with a NumPy TF-IDF / cosine model,
+with no network calls, and tunes cascade thresholds against cached judgments.
+"""
+import json
+import re
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from src.utils.logger import get_logger
+from config.settings import (
+    CASCADE_CONFIG_PATH, CASCADE_CHEAP_MODEL,
+    CASCADE_PRESCREEN_LOW, CASCADE_PRESCREEN_HIGH,
+    CASCADE_BAND_LOW, CASCADE_BAND_HIGH,
+    CASCADE_SCORE_INTERCEPT, CASCADE_SCORE_SLOPE
+)
+
+logger = get_logger("prescreen")
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+# Function words carry no signal about whether two accounts agree
+STOP_WORDS = frozenset("""
+a an and are as at be been but by for from had has have he her his i in is it its
+of on or that the their them they this to was were which who will with would not
+""".split())
+
+
+def tokenize(text: str) -> List[str]:
+    return [t for t in TOKEN_PATTERN.findall(text.lower()) if t not in STOP_WORDS and len(t) > 1]
+
+
+def tfidf_matrix(texts: Sequence[str]) -> np.ndarray:
+    """
+    L2-normalised TF-IDF rows for `texts`, fit on `texts` themselves.
+    Built from flat (row, term) index arrays with np.add.at, so the cost is
+    one pass over the tokens regardless of vocabulary size.
+    """
+    vocab: Dict[str, int] = {}
+    rows, cols = [], []
+    for row, text in enumerate(texts):
+        for token in tokenize(text):
+            rows.append(row)
+            cols.append(vocab.setdefault(token, len(vocab)))
+
+    counts = np.zeros((len(texts), max(1, len(vocab))), dtype=np.float64)
+    if rows:
+        np.add.at(counts, (np.asarray(rows), np.asarray(cols)), 1.0)
+
+    df = np.count_nonzero(counts, axis=0)
+    idf = np.log((1 + len(texts)) / (1 + df)) + 1.0  # smoothed, as in sklearn
+    weights = counts * idf
+    norms = np.linalg.norm(weights, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return weights / norms
+
+
+def claim_similarity(primary_claims: Sequence[str], secondary_claims: Sequence[str]) -> np.ndarray:
+    """
+    Claim x claim cosine matrix for one pair, with the TF-IDF fit on that
+    pair's own claims. A pair's similarities (and so its overlap and
+    alignment) never depend on which other pairs are scored with it, so a
+    pair judged alone, streamed or leased from the queue gets the same values
+    as in a full run.
+    """
+    p_claims = [str(c) for c in primary_claims]
+    s_claims = [str(c) for c in secondary_claims]
+    if not p_claims or not s_claims:
+        return np.zeros((len(p_claims), len(s_claims)))
+    vectors = tfidf_matrix(p_claims + s_claims)
+    return vectors[:len(p_claims)] @ vectors[len(p_claims):].T
+
+
+def claim_overlap(primary_claims: List[str], secondary_claims: List[str]) -> float:
+    """
+    Overlap score in [0, 1] for a single pair: the F1 of primary coverage
+    (each Lincoln claim's best match) and secondary precision (each
+    historian claim's best match).
+    """
+    sim = claim_similarity(primary_claims, secondary_claims)
+    if not sim.size:
+        return 0.0
+    coverage = sim.max(axis=1).mean()
+    precision = sim.max(axis=0).mean()
+    if coverage + precision <= 0:
+        return 0.0
+    return float(2 * coverage * precision / (coverage + precision))
+
+
+def prescreen_pairs(pairs: List[Dict]) -> np.ndarray:
+    """Overlap score per pair, in [0, 1] (see claim_overlap); each pair is scored on its own claims only."""
+    return np.array([
+        claim_overlap(pair['primary'].get('claims', []), pair['secondary'].get('claims', []))
+        for pair in pairs
+    ], dtype=np.float64)
+
+
+def load_cascade_config() -> Dict:
+    """
+    Cascade thresholds: settings defaults, overridden by the tuned values in
+    CASCADE_CONFIG_PATH when scripts/tune_cascade.py has written one.
+    """
+    config = {
+        "cheap_model": CASCADE_CHEAP_MODEL,
+        "prescreen_low": CASCADE_PRESCREEN_LOW,
+        "prescreen_high": CASCADE_PRESCREEN_HIGH,
+        "band_low": CASCADE_BAND_LOW,
+        "band_high": CASCADE_BAND_HIGH,
+        "score_intercept": CASCADE_SCORE_INTERCEPT,
+        "score_slope": CASCADE_SCORE_SLOPE
+    }
+    if CASCADE_CONFIG_PATH.exists():
+        with open(CASCADE_CONFIG_PATH, 'r', encoding='utf-8') as f:
+            tuned = json.load(f)
+        config.update({k: tuned[k] for k in config if k in tuned})
+        if "score_map" in tuned:
+            config["score_intercept"] = tuned["score_map"]["intercept"]
+            config["score_slope"] = tuned["score_map"]["slope"]
+        logger.info(f"Loaded tuned cascade thresholds from {CASCADE_CONFIG_PATH}")
+    return config
+
+
+def fit_score_map(overlaps: np.ndarray, scores: np.ndarray) -> Tuple[float, float]:
+    """Least-squares line score ~ a + b * overlap, used to score locally decided pairs."""
+    if len(overlaps) < 2 or np.ptp(overlaps) == 0:
+        return (float(np.mean(scores)) if len(scores) else 50.0), 0.0
+    b, a = np.polyfit(overlaps, scores, 1)
+    return float(a), float(b)
+
+
+def predict_score(overlap: float, score_map: Tuple[float, float]) -> int:
+    a, b = score_map
+    return int(round(min(100.0, max(0.0, a + b * overlap))))
+
+
+def tune_cascade(pairs: List[Dict],
+                 full_scores: Dict[str, float],
+                 cheap_scores: Optional[Dict[str, float]] = None,
+                 max_error: float = 10.0,
+                 grid_steps: int = 21) -> Dict:
+    """
+    Picks cascade thresholds from cached judgments.
+
+    Args:
+        pairs: Pairs from LLMJudge.build_pairs (need 'pair_id')
+        full_scores: pair_id -> score from the full judge model (ground truth)
+        cheap_scores: Optional pair_id -> score from the cheap model, for tuning the ambiguous band
+        max_error: Largest acceptable mean absolute score error on pairs that skip the full judge
+        grid_steps: Resolution of the threshold grid
+
+    Returns:
+        Report with the chosen thresholds, calls avoided, error, and every candidate evaluated.
+    """
+    known = [p for p in pairs if p['pair_id'] in full_scores]
+    if not known:
+        raise ValueError("No cached full-judge results match the given pairs")
+
+    overlaps = prescreen_pairs(known)
+    truth = np.array([full_scores[p['pair_id']] for p in known], dtype=float)
+    score_map = fit_score_map(overlaps, truth)
+    predicted = np.clip(score_map[0] + score_map[1] * overlaps, 0, 100)
+
+    # Stage 1: local thresholds. Pairs with overlap <= low or >= high skip the LLM.
+    grid = np.linspace(0.0, 1.0, grid_steps)
+    candidates = []
+    for low in grid:
+        for high in grid[grid > low]:
+            local = (overlaps <= low) | (overlaps >= high)
+            error = float(np.abs(predicted[local] - truth[local]).mean()) if local.any() else 0.0
+            candidates.append({"low": float(low), "high": float(high),
+                               "local_pairs": int(local.sum()), "mean_abs_error": error})
+
+    feasible = [c for c in candidates if c["mean_abs_error"] <= max_error]
+    # Most pairs decided locally; ties go to the narrowest local region (least risk)
+    best = max(feasible, key=lambda c: (c["local_pairs"], -c["low"], c["high"])) if feasible else \
+        {"low": -1.0, "high": 2.0, "local_pairs": 0, "mean_abs_error": 0.0}  # disables the local stage
+
+    report = {
+        "pairs": len(known),
+        "score_map": {"intercept": score_map[0], "slope": score_map[1]},
+        "prescreen_low": best["low"],
+        "prescreen_high": best["high"],
+        "prescreen_calls_avoided": best["local_pairs"],
+        "prescreen_mean_abs_error": best["mean_abs_error"],
+        "max_error": max_error,
+        "candidates": candidates
+    }
+
+    # Stage 2: ambiguous band for the cheap model, if its cached scores exist
+    if cheap_scores:
+        local = (overlaps <= best["low"]) | (overlaps >= best["high"])
+        remaining = [i for i, p in enumerate(known) if not local[i] and p['pair_id'] in cheap_scores]
+        cheap = np.array([cheap_scores[known[i]['pair_id']] for i in remaining], dtype=float)
+        full = truth[remaining]
+        bands = []
+        for band_low in range(0, 101, 5):
+            for band_high in range(band_low, 101, 5):
+                accepted = (cheap < band_low) | (cheap > band_high)
+                error = float(np.abs(cheap[accepted] - full[accepted]).mean()) if accepted.any() else 0.0
+                bands.append({"band_low": band_low, "band_high": band_high,
+                              "accepted": int(accepted.sum()), "mean_abs_error": error})
+        ok = [b for b in bands if b["mean_abs_error"] <= max_error]
+        chosen = max(ok, key=lambda b: (b["accepted"], b["band_low"] - b["band_high"])) if ok else \
+            {"band_low": 0, "band_high": 100, "accepted": 0, "mean_abs_error": 0.0}
+        report.update({
+            "band_low": chosen["band_low"],
+            "band_high": chosen["band_high"],
+            "cheap_accepted": chosen["accepted"],
+            "cheap_mean_abs_error": chosen["mean_abs_error"],
+            "full_calls_avoided": best["local_pairs"] + chosen["accepted"]
+        })
+
+    return report
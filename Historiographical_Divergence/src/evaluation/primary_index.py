@@ -0,0 +1,123 @@
+"""
+Per-event primary claim index.
+Fuses the claims of every Lincoln (LoC) extraction for an event into one
+deduplicated primary account, so each historian is judged once per event
+instead of once per primary document.
+"""
+import hashlib
+import json
+import re
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional
+from src.evaluation.prescreen import tfidf_matrix
+from src.utils.data_loader import load_json, save_json
+from src.utils.logger import get_logger
+from config.settings import PRIMARY_DEDUP_THRESHOLD
+
+logger = get_logger("primary_index")
+
+INDEX_VERSION = "fused-v1"
+
+
+def is_primary(extraction: Dict) -> bool:
+    """Lincoln's own documents (Source Zero) come from the Library of Congress."""
+    return "loc_" in extraction['source_id']
+
+
+def _normalize(claim: str) -> str:
+    return re.sub(r"\s+", " ", re.sub(r"[^\w\s]", "", claim.lower())).strip()
+
+
+def fuse_primaries(event: str, accounts: List[Dict], threshold: float = PRIMARY_DEDUP_THRESHOLD) -> Dict:
+    """
+    Merges several primary extractions for one event.
+
+    Claims are kept in document order. A claim is dropped when it matches an
+    earlier one exactly after normalisation, or when its TF-IDF cosine with an
+    earlier kept claim reaches `threshold`. Each kept claim records which
+    source documents stated it.
+    """
+    if len(accounts) == 1:
+        return accounts[0]
+
+    candidates = []  # (claim, source_id)
+    for account in accounts:
+        for claim in account.get('claims', []):
+            candidates.append((str(claim), account['source_id']))
+
+    sim = None
+    if candidates:
+        vectors = tfidf_matrix([c for c, _ in candidates])
+        sim = vectors @ vectors.T
+
+    kept: List[int] = []
+    claim_sources: Dict[int, List[str]] = {}
+    seen: Dict[str, int] = {}
+    for i, (claim, source_id) in enumerate(candidates):
+        key = _normalize(claim)
+        match = seen.get(key)
+        if match is None and kept:
+            best = max(kept, key=lambda k: sim[i, k])
+            if sim[i, best] >= threshold:
+                match = best
+        if match is None:
+            kept.append(i)
+            seen[key] = i
+            claim_sources[i] = [source_id]
+        elif source_id not in claim_sources[match]:
+            claim_sources[match].append(source_id)
+
+    tones = Counter(a.get('tone') for a in accounts if a.get('tone'))
+    source_ids = [a['source_id'] for a in accounts]
+    return {
+        "event": event,
+        "author": "Abraham Lincoln",
+        "claims": [candidates[i][0] for i in kept],
+        "claim_sources": [claim_sources[i] for i in kept],
+        "tone": tones.most_common(1)[0][0] if tones else "N/A",
+        "source_id": f"loc_fused_{event}",
+        "source_ids": source_ids,
+        "source_type": "Fused"
+    }
+
+
+def build_primary_index(extractions: List[Dict],
+                        cache_path: Optional[Path] = None,
+                        threshold: float = PRIMARY_DEDUP_THRESHOLD) -> Dict[str, Dict]:
+    """
+    Maps event -> primary account, fusing events with several LoC documents.
+
+    The index is cached at `cache_path`, keyed by a hash of the primary
+    extractions, so it is rebuilt only when a primary source changes.
+    """
+    primaries: Dict[str, List[Dict]] = {}
+    for ext in extractions:
+        if is_primary(ext):
+            primaries.setdefault(ext['event'], []).append(ext)
+
+    key_payload = json.dumps(
+        [INDEX_VERSION, threshold,
+         [[e, [[a['source_id'], a.get('claims', []), a.get('tone')] for a in accs]] for e, accs in primaries.items()]],
+        ensure_ascii=False
+    )
+    cache_key = hashlib.sha256(key_payload.encode("utf-8")).hexdigest()
+
+    if cache_path and cache_path.exists():
+        cached = load_json(cache_path)
+        if cached.get("key") == cache_key:
+            logger.info(f"Primary index up to date ({len(cached['index'])} events)")
+            return cached["index"]
+
+    index = {}
+    for event, accounts in primaries.items():
+        index[event] = fuse_primaries(event, accounts, threshold)
+        if len(accounts) > 1:
+            total = sum(len(a.get('claims', [])) for a in accounts)
+            logger.info(f"Fused {len(accounts)} primary documents for {event}: "
+                        f"{total} claims -> {len(index[event]['claims'])} after dedup")
+
+    if cache_path:
+        save_json({"key": cache_key, "index": index}, cache_path)
+
+    return index
@@ -4,56 +4,89 @@ Configured for Google Gemini 2.0 Flash with Type Safety.
 """
 import json
 from typing import List, Dict, Any, Optional
+from src.utils.catalog import Catalog, load_catalog
 from src.utils.llm_client import LLMClient
 from src.utils.logger import get_logger
+from src.utils.schemas import EXTRACTION_ADAPTER, to_dict
+from src.utils.tracing import span
+from config.settings import LLM_PROVIDER
 
 logger = get_logger("extractor")
 
 class EventExtractor:
     
-    EVENTS = {
-        "election_1860": ["election", "1860", "wigwam", "chicago", "nomination", "presidency", "lincoln"],
-        "fort_sumter": ["sumter", "anderson", "charleston", "provision", "reinforce", "fox", "seward"],
-        "gettysburg": ["gettysburg", "cemetery", "dedication", "score", "consecrate", "1863"],
-        "second_inaugural": ["inaugural", "malice", "charity", "1865", "march 4"],
-        "assassination": ["ford", "theatre", "booth", "pistol", "shot", "assassination", "april 14"]
-    }
+    # Characters of matching text sent per event
+    CONTEXT_LIMIT = 100000
 
-    def __init__(self):
-        # Initialize with Google provider
-        self.llm = LLMClient(provider="google")
+    def __init__(self, provider: str = LLM_PROVIDER, corpus=None, catalog: Optional[Catalog] = None):
+        # Initialize with Google provider (or 'fake' for offline runs)
+        self.llm = LLMClient(provider=provider)
         self.model = "gemini-2.0-flash"
+        # Optional CorpusStore serving bodies for documents without 'content'
+        self.corpus = corpus
+        # Events and their compiled keyword matcher (a shard of the catalog extracts only its events)
+        self.catalog = catalog or load_catalog()
+        self.events = list(self.catalog.events)
 
-    def process_document(self, doc: Dict) -> List[Dict]:
+    def process_document(self, doc: Dict, events: Optional[List[str]] = None, strict: bool = False) -> List[Dict]:
+        """
+        Extractions for each catalog event the document mentions (only `events`, if given).
+        A failed LLM call skips the event, like one with no claims; with `strict`
+        it raises RuntimeError instead, so the caller can retry.
+        """
         extracted_events = []
-        content = doc.get('content', '')
+        events = self.events if events is None else events
         
         # GEMINI OPTIMIZATION:
         # Gemini 2.0 Flash has a massive context window.
         # We can increase chunk size significantly (e.g., 50k chars).
-        chunks = self._chunk_text(content, chunk_size=50000)
-        
-        for event_key, keywords in self.EVENTS.items():
-            relevant_text = []
+        doc_id = doc.get('id')
+        if 'content' not in doc and self.corpus is not None:
+            # Lazy: each chunk is read from the map as the filter below asks for it
+            chunks = self.corpus.chunks(str(doc_id), chunk_size=50000, overlap=1000)
+        else:
+            with span("extract.chunk", document=doc_id) as s:
+                chunks = self._chunk_text(doc.get('content', ''), chunk_size=50000)
+                s.set(chunks=len(chunks))
+
+        # One pass over the chunks. An event stops collecting once its joined
+        # context reaches the limit, since later chunks would be cut off anyway.
+        separator = "\n---\n"
+        relevant = {event_key: [] for event_key in events}
+        filled = {event_key: 0 for event_key in events}
+        open_events = list(events)
+        matcher = self.catalog.matcher
+        with span("extract.filter", document=doc_id) as s:
+            scanned = 0
             for chunk in chunks:
-                if any(kw in chunk.lower() for kw in keywords):
-                    relevant_text.append(chunk)
-            
+                if not open_events:
+                    break
+                scanned += 1
+                for event_key in matcher.match(chunk.lower(), open_events):
+                    filled[event_key] += len(chunk) + (len(separator) if relevant[event_key] else 0)
+                    relevant[event_key].append(chunk)
+                    if filled[event_key] >= self.CONTEXT_LIMIT:
+                        open_events.remove(event_key)
+            s.set(chunks=scanned, events=sum(1 for r in relevant.values() if r))
+
+        for event_key, relevant_text in relevant.items():
             if not relevant_text:
                 continue 
                 
             # Limit context to avoid rate limits
-            context = "\n---\n".join(relevant_text)[:100000]
+            context = separator.join(relevant_text)[:self.CONTEXT_LIMIT]
             
             logger.info(f"Extracting '{event_key}' from {doc.get('title')}...")
             
-            result = self._extract_claims(context, event_key, doc)
+            with span("extract.event", document=doc_id, event=event_key, context_chars=len(context)) as s:
+                result = self._extract_claims(context, event_key, doc, strict=strict)
+                s.set(claims=len(result['claims']) if result else 0)
             if result:
                 extracted_events.append(result)
                 
         return extracted_events
 
-    def _extract_claims(self, text: str, event: str, doc_metadata: Dict) -> Optional[Dict]:
+    def _extract_claims(self, text: str, event: str, doc_metadata: Dict, strict: bool = False) -> Optional[Dict]:
         system_prompt = """You are an expert historian. Extract specific factual claims, temporal details, and author tone regarding the specified historical event.
         
         Return a JSON object with this EXACT schema:
@@ -80,25 +113,21 @@ class EventExtractor:
         {text}
         """
         
-        data = self.llm.extract_json(system_prompt, user_prompt, model=self.model)
-        
-        # --- SAFETY BLOCK: Handle Types (Dict vs List) ---
-        if isinstance(data, list):
-            # If LLM returned a list (e.g. []), return None
-            if not data: 
-                return None
-            # If it returned a list of objects, take the first one
-            if isinstance(data[0], dict):
-                data = data[0]
-            else:
-                return None
-        # -------------------------------------------------
-        
-        if data and isinstance(data, dict) and data.get("claims") and len(data["claims"]) > 0:
+        payload = self.llm.extract_structured(system_prompt, user_prompt, EXTRACTION_ADAPTER, model=self.model)
+        if payload is None and strict:
+            # The provider failed or never returned a valid response: not the same as "no claims"
+            raise RuntimeError(f"Extraction of '{event}' from {doc_metadata.get('id')} failed")
+
+        # Some responses wrap the object in a list; an empty list means "no claims"
+        if isinstance(payload, list):
+            payload = payload[0] if payload else None
+
+        data = to_dict(payload)
+        if data and data.get("claims"):
             data["source_id"] = doc_metadata.get("id")
             data["source_type"] = doc_metadata.get("document_type")
             return data
-            
+
         return None
 
     def _chunk_text(self, text: str, chunk_size: int) -> List[str]:
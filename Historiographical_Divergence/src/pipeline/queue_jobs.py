@@ -0,0 +1,147 @@
+"""
+Work Queue Jobs.
+What the pipeline puts on the work queue: one extraction job per (document,
+event) and one judge job per (primary, secondary) pair, the handlers workers
+run for them, and the worker loop itself.
+"""
+import threading
+import time
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+from src.evaluation.llm_judge import SINGLE_PAIR_MODES, LLMJudge, pair_fingerprint, plan_incremental
+from src.evaluation.prescreen import load_cascade_config
+from src.pipeline.work_queue import Heartbeat, WorkQueue, worker_name
+from src.utils.logger import get_logger
+from src.utils.tracing import span
+from config.settings import JUDGE_MODE
+
+logger = get_logger("queue_jobs")
+
+EXTRACT = "extract"
+JUDGE = "judge"
+KINDS = (EXTRACT, JUDGE)
+
+# Each judge job is a single pair, so listwise batching does not apply
+JOB_JUDGE_MODES = SINGLE_PAIR_MODES
+
+
+# ---------------------------------------------------------
+# Producers
+# ---------------------------------------------------------
+
+def extract_jobs(documents: List[Dict], events: List[str]) -> Iterator[Tuple[str, Dict]]:
+    """Document-major, like 03_extract_events.py, so collected results come out in the same order."""
+    for doc in documents:
+        for event in events:
+            yield f"{doc['id']}|{event}", {"document": str(doc['id']), "event": event}
+
+
+def judge_jobs(extractions: List[Dict], existing: List[Dict], mode: str = JUDGE_MODE) -> Tuple[List, Dict]:
+    """
+    (pair_id, payload) per pair, in pair order, and the stored judgments that
+    are still fresh (enqueued as done). The payload carries the pair's
+    fingerprint, so re-enqueueing after claims or the prompt change resets it.
+    """
+    if mode not in JOB_JUDGE_MODES:
+        raise ValueError(f"Queued judging supports {JOB_JUDGE_MODES}, not '{mode}'")
+    pairs = LLMJudge.build_pairs(extractions)
+    plan = plan_incremental(pairs, existing, LLMJudge.MODEL, mode)
+    cascade = load_cascade_config() if mode == "cascade" else None
+    jobs = [(pair['pair_id'], {"pair": pair, "mode": mode,
+                               "fingerprint": pair_fingerprint(pair, LLMJudge.MODEL, mode, cascade=cascade)})
+            for pair in pairs]
+    fresh = {pair['pair_id']: plan['stored'][pair['pair_id']] for pair in plan['fresh']}
+    return jobs, fresh
+
+
+# ---------------------------------------------------------
+# Handlers: payload -> result (None for "nothing to record")
+# ---------------------------------------------------------
+
+class ExtractHandler:
+
+    def __init__(self, extractor, corpus):
+        self.extractor = extractor
+        self.corpus = corpus
+        # Metadata only; bodies are read from the memory-mapped corpus per job
+        self.documents = {str(doc['id']): doc for doc in corpus.documents()}
+
+    def __call__(self, payload: Dict) -> Optional[Dict]:
+        doc = self.documents[payload['document']]
+        # Strict: a failed call raises so the job is retried on another lease, while
+        # a document with no claims about the event is done with a null result
+        extractions = self.extractor.process_document(doc, events=[payload['event']], strict=True)
+        return extractions[0] if extractions else None
+
+
+class JudgeHandler:
+
+    def __init__(self, judge: LLMJudge):
+        self.judge = judge
+
+    def __call__(self, payload: Dict) -> Dict:
+        # Alignment and overlap are pair-local, so this matches the pair in a full run
+        judgment = self.judge.judge_one(payload['pair'], mode=payload['mode'])
+        if not judgment:
+            # Raised so the job is retried on another lease
+            raise RuntimeError(f"No valid judgment for {payload['pair']['pair_id']}")
+        return judgment
+
+
+# ---------------------------------------------------------
+# Workers
+# ---------------------------------------------------------
+
+def run_workers(queue: WorkQueue,
+                kind: str,
+                handler: Callable[[Dict], object],
+                threads: int = 1,
+                poll_seconds: float = 2.0) -> Dict[str, int]:
+    """
+    Runs `threads` worker loops in this process until no job of `kind` is
+    pending or leased. While other workers still hold leases, idle threads
+    keep polling, since those leases may expire and need taking over.
+
+    Returns:
+        Jobs completed, handler errors (the job is retried or failed), and leases
+        lost mid-job (expired and taken over), for this process
+    """
+    counts = {"completed": 0, "errors": 0, "lost": 0}
+    lock = threading.Lock()
+
+    def count(outcome: str):
+        with lock:
+            counts[outcome] += 1
+
+    def loop():
+        worker = worker_name()
+        try:
+            while True:
+                leases = queue.lease(kind, worker)
+                if not leases:
+                    if not queue.outstanding(kind):
+                        return
+                    time.sleep(poll_seconds)
+                    continue
+                lease = leases[0]
+                try:
+                    with span("queue.job", kind=kind, job=lease.job_id, attempt=lease.attempts):
+                        with Heartbeat(queue, lease) as heartbeat:
+                            result = handler(lease.payload)
+                except Exception as e:
+                    logger.error(f"✗ {lease.job_id} (attempt {lease.attempts}): {e}")
+                    queue.fail(lease, f"{type(e).__name__}: {e}")
+                    count("errors")
+                    continue
+                if heartbeat.lost or not queue.complete(lease, result):
+                    count("lost")
+                else:
+                    count("completed")
+        finally:
+            queue.close()
+
+    workers = [threading.Thread(target=loop, name=f"{kind}-worker-{i}") for i in range(max(1, threads))]
+    for t in workers:
+        t.start()
+    for t in workers:
+        t.join()
+    return counts
@@ -0,0 +1,253 @@
+"""
+Pipeline Runner.
+Runs the phase scripts as a DAG of stages with declared inputs and outputs.
+A stage is skipped when the hash of its inputs, code and command matches the
+one recorded after its last successful run; independent stages run concurrently.
+"""
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+from src.utils.logger import get_logger
+
+logger = get_logger("pipeline_runner")
+
+STATE_FILE = ".pipeline_state.json"
+
+
+class Stage:
+    """One step of the pipeline: a command plus the files it reads, writes and runs."""
+
+    def __init__(self,
+                 name: str,
+                 command: List[str],
+                 inputs: Sequence[Path] = (),
+                 outputs: Sequence[Path] = (),
+                 code: Sequence[Path] = (),
+                 env: Sequence[str] = ()):
+        """
+        Args:
+            name: Unique stage name
+            command: argv, run from the project root
+            inputs: Files or directories read (missing ones hash as absent)
+            outputs: Files or directories that must exist after a successful run
+            code: Scripts and source directories whose changes invalidate the stage
+            env: Environment variables that change the stage's output
+        """
+        self.name = name
+        self.command = list(command)
+        self.inputs = [Path(p) for p in inputs]
+        self.outputs = [Path(p) for p in outputs]
+        self.code = [Path(p) for p in code]
+        self.env = list(env)
+
+
+def hash_path(path: Path, digest) -> None:
+    """Feeds a file's bytes, or every file under a directory in sorted order, into `digest`."""
+    if path.is_dir():
+        for child in sorted(p for p in path.rglob("*") if p.is_file() and "__pycache__" not in p.parts):
+            digest.update(str(child.relative_to(path)).encode("utf-8"))
+            hash_path(child, digest)
+    elif path.is_file():
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+    else:
+        digest.update(b"<missing>")
+
+
+class Pipeline:
+    """Dependency graph of stages; a stage depends on whichever stages produce its inputs."""
+
+    def __init__(self, stages: List[Stage], root: Path, state_path: Optional[Path] = None):
+        self.stages = {stage.name: stage for stage in stages}
+        if len(self.stages) != len(stages):
+            raise ValueError("Stage names must be unique")
+        self.root = Path(root)
+        self.state_path = state_path or self.root / STATE_FILE
+        self._lock = threading.Lock()
+
+        producers: Dict[Path, str] = {}
+        for stage in stages:
+            for output in stage.outputs:
+                if output in producers:
+                    raise ValueError(f"{output} is produced by both {producers[output]} and {stage.name}")
+                producers[output] = stage.name
+        self.deps = {
+            stage.name: sorted({producers[i] for i in stage.inputs if i in producers and producers[i] != stage.name})
+            for stage in stages
+        }
+        self._check_acyclic()
+
+    def _check_acyclic(self):
+        visiting, done = set(), set()
+
+        def visit(name: str, trail: List[str]):
+            if name in done:
+                return
+            if name in visiting:
+                raise ValueError(f"Pipeline has a cycle: {' -> '.join(trail + [name])}")
+            visiting.add(name)
+            for dep in self.deps[name]:
+                visit(dep, trail + [name])
+            visiting.discard(name)
+            done.add(name)
+
+        for name in self.stages:
+            visit(name, [])
+
+    def upstream(self, targets: Sequence[str]) -> List[str]:
+        """`targets` plus everything they depend on, in stage declaration order."""
+        unknown = [t for t in targets if t not in self.stages]
+        if unknown:
+            raise KeyError(f"Unknown stages: {unknown}. Available: {list(self.stages)}")
+        selected, stack = set(), list(targets)
+        while stack:
+            name = stack.pop()
+            if name not in selected:
+                selected.add(name)
+                stack.extend(self.deps[name])
+        return [name for name in self.stages if name in selected]
+
+    # ---------------------------------------------------------
+    # Fingerprints
+    # ---------------------------------------------------------
+
+    def fingerprint(self, stage: Stage) -> str:
+        digest = hashlib.sha256()
+        # The interpreter path is left out so a new virtualenv does not invalidate everything
+        command = ["python" if arg == sys.executable else arg for arg in stage.command]
+        digest.update(json.dumps(command).encode("utf-8"))
+        for var in stage.env:
+            digest.update(f"{var}={os.getenv(var, '')}".encode("utf-8"))
+        for group, paths in (("code", stage.code), ("inputs", stage.inputs)):
+            digest.update(group.encode("utf-8"))
+            for path in paths:
+                digest.update(str(path).encode("utf-8"))
+                hash_path(self.root / path, digest)
+        return digest.hexdigest()
+
+    def load_state(self) -> Dict:
+        if not self.state_path.exists():
+            return {}
+        with open(self.state_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def _record(self, state: Dict, name: str, fingerprint: str, seconds: float):
+        with self._lock:
+            state[name] = {"fingerprint": fingerprint, "seconds": round(seconds, 2),
+                           "finished": time.strftime("%Y-%m-%dT%H:%M:%S")}
+            tmp = self.state_path.with_suffix(".tmp")
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(state, f, indent=2)
+            os.replace(tmp, self.state_path)
+
+    def is_fresh(self, stage: Stage, state: Dict) -> bool:
+        entry = state.get(stage.name)
+        return bool(entry) and entry["fingerprint"] == self.fingerprint(stage) \
+            and all((self.root / output).exists() for output in stage.outputs)
+
+    # ---------------------------------------------------------
+    # Execution
+    # ---------------------------------------------------------
+
+    def _execute(self, stage: Stage) -> bool:
+        env = dict(os.environ)
+        env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(self.root), env.get("PYTHONPATH")]))
+        logger.info(f"▶ {stage.name}: {' '.join(stage.command)}")
+        completed = subprocess.run(stage.command, cwd=self.root, env=env)
+        if completed.returncode != 0:
+            logger.error(f"✗ {stage.name} exited with code {completed.returncode}")
+            return False
+        missing = [str(o) for o in stage.outputs if not (self.root / o).exists()]
+        if missing:
+            logger.error(f"✗ {stage.name} did not produce {missing}")
+            return False
+        return True
+
+    def run(self,
+            targets: Optional[Sequence[str]] = None,
+            force: Sequence[str] = (),
+            max_workers: int = 2,
+            dry_run: bool = False) -> Dict[str, str]:
+        """
+        Runs the stages needed for `targets` (default: all).
+
+        Stages are fingerprinted only once their dependencies have finished, so a
+        stage whose upstream rewrote its inputs with identical bytes is still skipped.
+
+        Args:
+            targets: Stages to bring up to date, with their upstream stages
+            force: Stages to run even if up to date
+            max_workers: Stages run at the same time
+            dry_run: Only report which stages are stale, judged against current inputs
+
+        Returns:
+            Stage name -> 'ran' | 'skipped' | 'failed' | 'blocked' | 'stale'
+        """
+        selected = self.upstream(targets or list(self.stages))
+        state = self.load_state()
+        status: Dict[str, str] = {}
+
+        if dry_run:
+            for name in selected:
+                stage = self.stages[name]
+                stale = name in force or not self.is_fresh(stage, state) \
+                    or any(status[dep] == "stale" for dep in self.deps[name])
+                status[name] = "stale" if stale else "skipped"
+                logger.info(f"  {name}: {'stale' if stale else 'up to date'}")
+            return status
+
+        pending = list(selected)
+        running = {}
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+            while pending or running:
+                for name in list(pending):
+                    deps = [status.get(dep) for dep in self.deps[name] if dep in selected]
+                    if any(d in ("failed", "blocked") for d in deps):
+                        status[name] = "blocked"
+                        pending.remove(name)
+                        logger.warning(f"⊘ {name}: blocked by a failed upstream stage")
+                    elif all(d in ("ran", "skipped") for d in deps) and len(running) < max(1, max_workers):
+                        pending.remove(name)
+                        stage = self.stages[name]
+                        if name not in force and self.is_fresh(stage, state):
+                            status[name] = "skipped"
+                            logger.info(f"✓ {name}: up to date")
+                            continue
+                        running[pool.submit(self._timed, stage)] = name
+                if not running:
+                    continue
+
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    name = running.pop(future)
+                    ok, seconds = future.result()
+                    status[name] = "ran" if ok else "failed"
+                    if ok:
+                        # Outputs are final now, so hash after the run: a later
+                        # edit to an input is then seen as a change
+                        self._record(state, name, self.fingerprint(self.stages[name]), seconds)
+                        logger.info(f"✓ {name}: done in {seconds:.1f}s")
+        return status
+
+    def _timed(self, stage: Stage):
+        start = time.perf_counter()
+        try:
+            ok = self._execute(stage)
+        except OSError as e:
+            logger.error(f"✗ {stage.name} could not start: {e}")
+            ok = False
+        return ok, time.perf_counter() - start
+
+
+def python_stage(name: str, script: str, *args: str, **kwargs) -> Stage:
+    """Stage running a project script with the current interpreter; the script is part of its code."""
+    code = [Path(script)] + list(kwargs.pop("code", []))
+    return Stage(name, [sys.executable, script, *args], code=code, **kwargs)
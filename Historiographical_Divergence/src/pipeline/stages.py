@@ -0,0 +1,61 @@
+"""
+Pipeline Stage Definitions.
+The phase scripts declared as stages, with paths relative to the project root.
+Dependencies follow from the paths: a stage runs after whichever stage writes its inputs.
+"""
+from pathlib import Path
+from typing import List
+from src.pipeline.runner import Stage, python_stage
+
+PROCESSED = Path("data/processed")
+GUTENBERG_DATASET = PROCESSED / "gutenberg_dataset.json"
+LOC_DATASET = PROCESSED / "loc_dataset.json"
+LOC_CLEAN = PROCESSED / "loc_dataset_clean.json"
+EXTRACTED = Path("data/extracted/extracted_events.json")
+JUDGMENTS = Path("data/evaluation/judge_results.json")
+CASCADE_CONFIG = Path("data/evaluation/cascade_config.json")
+VALIDATION_REPORT = Path("data/validation/validation_report.json")
+FIGURES = Path("results/figures")
+STORE = Path("data/store.sqlite3")
+
+SETTINGS = Path("config/settings.py")
+CATALOG = Path("config/catalog.yaml")
+UTILS = Path("src/utils")
+
+# Settings read from the environment that change what the LLM stages produce
+LLM_ENV = ["LLM_PROVIDER", "LLM_RECORD_MODE", "FAKE_LLM_SEED"]
+CATALOG_ENV = ["CATALOG_PATH"]
+CASCADE_ENV = ["CASCADE_CHEAP_MODEL", "CASCADE_PRESCREEN_LOW", "CASCADE_PRESCREEN_HIGH", "CASCADE_BAND_LOW",
+               "CASCADE_BAND_HIGH", "CASCADE_SCORE_INTERCEPT", "CASCADE_SCORE_SLOPE"]
+JUDGE_ENV = LLM_ENV + CASCADE_ENV + [
+    "JUDGE_MODE", "FUSE_PRIMARIES", "JUDGE_ALIGN_CLAIMS", "PRIMARY_DEDUP_THRESHOLD",
+    "ALIGNMENT_MIN_SIMILARITY", "ALIGNMENT_MAX_UNMATCHED_SECONDARY", "LISTWISE_TOKEN_BUDGET", "LISTWISE_MAX_BATCH"
+]
+
+
+def default_stages() -> List[Stage]:
+    return [
+        # The two scrapes share no inputs, so they run side by side
+        python_stage("scrape_gutenberg", "scripts/01_scrape_data.py", "--only", "gutenberg",
+                     inputs=[CATALOG], outputs=[GUTENBERG_DATASET], code=[Path("src/scraping"), UTILS, SETTINGS],
+                     env=CATALOG_ENV),
+        python_stage("scrape_loc", "scripts/01_scrape_data.py", "--only", "loc",
+                     inputs=[CATALOG], outputs=[LOC_DATASET], code=[Path("src/scraping"), UTILS, SETTINGS],
+                     env=CATALOG_ENV),
+        python_stage("preprocess", "scripts/02_preprocess_data.py",
+                     inputs=[LOC_DATASET], outputs=[LOC_CLEAN], code=[Path("src/scraping"), UTILS]),
+        python_stage("extract", "scripts/03_extract_events.py",
+                     inputs=[LOC_CLEAN, GUTENBERG_DATASET, CATALOG], outputs=[EXTRACTED],
+                     code=[Path("src/extraction"), UTILS, SETTINGS], env=LLM_ENV + CATALOG_ENV),
+        python_stage("judge", "scripts/04_run_judge.py",
+                     inputs=[EXTRACTED, CASCADE_CONFIG], outputs=[JUDGMENTS],
+                     code=[Path("src/evaluation"), Path("src/validation"), UTILS, SETTINGS], env=JUDGE_ENV),
+        python_stage("validate", "scripts/05_validate_judge.py",
+                     inputs=[EXTRACTED, JUDGMENTS], outputs=[VALIDATION_REPORT],
+                     code=[Path("src/evaluation"), Path("src/validation"), UTILS, SETTINGS], env=JUDGE_ENV),
+        python_stage("report", "scripts/generate_report.py",
+                     inputs=[JUDGMENTS, VALIDATION_REPORT], outputs=[FIGURES],
+                     code=[Path("src/validation"), UTILS, SETTINGS]),
+        python_stage("store", "scripts/manage_store.py", "import", "--mirror",
+                     inputs=[LOC_CLEAN, GUTENBERG_DATASET, EXTRACTED, JUDGMENTS], outputs=[STORE], code=[UTILS]),
+    ]
@@ -0,0 +1,268 @@
+"""
+Streaming Extraction -> Judge Pipeline.
+Extraction workers, a pairing coordinator and judge workers connected by
+bounded queues, so historian accounts are judged while other books are still
+being extracted. Judgments are appended to JSONL as they complete.
+"""
+import queue
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+from src.evaluation.llm_judge import SINGLE_PAIR_MODES, LLMJudge, make_pair_id, plan_incremental
+from src.evaluation.primary_index import build_primary_index, is_primary
+from src.utils.data_loader import append_jsonl
+from src.utils.logger import get_logger
+from config.settings import (
+    FUSE_PRIMARIES, JUDGE_MAX_WORKERS, JUDGE_MODE, PRIMARY_INDEX_PATH,
+    STREAM_EXTRACT_WORKERS, STREAM_QUEUE_SIZE
+)
+
+logger = get_logger("streaming")
+
+_DONE = object()  # end-of-stream marker passed down each queue
+
+# Pairs arrive one at a time, so listwise batches can never form
+STREAMING_MODES = SINGLE_PAIR_MODES
+
+
+def is_primary_document(doc: Dict) -> bool:
+    """Documents whose extractions count as primary (see primary_index.is_primary)."""
+    return is_primary({"source_id": str(doc.get('id', ''))})
+
+
+class StreamingPipeline:
+    """
+    Documents -> [extract workers] -> extractions -> [coordinator] -> pairs -> [judge workers].
+
+    A pair needs its event's final primary account, which (with fused primaries)
+    depends on every Lincoln document. Primary documents are therefore extracted
+    first; historian extractions that arrive before the last of them finishes are
+    buffered per event, and from then on each one is paired and judged on arrival.
+    The pairs and primaries are the same as LLMJudge.build_pairs would produce.
+    Every queue is bounded, so a slow judge stalls extraction rather than letting
+    extractions pile up in memory.
+    """
+
+    def __init__(self,
+                 extractor,
+                 judge: LLMJudge,
+                 extract_workers: int = STREAM_EXTRACT_WORKERS,
+                 judge_workers: int = JUDGE_MAX_WORKERS,
+                 queue_size: int = STREAM_QUEUE_SIZE,
+                 mode: str = JUDGE_MODE,
+                 fuse: bool = FUSE_PRIMARIES,
+                 index_path: Optional[Path] = PRIMARY_INDEX_PATH):
+        """
+        Args:
+            extractor: An EventExtractor
+            judge: An LLMJudge
+            extract_workers: Documents extracted concurrently
+            judge_workers: Pairs judged concurrently
+            queue_size: Capacity of the extraction and pair queues
+            mode: 'pairwise' or 'cascade'. Listwise is rejected: it needs whole
+                batches up front, and a lone pair would run pairwise under a
+                listwise fingerprint
+            fuse: Judge against the fused primary claims of each event
+            index_path: Primary index cache (see primary_index)
+        """
+        if mode not in STREAMING_MODES:
+            raise ValueError(f"Streaming supports {STREAMING_MODES}, not '{mode}'")
+        self.extractor = extractor
+        self.judge = judge
+        self.extract_workers = max(1, extract_workers)
+        self.judge_workers = max(1, judge_workers)
+        self.queue_size = max(1, queue_size)
+        self.mode = mode
+        self.fuse = fuse
+        self.index_path = index_path
+
+    def run(self,
+            documents: List[Dict],
+            existing: Optional[List[Dict]] = None,
+            judgments_stream: Optional[Path] = None,
+            extractions_stream: Optional[Path] = None) -> Dict:
+        """
+        Extracts and judges `documents` end to end.
+
+        Args:
+            documents: Processed documents (LoC and Gutenberg)
+            existing: Stored judgments; pairs whose fingerprint still matches are reused
+            judgments_stream: JSONL file each new judgment is appended to
+            extractions_stream: JSONL file each extraction is appended to
+
+        Returns:
+            {"extractions", "judgments" (in build_pairs order), "stats"}
+        """
+        # Lincoln documents first, so the primaries are final as early as possible
+        order = sorted(range(len(documents)), key=lambda i: not is_primary_document(documents[i]))
+        doc_queue: queue.Queue = queue.Queue(maxsize=self.extract_workers * 2)
+        ext_queue: queue.Queue = queue.Queue(maxsize=self.queue_size)
+        pair_queue: queue.Queue = queue.Queue(maxsize=self.queue_size)
+
+        self._start = time.perf_counter()
+        self._first_result = None
+        self._lock = threading.Lock()
+        self._new: Dict[str, Dict] = {}
+        self._reused: Set[str] = set()
+        self._streams = {"judgments": judgments_stream, "extractions": extractions_stream}
+        stored = plan_incremental([], existing or [], self.judge.model, self.mode, self.judge.align_claims)['stored']
+
+        def feed():
+            for i in order:
+                doc_queue.put((i, documents[i]))
+            for _ in range(self.extract_workers):
+                doc_queue.put(_DONE)
+
+        threads = [threading.Thread(target=feed, name="stream-feed", daemon=True)]
+        threads += [threading.Thread(target=self._extract_worker, args=(doc_queue, ext_queue),
+                                     name=f"stream-extract-{n}", daemon=True) for n in range(self.extract_workers)]
+        threads += [threading.Thread(target=self._judge_worker, args=(pair_queue,),
+                                     name=f"stream-judge-{n}", daemon=True) for n in range(self.judge_workers)]
+        for thread in threads:
+            thread.start()
+
+        judges = threads[-self.judge_workers:]
+        try:
+            by_doc = self._coordinate(documents, ext_queue, pair_queue, stored)
+            for thread in threads[:-self.judge_workers]:
+                thread.join()
+        finally:
+            # On a coordinator error the (daemon) extract workers may be blocked
+            # on a full queue; only the judges are drained and joined
+            for _ in range(self.judge_workers):
+                pair_queue.put(_DONE)
+            for thread in judges:
+                thread.join()
+
+        # Same record order as the batch pipeline: documents in input order,
+        # judgments in build_pairs order
+        extractions = [ext for i in range(len(documents)) for ext in by_doc.get(i, [])]
+        pairs = LLMJudge.build_pairs(extractions, fuse=self.fuse, index_path=self.index_path)
+        judgments = []
+        for pair in pairs:
+            if pair['pair_id'] in self._new:
+                judgments.append(self._new[pair['pair_id']])
+            elif pair['pair_id'] in self._reused:
+                judgments.append(stored[pair['pair_id']])
+
+        total = time.perf_counter() - self._start
+        stats = {
+            "documents": len(documents),
+            "extractions": len(extractions),
+            "pairs": len(pairs),
+            "judged": len(self._new),
+            "reused": len(self._reused),
+            "time_to_first_judgment": self._first_result,
+            "wall_time": total
+        }
+        logger.info(f"Streaming pipeline: {stats['judged']} judged, {stats['reused']} reused in {total:.1f}s "
+                    f"(first judgment after {self._first_result or 0:.1f}s)")
+        return {"extractions": extractions, "judgments": judgments, "stats": stats}
+
+    def _append(self, stream: str, record: Dict):
+        path = self._streams[stream]
+        if path:
+            # One write per line, so concurrent workers need no lock
+            append_jsonl([record], path)
+
+    # ---------------------------------------------------------
+    # Stages
+    # ---------------------------------------------------------
+
+    def _extract_worker(self, doc_queue: queue.Queue, ext_queue: queue.Queue):
+        while True:
+            item = doc_queue.get()
+            if item is _DONE:
+                return
+            i, doc = item
+            try:
+                events = self.extractor.process_document(doc)
+            except Exception as e:
+                logger.error(f"Extraction failed for {doc.get('title')}: {e}")
+                events = []
+            for ext in events:
+                self._append("extractions", ext)
+            # Blocks while the coordinator is behind (backpressure)
+            ext_queue.put((i, events))
+
+    def _coordinate(self, documents, ext_queue, pair_queue, stored) -> Dict[int, List[Dict]]:
+        """Pairs extractions as they arrive; returns extractions per document index."""
+        primaries_left = sum(1 for doc in documents if is_primary_document(doc))
+        primaries: List[Tuple[int, Dict]] = []  # (document index, extraction), sorted before use
+        pending: Dict[str, List[Dict]] = {}  # event -> historian extractions waiting for the primaries
+        index: Optional[Dict[str, Dict]] = None
+        by_doc: Dict[int, List[Dict]] = {}
+        queued = 0
+
+        def emit(secondary: Dict):
+            nonlocal queued
+            primary = index.get(secondary['event'])
+            if primary is None:
+                return
+            pair = {
+                "pair_id": make_pair_id(secondary['event'], primary['source_id'], secondary['source_id']),
+                "primary": primary,
+                "secondary": secondary
+            }
+            old = stored.get(pair['pair_id'])
+            if old and old.get('fingerprint') == self.judge.fingerprint(pair, self.mode):
+                self._reused.add(pair['pair_id'])
+                return
+            queued += 1
+            pair_queue.put(pair)
+
+        for _ in range(len(documents)):
+            i, events = ext_queue.get()
+            by_doc[i] = events
+            if is_primary_document(documents[i]):
+                primaries.extend((i, e) for e in events if is_primary(e))
+                primaries_left -= 1
+            for ext in events:
+                if is_primary(ext):
+                    continue
+                if index is None:
+                    pending.setdefault(ext['event'], []).append(ext)
+                else:
+                    emit(ext)
+
+            if index is None and primaries_left == 0:
+                index = self._primary_index(primaries)
+                logger.info(f"Primaries ready for {len(index)} events after "
+                            f"{time.perf_counter() - self._start:.1f}s; releasing buffered accounts")
+                for event, secondaries in pending.items():
+                    if event not in index:
+                        logger.warning(f"Skipping {event}: No primary source (Lincoln) found.")
+                    for secondary in secondaries:
+                        emit(secondary)
+                pending.clear()
+
+        logger.info(f"Extraction finished; {queued} pairs queued for judging")
+        return by_doc
+
+    def _primary_index(self, primaries: List[Tuple[int, Dict]]) -> Dict[str, Dict]:
+        # Input order, not arrival order, decides fusion order and the unfused "first" primary
+        primaries = [ext for _, ext in sorted(primaries, key=lambda item: item[0])]
+        if self.fuse:
+            return build_primary_index(primaries, cache_path=self.index_path)
+        index = {}
+        for ext in primaries:
+            index.setdefault(ext['event'], ext)
+        return index
+
+    def _judge_worker(self, pair_queue: queue.Queue):
+        while True:
+            pair = pair_queue.get()
+            if pair is _DONE:
+                return
+            try:
+                judgment = self.judge.judge_one(pair, mode=self.mode)
+            except Exception as e:
+                logger.error(f"Judging failed for {pair['pair_id']}: {e}")
+                continue
+            if judgment:
+                with self._lock:
+                    self._new[judgment['pair_id']] = judgment
+                    if self._first_result is None:
+                        self._first_result = time.perf_counter() - self._start
+                self._append("judgments", judgment)
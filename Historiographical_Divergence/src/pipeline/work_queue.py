@@ -0,0 +1,327 @@
+"""
+Leased Work Queue.
+A SQLite job table shared by any number of worker processes, on one machine or
+on several that mount the same filesystem. A worker leases a job for a fixed
+time and heartbeats while it runs; a lease that runs out (the worker died or
+hung) makes the job leasable again. Results are committed against the lease,
+so a job is done exactly once however many workers touched it.
+"""
+import hashlib
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from src.utils.data_loader import dumps, loads
+from src.utils.logger import get_logger
+from config.settings import WORK_QUEUE_LEASE_SECONDS, WORK_QUEUE_MAX_ATTEMPTS, WORK_QUEUE_PATH
+
+logger = get_logger("work_queue")
+
+STATUSES = ("pending", "leased", "done", "failed")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id        TEXT PRIMARY KEY,
+    kind          TEXT NOT NULL,
+    payload       TEXT NOT NULL,
+    payload_hash  TEXT NOT NULL,
+    status        TEXT NOT NULL,
+    attempts      INTEGER NOT NULL DEFAULT 0,
+    worker        TEXT,
+    lease_token   TEXT,
+    lease_expires REAL,
+    result        TEXT,
+    error         TEXT,
+    updated       REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_kind_status ON jobs(kind, status, lease_expires);
+CREATE INDEX IF NOT EXISTS idx_jobs_updated ON jobs(kind, updated);
+"""
+
+
+def worker_name() -> str:
+    """host:pid:thread, unique across the machines sharing a queue."""
+    return f"{socket.gethostname()}:{os.getpid()}:{threading.current_thread().name}"
+
+
+class Lease:
+    __slots__ = ("job_id", "kind", "payload", "token", "attempts")
+
+    def __init__(self, job_id: str, kind: str, payload: Dict, token: str, attempts: int):
+        self.job_id = job_id
+        self.kind = kind
+        self.payload = payload
+        self.token = token
+        self.attempts = attempts
+
+    def __repr__(self):
+        return f"Lease({self.job_id!r}, attempt {self.attempts})"
+
+
+class WorkQueue:
+    """
+    Jobs move pending -> leased -> done, or back to pending when a lease expires
+    or the worker reports an error, until `max_attempts` leases have been spent
+    (then failed).
+
+    The database uses the rollback journal rather than WAL: WAL needs shared
+    memory between the processes, which machines mounting the file over NFS or
+    SMB don't have. Every state change is one short BEGIN IMMEDIATE transaction,
+    so contention stays small next to the seconds an LLM call takes. Lease
+    expiry compares wall clocks across machines; keep the lease far longer
+    than any clock skew between them.
+    """
+
+    def __init__(self,
+                 path: Path = WORK_QUEUE_PATH,
+                 lease_seconds: float = WORK_QUEUE_LEASE_SECONDS,
+                 max_attempts: int = WORK_QUEUE_MAX_ATTEMPTS,
+                 timeout: float = 60.0):
+        """
+        Args:
+            path: Database file (created on first use)
+            lease_seconds: How long a leased job stays reserved without a heartbeat
+            max_attempts: Leases a job gets before it is marked failed
+            timeout: Seconds a writer waits for another writer's lock
+        """
+        self.path = Path(path)
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.timeout = timeout
+        self._local = threading.local()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn.executescript(SCHEMA)
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            conn.execute("PRAGMA journal_mode = DELETE")
+            self._local.conn = conn
+        return conn
+
+    def close(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """BEGIN IMMEDIATE ... COMMIT, rolled back if the block raises."""
+        conn = self.conn
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    # ---------------------------------------------------------
+    # Producers
+    # ---------------------------------------------------------
+
+    def enqueue(self,
+                kind: str,
+                jobs: Iterable[Tuple[str, Dict]],
+                done: Optional[Dict[str, object]] = None,
+                force: bool = False) -> int:
+        """
+        Adds (job_id, payload) jobs in one transaction. Idempotent: a job already
+        queued with the same payload keeps its state and result, while a changed
+        payload resets it to pending (any lease on the old payload is voided).
+
+        Args:
+            done: job_id -> result for jobs whose result is already known; they
+                  are added as done rather than pending
+            force: Reset every existing job, even one with an unchanged payload
+
+        Returns:
+            Jobs added or reset
+        """
+        done = done or {}
+        sql = ("INSERT INTO jobs (job_id, kind, payload, payload_hash, status, result, updated) "
+               "VALUES (?, ?, ?, ?, ?, ?, ?) "
+               "ON CONFLICT(job_id) DO UPDATE SET payload = excluded.payload, "
+               "payload_hash = excluded.payload_hash, status = excluded.status, result = excluded.result, "
+               "attempts = 0, worker = NULL, lease_token = NULL, lease_expires = NULL, error = NULL, "
+               "updated = excluded.updated")
+        if not force:
+            sql += " WHERE jobs.payload_hash != excluded.payload_hash"
+
+        def rows():
+            now = time.time()
+            for job_id, payload in jobs:
+                data = dumps(payload)
+                known = job_id in done
+                yield (job_id, kind, data, hashlib.sha256(data.encode("utf-8")).hexdigest(),
+                       "done" if known else "pending", dumps(done[job_id]) if known else None, now)
+
+        with self.transaction() as conn:
+            before = conn.total_changes
+            conn.executemany(sql, rows())
+            return conn.total_changes - before
+
+    def requeue(self, kind: Optional[str] = None, statuses: Tuple[str, ...] = ("failed",)) -> int:
+        """Resets jobs in `statuses` to pending with a fresh attempt budget."""
+        where = f"status IN ({', '.join('?' * len(statuses))})"
+        params = list(statuses)
+        if kind:
+            where += " AND kind = ?"
+            params.append(kind)
+        with self.transaction() as conn:
+            return conn.execute(
+                "UPDATE jobs SET status = 'pending', attempts = 0, worker = NULL, lease_token = NULL, "
+                f"lease_expires = NULL, updated = ? WHERE {where}", [time.time(), *params]).rowcount
+
+    # ---------------------------------------------------------
+    # Workers
+    # ---------------------------------------------------------
+
+    def lease(self, kind: str, worker: Optional[str] = None, limit: int = 1) -> List[Lease]:
+        """
+        Reserves up to `limit` pending (or lease-expired) jobs of `kind`, oldest
+        first. Expired jobs that have used up their attempts are marked failed.
+        """
+        worker = worker or worker_name()
+        now = time.time()
+        with self.transaction() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = 'failed', error = COALESCE(error, 'lease expired'), "
+                "lease_token = NULL, updated = ? "
+                "WHERE kind = ? AND status = 'leased' AND lease_expires < ? AND attempts >= ?",
+                (now, kind, now, self.max_attempts))
+            rows = conn.execute(
+                "SELECT job_id, payload, attempts FROM jobs WHERE kind = ? AND "
+                "(status = 'pending' OR (status = 'leased' AND lease_expires < ?)) "
+                "ORDER BY rowid LIMIT ?", (kind, now, limit)).fetchall()
+            leases = []
+            for job_id, payload, attempts in rows:
+                token = uuid.uuid4().hex
+                conn.execute(
+                    "UPDATE jobs SET status = 'leased', worker = ?, lease_token = ?, lease_expires = ?, "
+                    "attempts = attempts + 1, updated = ? WHERE job_id = ?",
+                    (worker, token, now + self.lease_seconds, now, job_id))
+                leases.append(Lease(job_id, kind, loads(payload), token, attempts + 1))
+        return leases
+
+    def heartbeat(self, lease: Lease) -> bool:
+        """Extends a lease. False if it was lost (expired and taken, or the job was re-enqueued)."""
+        now = time.time()
+        with self.transaction() as conn:
+            return conn.execute(
+                "UPDATE jobs SET lease_expires = ?, updated = ? WHERE job_id = ? AND lease_token = ? "
+                "AND status = 'leased'", (now + self.lease_seconds, now, lease.job_id, lease.token)).rowcount == 1
+
+    def complete(self, lease: Lease, result) -> bool:
+        """
+        Commits a job's result. Only the current lease holder can commit, so a
+        worker whose lease expired and was re-leased can't overwrite (or
+        duplicate) the other worker's result. Returns whether it was committed.
+        """
+        with self.transaction() as conn:
+            committed = conn.execute(
+                "UPDATE jobs SET status = 'done', result = ?, error = NULL, lease_token = NULL, "
+                "lease_expires = NULL, updated = ? WHERE job_id = ? AND lease_token = ?",
+                (dumps(result), time.time(), lease.job_id, lease.token)).rowcount == 1
+        if not committed:
+            logger.warning(f"Lease on {lease.job_id} was lost; result discarded")
+        return committed
+
+    def fail(self, lease: Lease, error: str) -> bool:
+        """Returns a job to pending after an error, or marks it failed once its attempts are spent."""
+        status = "failed" if lease.attempts >= self.max_attempts else "pending"
+        with self.transaction() as conn:
+            return conn.execute(
+                "UPDATE jobs SET status = ?, error = ?, lease_token = NULL, lease_expires = NULL, updated = ? "
+                "WHERE job_id = ? AND lease_token = ?",
+                (status, error[:2000], time.time(), lease.job_id, lease.token)).rowcount == 1
+
+    # ---------------------------------------------------------
+    # Reads
+    # ---------------------------------------------------------
+
+    def results(self, kind: str) -> Iterator[Tuple[str, object]]:
+        """(job_id, result) of done jobs, in enqueue order."""
+        for job_id, result in self.conn.execute(
+                "SELECT job_id, result FROM jobs WHERE kind = ? AND status = 'done' ORDER BY rowid", (kind,)):
+            yield job_id, loads(result)
+
+    def errors(self, kind: Optional[str] = None, limit: int = 20) -> List[Dict]:
+        sql = "SELECT job_id, kind, status, attempts, worker, error FROM jobs WHERE error IS NOT NULL"
+        params = []
+        if kind:
+            sql += " AND kind = ?"
+            params.append(kind)
+        sql += " ORDER BY updated DESC LIMIT ?"
+        columns = ("job_id", "kind", "status", "attempts", "worker", "error")
+        return [dict(zip(columns, row)) for row in self.conn.execute(sql, [*params, limit])]
+
+    def progress(self, window: float = 300.0) -> Dict[str, Dict]:
+        """
+        Per kind: jobs by status, expired leases, live workers, and the rate
+        (jobs/s) finished in the last `window` seconds with the ETA it implies.
+        """
+        now = time.time()
+        report: Dict[str, Dict] = {}
+        for kind, status, count in self.conn.execute("SELECT kind, status, COUNT(*) FROM jobs GROUP BY kind, status"):
+            entry = report.setdefault(kind, {s: 0 for s in STATUSES})
+            entry[status] = count
+        for kind, entry in report.items():
+            expired, workers = self.conn.execute(
+                "SELECT SUM(lease_expires < ?), COUNT(DISTINCT CASE WHEN lease_expires >= ? THEN worker END) "
+                "FROM jobs WHERE kind = ? AND status = 'leased'", (now, now, kind)).fetchone()
+            recent = self.conn.execute("SELECT COUNT(*) FROM jobs WHERE kind = ? AND status = 'done' AND updated >= ?",
+                                       (kind, now - window)).fetchone()[0]
+            remaining = entry["pending"] + entry["leased"]
+            rate = recent / window
+            entry.update({"total": sum(entry[s] for s in STATUSES), "expired_leases": expired or 0,
+                          "workers": workers, "rate_per_s": round(rate, 3),
+                          "eta_s": round(remaining / rate) if rate and remaining else None})
+        return report
+
+    def outstanding(self, kind: str) -> int:
+        """Jobs of `kind` not yet done or failed."""
+        return self.conn.execute("SELECT COUNT(*) FROM jobs WHERE kind = ? AND status IN ('pending', 'leased')",
+                                 (kind,)).fetchone()[0]
+
+
+class Heartbeat:
+    """Keeps a lease alive from a background thread while its job runs: `with Heartbeat(queue, lease):`."""
+
+    def __init__(self, queue: WorkQueue, lease: Lease, interval: Optional[float] = None):
+        self.queue = queue
+        self.lease = lease
+        self.interval = interval or max(1.0, queue.lease_seconds / 3)
+        self.lost = False
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=f"heartbeat-{lease.job_id}", daemon=True)
+
+    def _run(self):
+        try:
+            while not self._stop.wait(self.interval):
+                try:
+                    if not self.queue.heartbeat(self.lease):
+                        self.lost = True
+                        return
+                except sqlite3.Error as e:
+                    # A busy database is retried on the next beat; the lease has slack for it
+                    logger.warning(f"Heartbeat for {self.lease.job_id} failed: {e}")
+        finally:
+            self.queue.close()  # this thread's connection
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        return False
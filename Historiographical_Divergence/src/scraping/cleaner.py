@@ -3,12 +3,18 @@ Text cleaning logic for Lincoln documents.
 Removes archival metadata and extracts core content.
 """
 import re
+from src.utils.tracing import span
 
 def clean_loc_content(doc_type: str, content: str, title: str) -> str:
     """Master cleaning function that routes to specific cleaners."""
     if not content:
         return ""
-        
+    with span("clean", title=title, doc_type=doc_type, chars_in=len(content)) as s:
+        cleaned = _route(doc_type, content, title)
+        s.set(chars_out=len(cleaned))
+    return cleaned
+
+def _route(doc_type: str, content: str, title: str) -> str:
     # specific handling for Second Inaugural (it has unique structure)
     if "Second Inaugural" in title:
         return _clean_second_inaugural(content)
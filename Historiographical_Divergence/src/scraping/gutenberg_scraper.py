@@ -6,7 +6,9 @@ import time
 import requests
 from pathlib import Path
 from typing import Dict, List, Optional
+from src.utils.catalog import Catalog, load_catalog
 from src.utils.logger import get_logger
+from src.utils.tracing import span
 
 logger = get_logger(__name__)
 
@@ -15,18 +17,19 @@ class GutenbergScraper:
     """Scrape books from Project Gutenberg."""
     
     BASE_URL = "https://www.gutenberg.org"
-    BOOK_IDS = [6812, 6811, 12801, 14004, 18379]
     
-    def __init__(self, output_dir: Path, rate_limit: float = 1.0):
+    def __init__(self, output_dir: Path, rate_limit: float = 1.0, catalog: Optional[Catalog] = None):
         """
         Initialize scraper.
         
         Args:
             output_dir: Directory to save raw text files
             rate_limit: Seconds to wait between requests
+            catalog: Catalog (or shard of one) listing the books; defaults to config/catalog.yaml
         """
         self.output_dir = output_dir
         self.rate_limit = rate_limit
+        self.book_ids = (catalog or load_catalog()).books
         self.output_dir.mkdir(parents=True, exist_ok=True)
         logger.info(f"GutenbergScraper initialized: {output_dir}")
     
@@ -39,7 +42,7 @@ class GutenbergScraper:
         """
         books = []
         
-        for book_id in self.BOOK_IDS:
+        for book_id in self.book_ids:
             logger.info(f"Scraping book {book_id}...")
             try:
                 book_data = self.scrape_book(book_id)
@@ -72,8 +75,10 @@ class GutenbergScraper:
         text = None
         for url in urls:
             try:
-                response = requests.get(url, timeout=10)
-                response.raise_for_status()
+                with span("scrape.request", url=url, book_id=book_id) as s:
+                    response = requests.get(url, timeout=10)
+                    s.set(status=response.status_code, bytes=len(response.content))
+                    response.raise_for_status()
                 text = response.text
                 logger.debug(f"Successfully fetched from {url}")
                 break
@@ -87,7 +92,9 @@ class GutenbergScraper:
         metadata = self.extract_metadata(text)
         
         # Clean content (remove Gutenberg headers/footers)
-        content = self.clean_content(text)
+        with span("clean", document=f"gutenberg_{book_id}", chars_in=len(text)) as s:
+            content = self.clean_content(text)
+            s.set(chars_out=len(content))
         
         # Save raw file
         raw_path = self.output_dir / f"book_{book_id}.txt"
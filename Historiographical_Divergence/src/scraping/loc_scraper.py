@@ -4,14 +4,16 @@ Strategy:
 1. Direct XML Tile Server Construction (Primary)
 2. Manual Ground Truth Fallback (Safety Net)
 """
-import json
 import time
 import requests
 import re
 from pathlib import Path
 from typing import Dict, List, Optional
 from bs4 import BeautifulSoup
+from src.utils.catalog import Catalog, load_catalog
+from src.utils.data_loader import save_json
 from src.utils.logger import get_logger
+from src.utils.tracing import span
 
 logger = get_logger(__name__)
 
@@ -46,22 +48,16 @@ With malice toward none; with charity for all; with firmness in the right, as Go
 By these recent successes the re-inauguration of the national authority -- reconstruction -- which has had a large share of thought from the first, is pressed much more closely upon our attention. It is fraught with great difficulty. Unlike a case of a war between independent nations, there is no authorized organ for us to treat with. No one man has authority to give up the rebellion for any other man. We simply must begin with, and mould from, disorganized and discordant elements. Nor is it a small additional embarrassment that we, the loyal people, differ among ourselves as to the mode, manner, and means of reconstruction."""
     }
 
-    DOCUMENTS = [
-        {"url": "https://www.loc.gov/resource/mal.0440500/", "title": "Letter about Election Night 1860", "doc_type": "Letter", "recipient": "Truman Smith", "date": "1860-11-10"},
-        {"url": "https://www.loc.gov/resource/mal.0882800", "title": "Fort Sumter Decision Letter", "doc_type": "Letter", "recipient": "Gustavus Fox", "date": "1861-05-01"},
-        {"url": "https://www.loc.gov/exhibits/gettysburg-address/ext/trans-nicolay-copy.html", "title": "Gettysburg Address", "doc_type": "Speech", "recipient": None, "date": "1863-11-19"},
-        {"url": "https://www.loc.gov/resource/mal.4361300", "title": "Second Inaugural Address", "doc_type": "Speech", "recipient": None, "date": "1865-03-04"},
-        {"url": "https://www.loc.gov/resource/mal.4361800/", "title": "Last Public Address", "doc_type": "Speech", "recipient": None, "date": "1865-04-11"}
-    ]
-    
-    def __init__(self, output_dir: Path, rate_limit: float = 1.0):
+    def __init__(self, output_dir: Path, rate_limit: float = 1.0, catalog: Optional[Catalog] = None):
         self.output_dir = output_dir
         self.rate_limit = rate_limit
+        # Documents to fetch (url, title, doc_type, recipient, date)
+        self.documents = (catalog or load_catalog()).primary_sources
         self.output_dir.mkdir(parents=True, exist_ok=True)
     
     def scrape_all(self) -> List[Dict]:
         documents = []
-        for doc_info in self.DOCUMENTS:
+        for doc_info in self.documents:
             logger.info(f"Processing: {doc_info['title']}...")
             try:
                 doc_data = self.scrape_document(doc_info)
@@ -127,7 +123,9 @@ By these recent successes the re-inauguration of the national authority -- recon
             xml_url = f"https://tile.loc.gov/storage-services/service/mss/mal/{prefix}/{numeric_id}/{numeric_id}.xml"
             
             logger.info(f"  ↳ Checking XML: {xml_url}")
-            resp = requests.get(xml_url, timeout=10)
+            with span("scrape.request", url=xml_url, document=doc_id) as s:
+                resp = requests.get(xml_url, timeout=10)
+                s.set(status=resp.status_code, bytes=len(resp.content))
             if resp.status_code == 200:
                 self._save_raw(doc_id, resp.text, "xml")
                 # Clean parsing
@@ -139,7 +137,9 @@ By these recent successes the re-inauguration of the national authority -- recon
 
     def _scrape_exhibit(self, url: str) -> str:
         try:
-            resp = requests.get(url, timeout=10)
+            with span("scrape.request", url=url) as s:
+                resp = requests.get(url, timeout=10)
+                s.set(status=resp.status_code, bytes=len(resp.content))
             soup = BeautifulSoup(resp.content, 'lxml')
             trans = soup.find('div', class_='transcript') or soup.find('div', class_='text')
             if trans: return trans.get_text(separator='\n', strip=True)
@@ -173,6 +173,4 @@ if __name__ == "__main__":
     base = Path("data")
     scraper = LoCScraper(base / "raw" / "loc")
     docs = scraper.scrape_all()
-    (base / "processed").mkdir(parents=True, exist_ok=True)
-    with open(base / "processed" / "loc_dataset.json", "w") as f:
-        json.dump(docs, f, indent=2)
\ No newline at end of file
+    save_json(docs, base / "processed" / "loc_dataset.json")
\ No newline at end of file
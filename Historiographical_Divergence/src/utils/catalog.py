@@ -0,0 +1,234 @@
+"""
+Workload Catalog.
+Events (keywords, date windows, descriptions), Gutenberg books and LoC primary
+sources, loaded from one YAML file (config/catalog.yaml). Keyword matchers are
+compiled once per load, and a catalog can be split into shards by event or by
+book so several processes can each take a slice of a large workload.
+"""
+import re
+import zlib
+from datetime import date
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+import yaml
+from src.utils.logger import get_logger
+from config.settings import CATALOG_PATH
+
+logger = get_logger("catalog")
+
+SHARD_BY = ("event", "book")
+
+
+def shard_of(key, count: int) -> int:
+    """Stable shard number of `key` in [0, count): the same in every process and run."""
+    return zlib.crc32(str(key).encode("utf-8")) % count
+
+
+class Event:
+
+    def __init__(self, key: str, description: str, date_window: Optional[Tuple[str, str]],
+                 keywords: List[str], patterns: List[str], aliases: List[str]):
+        self.key = key
+        self.description = description
+        self.date_window = date_window
+        self.keywords = keywords
+        self.patterns = patterns
+        self.aliases = aliases
+
+    def __repr__(self):
+        return f"Event({self.key!r})"
+
+
+class KeywordMatcher:
+    """
+    Every event's keywords compiled into one table. A keyword shared by several
+    events is searched once per text, and keywords whose events have all matched
+    already (or aren't asked for) are skipped. Keywords are plain substring
+    tests: in CPython `kw in text` scans far faster than a regex alternation of
+    the same words, so regexes are kept for the optional `patterns`.
+    """
+
+    def __init__(self, events: List[Event]):
+        self.keys = [event.key for event in events]
+        self._bits = {key: 1 << i for i, key in enumerate(self.keys)}
+        self._all = (1 << len(self.keys)) - 1
+        masks: Dict[str, int] = {}
+        for event in events:
+            for keyword in event.keywords:
+                masks[keyword] = masks.get(keyword, 0) | self._bits[event.key]
+        self._keywords = tuple(masks.items())
+        self._patterns = tuple((re.compile(pattern, re.IGNORECASE), self._bits[event.key])
+                               for event in events for pattern in event.patterns)
+
+    def match(self, lowered: str, among: Optional[Iterable[str]] = None) -> List[str]:
+        """
+        Events (in catalog order) whose keywords or patterns occur in `lowered`,
+        a lower-cased text. With `among`, only those events are tested.
+        """
+        pending = self._all if among is None else sum(self._bits[key] for key in among)
+        hits = 0
+        for keyword, mask in self._keywords:
+            if mask & pending & ~hits and keyword in lowered:
+                hits |= mask
+        for pattern, bit in self._patterns:
+            if bit & pending & ~hits and pattern.search(lowered):
+                hits |= bit
+        hits &= pending
+        return [key for i, key in enumerate(self.keys) if hits >> i & 1]
+
+
+class Catalog:
+
+    def __init__(self, events: List[Event], books: List[int], primary_sources: List[Dict],
+                 source: Optional[Path] = None):
+        self.events: Dict[str, Event] = {event.key: event for event in events}
+        self.books = books
+        self.primary_sources = primary_sources
+        self.source = source
+        self._aliases = {alias: event.key for event in events for alias in [event.key, *event.aliases]}
+        self.matcher = KeywordMatcher(events)
+
+    def __repr__(self):
+        return (f"Catalog({len(self.events)} events, {len(self.books)} books, "
+                f"{len(self.primary_sources)} primary sources)")
+
+    def resolve(self, key: str) -> str:
+        """Canonical key of an event, given its key or one of its aliases."""
+        try:
+            return self._aliases[key]
+        except KeyError:
+            raise KeyError(f"Unknown event '{key}' (catalog: {', '.join(self.events)})") from None
+
+    def event(self, key: str) -> Event:
+        return self.events[self.resolve(key)]
+
+    def canonical(self, record: Dict) -> Dict:
+        """
+        An extraction or judgment with an aliased `event` replaced by its
+        canonical key (and a judgment's pair_id rebuilt to match), so results
+        stored under an old key still pair and match fingerprints. Records
+        already canonical, or for events no longer in the catalog, are
+        returned as they are.
+        """
+        old = record.get('event')
+        new = self._aliases.get(old, old)
+        if new == old:
+            return record
+        record = {**record, 'event': new}
+        if str(record.get('pair_id', '')).startswith(f"{old}|"):
+            record['pair_id'] = new + record['pair_id'][len(old):]
+        return record
+
+    def canonicalize(self, records: Iterable[Dict]) -> List[Dict]:
+        return [self.canonical(record) for record in records]
+
+    def shard(self, index: int, count: int, by: str = "event") -> "Catalog":
+        """
+        Shard `index` of `count`. By event, each shard keeps a slice of the events
+        and every source; by book, a slice of the books and every event, with the
+        primary sources (few, and needed once) in shard 0.
+        """
+        if by not in SHARD_BY:
+            raise ValueError(f"Unknown shard key '{by}' (expected one of {SHARD_BY})")
+        if not 0 <= index < count:
+            raise ValueError(f"Shard {index} is out of range for {count} shards")
+        events, books, primary_sources = list(self.events.values()), self.books, self.primary_sources
+        if by == "event":
+            events = [event for event in events if shard_of(event.key, count) == index]
+        else:
+            books = [book_id for book_id in books if shard_of(book_id, count) == index]
+            primary_sources = primary_sources if index == 0 else []
+        return Catalog(events, books, primary_sources, source=self.source)
+
+    def covers(self, doc_id: str) -> bool:
+        """Whether a corpus document is one of this catalog's sources (Gutenberg books by id, anything else as a primary source)."""
+        doc_id = str(doc_id)
+        if doc_id.startswith("gutenberg_"):
+            return doc_id[len("gutenberg_"):] in {str(book_id) for book_id in self.books}
+        return bool(self.primary_sources)
+
+
+# ---------------------------------------------------------
+# Loading
+# ---------------------------------------------------------
+
+def _strings(value, field: str, key: str) -> List[str]:
+    if value is None:
+        return []
+    if isinstance(value, (str, int)):
+        value = [value]
+    if not isinstance(value, list):
+        raise ValueError(f"Event '{key}': '{field}' must be a list")
+    return [str(item) for item in value]
+
+
+def _event(key: str, spec: Dict) -> Event:
+    if not isinstance(spec, dict):
+        raise ValueError(f"Event '{key}' must be a mapping")
+    keywords = [kw.lower() for kw in _strings(spec.get("keywords"), "keywords", key)]
+    patterns = _strings(spec.get("patterns"), "patterns", key)
+    if not keywords and not patterns:
+        raise ValueError(f"Event '{key}' has no keywords or patterns")
+    for pattern in patterns:
+        try:
+            re.compile(pattern)
+        except re.error as e:
+            raise ValueError(f"Event '{key}': bad pattern {pattern!r}: {e}") from None
+
+    window = _strings(spec.get("date_window"), "date_window", key)
+    if window:
+        if len(window) != 2:
+            raise ValueError(f"Event '{key}': date_window must be [first, last]")
+        try:
+            first, last = (date.fromisoformat(day) for day in window)
+        except ValueError:
+            raise ValueError(f"Event '{key}': date_window dates must be YYYY-MM-DD") from None
+        if first > last:
+            raise ValueError(f"Event '{key}': date_window ends before it starts")
+
+    return Event(key=key,
+                 description=str(spec.get("description") or ""),
+                 date_window=tuple(window) if window else None,
+                 keywords=keywords,
+                 patterns=patterns,
+                 aliases=_strings(spec.get("aliases"), "aliases", key))
+
+
+def parse_catalog(data: Dict, source: Optional[Path] = None) -> Catalog:
+    """Validates a decoded catalog file and builds the Catalog."""
+    if not isinstance(data, dict) or not isinstance(data.get("events"), dict) or not data["events"]:
+        raise ValueError(f"Catalog {source or ''} must define a non-empty 'events' mapping")
+    events = [_event(str(key), spec) for key, spec in data["events"].items()]
+
+    seen: Dict[str, str] = {}
+    for event in events:
+        for name in [event.key, *event.aliases]:
+            if seen.setdefault(name, event.key) != event.key:
+                raise ValueError(f"Event name '{name}' is used by both '{seen[name]}' and '{event.key}'")
+
+    books = [int(book_id) for book_id in data.get("books") or []]
+    primary_sources = list(data.get("primary_sources") or [])
+    for doc in primary_sources:
+        if not isinstance(doc, dict) or not doc.get("url"):
+            raise ValueError(f"Every primary source needs a 'url' (got {doc!r})")
+
+    return Catalog(events, books, primary_sources, source=source)
+
+
+@lru_cache(maxsize=None)
+def _load(path: Path, mtime_ns: int) -> Catalog:
+    with open(path, 'r', encoding='utf-8') as f:
+        catalog = parse_catalog(yaml.safe_load(f), source=path)
+    logger.debug(f"Loaded {catalog} from {path}")
+    return catalog
+
+
+def load_catalog(path: Path = CATALOG_PATH) -> Catalog:
+    """
+    The catalog at `path`, parsed and compiled once per process (and again
+    only if the file changes). Shared: derive slices with shard() rather than
+    modifying it.
+    """
+    path = Path(path).resolve()
+    return _load(path, path.stat().st_mtime_ns)
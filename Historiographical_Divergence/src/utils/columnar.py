@@ -0,0 +1,241 @@
+"""
+Columnar store for judgments, discrepancies and extractions.
+Flattens the nested JSON outputs into normalised tables saved as Parquet
+(when pyarrow is installed) or as compressed NumPy archives otherwise, so
+analytics load only the columns they need and aggregate them vectorised.
+"""
+import os
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+import numpy as np
+import pandas as pd
+from src.utils.data_loader import load_json, save_json
+from src.utils.logger import get_logger
+from config.settings import COLUMNAR_DIR
+
+logger = get_logger("columnar")
+
+SOURCES_FILE = "_sources.json"
+
+# Table name -> columns. String columns are stored dictionary-encoded
+# (categorical), numeric ones as float64 (NaN = missing) or int64.
+SCHEMAS = {
+    "judgments": {
+        "judgment_id": "int", "pair_id": "str", "event": "str", "historian": "str",
+        "primary_source": "str", "secondary_source": "str",
+        "consistency_score": "float", "classification": "str", "reasoning": "str",
+        "judge_stage": "str", "model": "str"
+    },
+    "discrepancies": {
+        "judgment_id": "int", "event": "str", "historian": "str",
+        "claim": "str", "type": "str", "severity": "str"
+    },
+    "extractions": {
+        "extraction_id": "int", "source_id": "str", "event": "str", "author": "str",
+        "source_type": "str", "tone": "str", "n_claims": "int"
+    },
+    "claims": {
+        "extraction_id": "int", "source_id": "str", "event": "str", "position": "int", "claim": "str"
+    }
+}
+
+
+def _arrow():
+    """pyarrow modules, or None when the optional dependency is missing."""
+    try:
+        import pyarrow
+        import pyarrow.parquet
+        return pyarrow
+    except ImportError:
+        return None
+
+
+def _frame(name: str, rows: Dict[str, list]) -> pd.DataFrame:
+    columns = {}
+    for column, kind in SCHEMAS[name].items():
+        values = rows[column]
+        if kind == "str":
+            columns[column] = pd.Categorical([v if v is None or isinstance(v, str) else str(v) for v in values])
+        elif kind == "float":
+            columns[column] = np.array([np.nan if v is None else float(v) for v in values], dtype=np.float64)
+        else:
+            columns[column] = np.array(values, dtype=np.int64)
+    return pd.DataFrame(columns)
+
+
+def judgment_tables(judgments: List[Dict]) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """Judgments table plus discrepancies normalised into their own table (joined on judgment_id)."""
+    j = {column: [r.get(column) for r in judgments]
+         for column in ("pair_id", "event", "historian", "primary_source", "secondary_source",
+                        "consistency_score", "classification", "reasoning", "judge_stage")}
+    j["judgment_id"] = list(range(len(judgments)))
+    j["model"] = [r.get('judge_model') or (r.get('metadata') or {}).get('model') for r in judgments]
+
+    # One row per discrepancy, carrying its judgment's id, event and historian
+    owners = [(i, disc) for i, r in enumerate(judgments) for disc in r.get('discrepancies') or []]
+    d = {
+        "judgment_id": [i for i, _ in owners],
+        "event": [j["event"][i] for i, _ in owners],
+        "historian": [j["historian"][i] for i, _ in owners],
+        "claim": [disc.get('claim') for _, disc in owners],
+        "type": [disc.get('type', 'Unknown') for _, disc in owners],
+        "severity": [disc.get('severity') for _, disc in owners]
+    }
+    return _frame("judgments", j), _frame("discrepancies", d)
+
+
+def extraction_tables(extractions: List[Dict]) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """Extractions table plus one row per claim."""
+    e = {column: [r.get(column) for r in extractions]
+         for column in ("source_id", "event", "author", "source_type", "tone")}
+    e["extraction_id"] = list(range(len(extractions)))
+    e["n_claims"] = [len(r.get('claims') or []) for r in extractions]
+
+    owners = [(i, position, claim) for i, r in enumerate(extractions)
+              for position, claim in enumerate(r.get('claims') or [])]
+    c = {
+        "extraction_id": [i for i, _, _ in owners],
+        "source_id": [e["source_id"][i] for i, _, _ in owners],
+        "event": [e["event"][i] for i, _, _ in owners],
+        "position": [position for _, position, _ in owners],
+        "claim": [claim for _, _, claim in owners]
+    }
+    return _frame("extractions", e), _frame("claims", c)
+
+
+def _pack_strings(values: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """UTF-8 blob plus offsets (Arrow's string layout) for a list of strings."""
+    encoded = [v.encode("utf-8") for v in values]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(b) for b in encoded], out=offsets[1:])
+    return np.frombuffer(b"".join(encoded), dtype=np.uint8), offsets
+
+
+def _unpack_strings(blob: np.ndarray, offsets: np.ndarray) -> List[str]:
+    raw = blob.tobytes()
+    return [raw[offsets[k]:offsets[k + 1]].decode("utf-8") for k in range(len(offsets) - 1)]
+
+
+class ColumnarStore:
+    """
+    One file per table under `root`: <table>.parquet, or <table>.npz where each
+    column is its own archive member (strings as dictionary codes plus a packed
+    dictionary), so reading a column subset never touches the other columns.
+    """
+
+    def __init__(self, root: Path = COLUMNAR_DIR, backend: Optional[str] = None):
+        """
+        Args:
+            root: Store directory
+            backend: 'parquet' or 'npz' (default: parquet if pyarrow is installed)
+        """
+        if backend is None:
+            backend = "parquet" if _arrow() else "npz"
+        if backend not in ("parquet", "npz"):
+            raise ValueError(f"Unknown columnar backend: {backend}")
+        if backend == "parquet" and not _arrow():
+            raise ImportError("The parquet backend needs pyarrow (pip install pyarrow)")
+        self.root = Path(root)
+        self.backend = backend
+
+    def path(self, name: str) -> Path:
+        return self.root / f"{name}.{self.backend}"
+
+    def exists(self, name: str) -> bool:
+        return self.path(name).exists()
+
+    def write_table(self, name: str, df: pd.DataFrame):
+        self.root.mkdir(parents=True, exist_ok=True)
+        # Written beside the target and swapped in, so readers never see a partial table
+        tmp = str(self.root / f".{name}.{self.backend}.tmp")
+        try:
+            if self.backend == "parquet":
+                pa = _arrow()
+                pa.parquet.write_table(pa.Table.from_pandas(df, preserve_index=False), tmp)
+            else:
+                self._write_npz(df, tmp)
+            os.replace(tmp, self.path(name))
+        finally:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+
+    def read_table(self, name: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """Reads `columns` (default: all) of a table; string columns come back categorical."""
+        path = self.path(name)
+        if not path.exists():
+            raise FileNotFoundError(f"Columnar table not found: {path}")
+        if self.backend == "parquet":
+            return _arrow().parquet.read_table(path, columns=columns).to_pandas()
+        return self._read_npz(path, columns)
+
+    @staticmethod
+    def _write_npz(df: pd.DataFrame, path: str):
+        arrays = {"__columns__": np.array(list(df.columns), dtype=str)}
+        for column in df.columns:
+            series = df[column]
+            if isinstance(series.dtype, pd.CategoricalDtype):
+                arrays[f"{column}.codes"] = series.cat.codes.to_numpy(dtype=np.int32)
+                blob, offsets = _pack_strings([str(c) for c in series.cat.categories])
+                arrays[f"{column}.dict"] = blob
+                arrays[f"{column}.offsets"] = offsets
+            else:
+                arrays[column] = series.to_numpy()
+        with open(path, 'wb') as f:
+            np.savez_compressed(f, **arrays)
+
+    @staticmethod
+    def _read_npz(path: Path, columns: Optional[List[str]]) -> pd.DataFrame:
+        with np.load(path, allow_pickle=False) as archive:
+            available = archive["__columns__"].tolist()
+            wanted = available if columns is None else columns
+            missing = [c for c in wanted if c not in available]
+            if missing:
+                raise KeyError(f"Columns not in {path.name}: {missing}")
+            data = {}
+            for column in wanted:
+                if f"{column}.codes" in archive.files:
+                    categories = _unpack_strings(archive[f"{column}.dict"], archive[f"{column}.offsets"])
+                    data[column] = pd.Categorical.from_codes(archive[f"{column}.codes"], categories)
+                else:
+                    data[column] = archive[column]
+        return pd.DataFrame(data)
+
+    # ---------------------------------------------------------
+    # Keeping the store in step with the JSON outputs
+    # ---------------------------------------------------------
+
+    def _sources(self) -> Dict:
+        path = self.root / SOURCES_FILE
+        if not path.exists():
+            return {}
+        return load_json(path)
+
+    def sync(self, source_path: Path, builder: Callable[[list], Dict[str, pd.DataFrame]]) -> bool:
+        """
+        Rebuilds the tables derived from `source_path` (a JSON list) if the
+        file changed since they were written. Returns True if rebuilt.
+        """
+        stat = source_path.stat()
+        signature = [stat.st_size, stat.st_mtime_ns]
+        sources = self._sources()
+        entry = sources.get(source_path.name, {})
+        if entry.get("signature") == signature and entry.get("backend") == self.backend \
+                and all(self.exists(t) for t in entry.get("tables", [])):
+            return False
+
+        tables = builder(load_json(source_path))
+        for name, df in tables.items():
+            self.write_table(name, df)
+
+        sources[source_path.name] = {"signature": signature, "backend": self.backend, "tables": list(tables)}
+        save_json(sources, self.root / SOURCES_FILE)
+        logger.info(f"Columnar store: rebuilt {', '.join(tables)} from {source_path.name} ({self.backend})")
+        return True
+
+    def sync_judgments(self, judgments_path: Path) -> bool:
+        return self.sync(judgments_path, lambda records: dict(zip(("judgments", "discrepancies"),
+                                                                  judgment_tables(records))))
+
+    def sync_extractions(self, extractions_path: Path) -> bool:
+        return self.sync(extractions_path, lambda records: dict(zip(("extractions", "claims"),
+                                                                    extraction_tables(records))))
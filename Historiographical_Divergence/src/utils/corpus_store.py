@@ -0,0 +1,204 @@
+"""
+Memory-mapped corpus store.
+Document bodies live in contiguous UTF-8 blob files with a small JSON index
+of metadata and offsets; bodies are read through mmap, so chunking and
+keyword scans page text in on demand and processes share the OS page cache.
+"""
+import mmap
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence
+import numpy as np
+from src.utils.data_loader import iter_records, loads, save_json
+from src.utils.logger import get_logger
+from config.settings import CORPUS_DIR
+
+logger = get_logger("corpus_store")
+
+INDEX_FILE = "index.json"
+CHECKPOINTS_FILE = "checkpoints.npy"
+SHARD_BYTES = 1 << 30  # start a new blob file past 1 GiB
+
+# Byte offset recorded every CHECKPOINT characters of non-ASCII bodies, so a
+# character range maps to a byte range without decoding from the start.
+# Chunk sizes and strides that are multiples of it slice exactly on checkpoints.
+CHECKPOINT = 1000
+
+
+def _checkpoints(text: str) -> List[int]:
+    """Byte offset of every CHECKPOINT-th character, plus the end."""
+    offsets, position = [0], 0
+    for start in range(0, len(text), CHECKPOINT):
+        position += len(text[start:start + CHECKPOINT].encode("utf-8"))
+        offsets.append(position)
+    return offsets
+
+
+class CorpusStore:
+    """
+    Read side: `documents()` yields metadata dicts (no 'content'), and
+    `text()` / `chunks()` read bodies from the mapped blobs. Build side:
+    `sync()` rebuilds the blobs from the processed JSON datasets when they change.
+    """
+
+    def __init__(self, root: Path = CORPUS_DIR, shard_bytes: int = SHARD_BYTES):
+        self.root = Path(root)
+        self.shard_bytes = shard_bytes
+        self._index: Optional[Dict] = None
+        self._by_id: Dict[str, Dict] = {}
+        self._maps: Dict[int, mmap.mmap] = {}
+        self._files = []
+        self._checkpoints: Optional[np.ndarray] = None
+        self._lock = threading.Lock()  # extract workers share one store
+
+    # ---------------------------------------------------------
+    # Build
+    # ---------------------------------------------------------
+
+    @staticmethod
+    def _signature(paths: Sequence[Path]) -> Dict[str, List[int]]:
+        return {str(p): [p.stat().st_size, p.stat().st_mtime_ns] for p in paths if p.exists()}
+
+    def sync(self, sources: Sequence[Path]) -> bool:
+        """Rebuilds the store from JSON document lists if any of them changed. Returns True if rebuilt."""
+        signature = self._signature(sources)
+        index_path = self.root / INDEX_FILE
+        if index_path.exists():
+            with open(index_path, 'rb') as f:
+                if loads(f.read()).get("sources") == signature:
+                    return False
+        self.build(sources, signature)
+        return True
+
+    def build(self, sources: Sequence[Path], signature: Optional[Dict] = None):
+        """
+        Writes every document of `sources` into the blob files. Sources are
+        streamed, so only one document body is held in memory at a time.
+        """
+        self.close()
+        self.root.mkdir(parents=True, exist_ok=True)
+        # Index first: an interrupted build then reads as "no store", not as a stale one
+        (self.root / INDEX_FILE).unlink(missing_ok=True)
+        for stale in self.root.glob("corpus-*.bin"):
+            stale.unlink()
+
+        entries, checkpoints = [], []
+        shard, shard_size = 0, 0
+        blob = open(self.root / f"corpus-{shard:03d}.bin", 'wb')
+        try:
+            for source in sources:
+                if not source.exists():
+                    logger.warning(f"File not found: {source}")
+                    continue
+                for doc in iter_records(source):
+                    content = doc.get('content') or ''
+                    body = content.encode("utf-8")
+                    if shard_size and shard_size + len(body) > self.shard_bytes:
+                        blob.close()
+                        shard, shard_size = shard + 1, 0
+                        blob = open(self.root / f"corpus-{shard:03d}.bin", 'wb')
+                    entry = {k: v for k, v in doc.items() if k != 'content'}
+                    entry["_body"] = {"shard": shard, "offset": shard_size, "bytes": len(body),
+                                      "chars": len(content), "checkpoints": None}
+                    if len(body) != len(content):
+                        entry["_body"]["checkpoints"] = len(checkpoints)
+                        checkpoints.extend(_checkpoints(content))
+                    blob.write(body)
+                    shard_size += len(body)
+                    entries.append(entry)
+        finally:
+            blob.close()
+
+        np.save(self.root / CHECKPOINTS_FILE, np.array(checkpoints, dtype=np.int64))
+        save_json({"sources": signature or self._signature(sources), "shards": shard + 1,
+                   "documents": entries}, self.root / INDEX_FILE, indent=None)
+        total = sum(e["_body"]["bytes"] for e in entries)
+        logger.info(f"Corpus store: {len(entries)} documents, {total / 1e6:.1f} MB in {shard + 1} shard(s)")
+
+    # ---------------------------------------------------------
+    # Read
+    # ---------------------------------------------------------
+
+    def _load(self):
+        if self._index is not None:
+            return
+        with self._lock:
+            if self._index is None:
+                self._load_index()
+
+    def _load_index(self):
+        index_path = self.root / INDEX_FILE
+        if not index_path.exists():
+            raise FileNotFoundError(f"Corpus index not found: {index_path}")
+        with open(index_path, 'rb') as f:
+            self._index = loads(f.read())
+        self._by_id = {str(e.get('id')): e for e in self._index["documents"]}
+        # Memory-mapped too: a handful of int64 per 1000 characters
+        self._checkpoints = np.load(self.root / CHECKPOINTS_FILE, mmap_mode='r')
+
+    def _map(self, shard: int) -> mmap.mmap:
+        if shard not in self._maps:
+            with self._lock:
+                if shard not in self._maps:
+                    f = open(self.root / f"corpus-{shard:03d}.bin", 'rb')
+                    self._files.append(f)
+                    # mmap cannot map an empty file
+                    self._maps[shard] = (mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                                         if os.fstat(f.fileno()).st_size else b"")
+        return self._maps[shard]
+
+    def close(self):
+        for m in self._maps.values():
+            if isinstance(m, mmap.mmap):
+                m.close()
+        for f in self._files:
+            f.close()
+        self._maps, self._files = {}, []
+        self._index, self._checkpoints = None, None
+
+    def __len__(self) -> int:
+        self._load()
+        return len(self._index["documents"])
+
+    def documents(self) -> Iterator[Dict]:
+        """Document metadata in dataset order (everything but 'content')."""
+        self._load()
+        for entry in self._index["documents"]:
+            yield {k: v for k, v in entry.items() if k != "_body"}
+
+    def _entry(self, doc_id: str) -> Dict:
+        self._load()
+        if doc_id not in self._by_id:
+            raise KeyError(f"Document not in corpus store: {doc_id}")
+        return self._by_id[doc_id]["_body"]
+
+    def length(self, doc_id: str) -> int:
+        """Body length in characters."""
+        return self._entry(doc_id)["chars"]
+
+    def _byte_offset(self, body: Dict, char: int) -> int:
+        if body["checkpoints"] is None:
+            return char
+        base = body["checkpoints"]
+        k, rest = divmod(char, CHECKPOINT)
+        start = int(self._checkpoints[base + k])
+        if rest == 0:
+            return start
+        end = int(self._checkpoints[base + k + 1])
+        span = self._map(body["shard"])[body["offset"] + start:body["offset"] + end].decode("utf-8")
+        return start + len(span[:rest].encode("utf-8"))
+
+    def text(self, doc_id: str, start: int = 0, end: Optional[int] = None) -> str:
+        """Characters [start, end) of a body, reading only the pages that hold them."""
+        body = self._entry(doc_id)
+        start = max(0, min(start, body["chars"]))
+        end = body["chars"] if end is None else max(start, min(end, body["chars"]))
+        lo, hi = self._byte_offset(body, start), self._byte_offset(body, end)
+        return self._map(body["shard"])[body["offset"] + lo:body["offset"] + hi].decode("utf-8")
+
+    def chunks(self, doc_id: str, chunk_size: int, overlap: int = 0) -> Iterator[str]:
+        """Overlapping character chunks of a body, decoded one at a time."""
+        length = self.length(doc_id)
+        for start in range(0, length, chunk_size - overlap):
+            yield self.text(doc_id, start, start + chunk_size)
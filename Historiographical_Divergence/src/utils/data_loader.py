@@ -1,39 +1,257 @@
 """
 Utilities for loading and saving JSON data.
+Whole-file JSON and append-only JSONL, with atomic writes, incremental
+readers for large files and an optional orjson fast path.
 """
 import json
+import os
+import tempfile
 from pathlib import Path
-from typing import Any, List, Dict
+from typing import Any, List, Dict, Iterable, Iterator
 from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+try:
+    import orjson
+except ImportError:  # optional: the stdlib json module is used instead
+    orjson = None
+
+READ_BLOCK = 1 << 20  # bytes read per step by iter_json_array
+_WHITESPACE = " \t\n\r"
+_DELIMITERS = ",]" + _WHITESPACE  # what may follow a complete array element
+
+
+def loads(data) -> Any:
+    """Parses JSON text or bytes, with orjson when it is installed."""
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # NaN/Infinity, which the stdlib accepts and orjson does not
+            pass
+    return json.loads(data)
+
+
+def _default(obj: Any) -> Any:
+    """Objects that know their JSON form (the types in src.utils.records) are written as it."""
+    to_dict = getattr(obj, "to_dict", None)
+    if to_dict is None:
+        raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+    return to_dict()
+
+
+def _plain_float(value: float) -> bool:
+    """Whether orjson writes `value` as the stdlib does: finite and without an exponent ('1e16' vs '1e+16')."""
+    return value == 0.0 or 1e-4 <= abs(value) < 1e16
+
+
+def _orjson_safe(obj: Any) -> bool:
+    """False if `obj` holds a float orjson would write differently (NaN/Infinity become null)."""
+    if isinstance(obj, str):
+        return True
+    if isinstance(obj, float):
+        return _plain_float(obj)
+    if isinstance(obj, dict):
+        return all(map(_orjson_safe, obj.values()))
+    if isinstance(obj, (list, tuple)):
+        return all(map(_orjson_safe, obj))
+    return True
+
+
+def _orjson_default(obj: Any) -> Any:
+    data = _default(obj)
+    if not _orjson_safe(data):
+        raise TypeError("float the stdlib writes differently")  # caught below: falls back to json.dumps
+    return data
+
+
+def dumps(data: Any, indent: int = None) -> str:
+    """
+    Serialises `data` as json.dumps(..., ensure_ascii=False) would parse it back.
+    With orjson installed, indent=2 output is byte-identical to the stdlib's and
+    compact output (indent=None) drops the spaces after ':' and ','. Data with
+    NaN/Infinity or floats the stdlib writes with an exponent goes through the
+    stdlib, since orjson writes those as null and '1e16'.
+    """
+    if orjson is not None and indent in (None, 2) and _orjson_safe(data):
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+        try:
+            return orjson.dumps(data, default=_orjson_default, option=option).decode("utf-8")
+        except (TypeError, orjson.JSONEncodeError):
+            # Values orjson cannot encode (e.g. integers beyond 64 bits)
+            pass
+    return json.dumps(data, indent=indent, ensure_ascii=False, default=_default)
+
 
 def load_json(filepath: Path) -> Any:
     """Load JSON data from file."""
     logger.info(f"Loading JSON from {filepath}")
-    
+
     if not filepath.exists():
         raise FileNotFoundError(f"File not found: {filepath}")
-    
-    with open(filepath, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-    
+
+    with open(filepath, 'rb') as f:
+        data = loads(f.read())
+
     logger.info(f"Successfully loaded {len(data) if isinstance(data, list) else 'JSON'} from {filepath}")
     return data
 
 
+def atomic_write(filepath: Path, chunks: Iterable[str]) -> None:
+    """
+    Writes text chunks to a temporary file beside `filepath`, fsyncs it and
+    renames it over the target, so readers (and a crash) only ever see the old
+    or the new file. The temporary file is removed if writing fails.
+    """
+    filepath.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(prefix=f".{filepath.name}.", suffix=".tmp", dir=filepath.parent)
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            for chunk in chunks:
+                f.write(chunk)
+            f.flush()
+            os.fsync(f.fileno())
+        # mkstemp creates 0600 files; give the result the usual permissions
+        umask = os.umask(0)
+        os.umask(umask)
+        os.chmod(tmp, 0o666 & ~umask)
+        os.replace(tmp, filepath)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+def _array_chunks(items: Iterable[Any], indent: int) -> Iterator[str]:
+    """A JSON array one element at a time, formatted exactly like json.dump(indent=indent)."""
+    pad = " " * indent
+    first = True
+    for item in items:
+        text = dumps(item, indent=indent)
+        yield ("[\n" if first else ",\n") + pad + text.replace("\n", "\n" + pad)
+        first = False
+    yield "[]" if first else "\n]"
+
+
 def save_json(data: Any, filepath: Path, indent: int = 2) -> None:
-    """Save data to JSON file."""
+    """
+    Save data to JSON file, atomically. Lists (or any other iterable that is not
+    a dict or string) are serialised element by element, so a generator can be
+    written without materialising it.
+    """
     logger.info(f"Saving JSON to {filepath}")
-    filepath.parent.mkdir(parents=True, exist_ok=True)
-    
-    with open(filepath, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=indent, ensure_ascii=False)
-    
+    if indent and not isinstance(data, (dict, str, bytes)) and isinstance(data, Iterable):
+        atomic_write(filepath, _array_chunks(data, indent))
+    else:
+        atomic_write(filepath, [dumps(data, indent=indent)])
     logger.info(f"Successfully saved to {filepath}")
 
 
+def iter_json_array(filepath: Path, block_size: int = READ_BLOCK) -> Iterator[Any]:
+    """
+    Yields the elements of a top-level JSON array one at a time, reading the
+    file in blocks, so a large legacy dataset never has to be parsed in full.
+    Memory holds one element plus one block.
+    """
+    decoder = json.JSONDecoder()
+    with open(filepath, 'r', encoding='utf-8') as f:
+        buf, pos, eof = "", 0, False
+
+        def fill(size: int) -> bool:
+            nonlocal buf, pos, eof
+            block = f.read(size)
+            if not block:
+                eof = True
+                return False
+            buf = buf[pos:] + block
+            pos = 0
+            return True
+
+        def skip_whitespace():
+            nonlocal pos
+            while True:
+                while pos < len(buf) and buf[pos] in _WHITESPACE:
+                    pos += 1
+                if pos < len(buf) or not fill(block_size):
+                    return
+
+        skip_whitespace()
+        if pos >= len(buf) or buf[pos] != "[":
+            raise ValueError(f"{filepath} is not a JSON array")
+        pos += 1
+
+        size = block_size
+        while True:
+            skip_whitespace()
+            if pos >= len(buf):
+                raise ValueError(f"{filepath}: unexpected end of file inside the array")
+            if buf[pos] == "]":
+                return
+            if buf[pos] == ",":
+                pos += 1
+                continue
+            try:
+                item, end = decoder.raw_decode(buf, pos)
+                # A number decodes from any prefix ("72" of "72.5", "1.5" of "1.5e10"), so
+                # an element counts as complete only once a delimiter follows it
+                if eof or (end < len(buf) and buf[end] in _DELIMITERS):
+                    yield item
+                    pos = end
+                    size = block_size
+                    continue
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+            # Element spans past the buffer: read more, doubling so huge elements stay linear
+            fill(size)
+            size *= 2
+
+
+def iter_jsonl(filepath: Path) -> Iterator[Dict]:
+    """Yields one record per non-blank line; a truncated final line (crashed writer) is skipped."""
+    with open(filepath, 'rb') as f:
+        for n, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                yield loads(line)
+            except ValueError:
+                logger.warning(f"{filepath}:{n}: skipping malformed line")
+
+
+def iter_records(filepath: Path) -> Iterator[Any]:
+    """Records of a .jsonl file or of a JSON array file, streamed either way."""
+    if filepath.suffix == ".jsonl":
+        return iter_jsonl(filepath)
+    return iter_json_array(filepath)
+
+
+def append_jsonl(records: Iterable[Dict], filepath: Path, fsync: bool = False) -> int:
+    """
+    Appends records as JSON lines and returns how many were written. Each
+    line goes out in a single write(2) on an O_APPEND descriptor, so lines
+    from concurrent appenders (threads, or processes on a local filesystem)
+    do not interleave; `fsync` makes the records durable before returning.
+    """
+    filepath.parent.mkdir(parents=True, exist_ok=True)
+    count = 0
+    fd = os.open(filepath, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o666)
+    try:
+        for record in records:
+            line = (dumps(record) + "\n").encode("utf-8")
+            written = os.write(fd, line)
+            while written < len(line):
+                # Short write (disk full, signal): finish the line rather than leave it torn
+                written += os.write(fd, line[written:])
+            count += 1
+        if fsync:
+            os.fsync(fd)
+    finally:
+        os.close(fd)
+    return count
+
+
 def validate_document_schema(document: Dict) -> bool:
     """Validate document has required fields."""
     required = ["id", "title", "reference", "document_type", "content"]
@@ -41,4 +259,4 @@ def validate_document_schema(document: Dict) -> bool:
         if field not in document or not document[field]:
             logger.warning(f"Document missing/empty field: {field}")
             return False
-    return True
\ No newline at end of file
+    return True
@@ -0,0 +1,216 @@
+"""
+Offline fake LLM backend.
+Produces deterministic, schema-valid responses for the extractor and judge
+prompts with configurable latency, error and rate-limit (429) injection.
+Used for benchmarking and load-testing the pipeline without network access.
+"""
+import hashlib
+import json
+import math
+import random
+import re
+import threading
+import time
+from typing import Dict, List, Optional
+from src.utils.logger import get_logger
+
+logger = get_logger("fake_llm")
+
+
+class FakeLLMError(RuntimeError):
+    """Injected provider failure."""
+
+
+class FakeRateLimitError(FakeLLMError):
+    """Injected quota failure. The message carries '429' like the real SDKs."""
+
+
+class FakeLLMBackend:
+    """
+    Stand-in for a live provider.
+
+    Responses are a pure function of (seed, model, prompts), so repeated runs
+    produce identical output. Latency and fault injection draw from a separate
+    seeded RNG and do not affect the response content.
+    """
+
+    LATENCY_DISTRIBUTIONS = ("fixed", "uniform", "normal", "lognormal", "exponential")
+
+    def __init__(self,
+                 latency: str = "fixed",
+                 latency_mean: float = 0.0,
+                 latency_std: float = 0.0,
+                 error_rate: float = 0.0,
+                 rate_limit_rate: float = 0.0,
+                 seed: int = 0):
+        """
+        Args:
+            latency: One of LATENCY_DISTRIBUTIONS
+            latency_mean: Mean simulated latency in seconds
+            latency_std: Spread (std dev, or half-width for 'uniform')
+            error_rate: Probability [0-1] of raising a generic provider error
+            rate_limit_rate: Probability [0-1] of raising a 429 error
+            seed: Seed for both response content and fault injection
+        """
+        if latency not in self.LATENCY_DISTRIBUTIONS:
+            raise ValueError(f"Unknown latency distribution: {latency}")
+        self.latency = latency
+        self.latency_mean = latency_mean
+        self.latency_std = latency_std
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.seed = seed
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.calls = 0
+
+    def complete(self, system_prompt: str, user_prompt: str, model: str, temperature: float) -> str:
+        """Returns the raw response text for a prompt, after simulated latency/faults."""
+        with self._lock:
+            self.calls += 1
+            delay = self._sample_latency()
+            roll = self._rng.random()
+
+        if delay > 0:
+            time.sleep(delay)
+
+        if roll < self.rate_limit_rate:
+            raise FakeRateLimitError("429 Resource has been exhausted (fake quota)")
+        if roll < self.rate_limit_rate + self.error_rate:
+            raise FakeLLMError("500 Internal error (fake provider)")
+
+        if "Historian Judge" in system_prompt and '"judgments"' in system_prompt:
+            payload = self._fake_listwise(user_prompt, model)
+        elif "Historian Judge" in system_prompt:
+            payload = self._fake_judgment(user_prompt, model)
+        elif "Extract specific factual claims" in system_prompt:
+            rng = random.Random(self._content_seed(system_prompt, user_prompt, model))
+            payload = self._fake_extraction(user_prompt, rng)
+        else:
+            payload = {"response": "ok"}
+        return json.dumps(payload, ensure_ascii=False)
+
+    # ------------------------------------------------------------------
+    # Latency
+    # ------------------------------------------------------------------
+    def _sample_latency(self) -> float:
+        mean, std = self.latency_mean, self.latency_std
+        if mean <= 0:
+            return 0.0
+        if self.latency == "fixed":
+            value = mean
+        elif self.latency == "uniform":
+            value = self._rng.uniform(mean - std, mean + std)
+        elif self.latency == "normal":
+            value = self._rng.gauss(mean, std)
+        elif self.latency == "lognormal":
+            # Parameterised by the mean/std of the resulting distribution
+            sigma2 = 0.0 if std <= 0 else math.log(1 + (std / mean) ** 2)
+            mu = math.log(mean) - sigma2 / 2
+            value = self._rng.lognormvariate(mu, sigma2 ** 0.5)
+        else:
+            value = self._rng.expovariate(1.0 / mean)
+        return max(0.0, value)
+
+    # ------------------------------------------------------------------
+    # Deterministic payloads
+    # ------------------------------------------------------------------
+    def _content_seed(self, *parts: str) -> int:
+        digest = hashlib.sha256("\x1f".join([str(self.seed), *parts]).encode("utf-8")).digest()
+        return int.from_bytes(digest[:8], "big")
+
+    def _fake_extraction(self, user_prompt: str, rng: random.Random) -> Dict:
+        event = _field(user_prompt, "EVENT") or "unknown_event"
+        author = _field(user_prompt, "AUTHOR") or "Unknown"
+        text = user_prompt.split("TEXT:", 1)[-1]
+
+        sentences = [s.strip() for s in re.split(r"(?<=[.!?])\s+", text) if len(s.strip()) > 30]
+        if sentences:
+            claims = rng.sample(sentences, k=min(len(sentences), rng.randint(3, 5)))
+            claims = [c[:200] for c in claims]
+        else:
+            claims = []
+
+        return {
+            "event": event,
+            "author": author,
+            "claims": claims,
+            "temporal_details": {"date": f"18{rng.randint(60, 65)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+                                 "time": f"{rng.randint(0, 23):02d}:{rng.randint(0, 59):02d}"},
+            "tone": rng.choice(["objective", "critical", "reverent"])
+        }
+
+    def _fake_judgment(self, user_prompt: str, model: str) -> Dict:
+        ids = _source_ids(user_prompt)
+        rng = self._pair_rng(user_prompt, model, ids[:2])
+        return self._judgment_from(rng, _claims_after(user_prompt, "PRIMARY SOURCE"))
+
+    def _fake_listwise(self, user_prompt: str, model: str) -> Dict:
+        """
+        One judgment per secondary. Scores are seeded by pair identity, so they
+        match the pairwise fake score for the same pair up to a small jitter.
+        """
+        ids = _source_ids(user_prompt)
+        primary_claims = _claims_after(user_prompt, "PRIMARY SOURCE")
+        judgments = []
+        for secondary_id in ids[1:]:
+            pair = [ids[0], secondary_id]
+            judgment = self._judgment_from(self._pair_rng(user_prompt, model, pair), primary_claims)
+            jitter = random.Random(self._content_seed("listwise", model, *pair)).randint(-3, 3)
+            score = min(100, max(0, judgment["consistency_score"] + jitter))
+            judgment.update(consistency_score=score, classification=_classify(score))
+            judgments.append({"secondary_source": secondary_id, **judgment})
+        return {"judgments": judgments}
+
+    def _pair_rng(self, user_prompt: str, model: str, ids: List[str]) -> random.Random:
+        if len(ids) == 2:
+            return random.Random(self._content_seed("pair", model, *ids))
+        return random.Random(self._content_seed(user_prompt, model))
+
+    @staticmethod
+    def _judgment_from(rng: random.Random, primary_claims: List[str]) -> Dict:
+        score = rng.randint(0, 100)
+        discrepancies = [
+            {
+                "claim": claim,
+                "type": rng.choice(["Factual Error", "Omission", "Interpretive Difference"]),
+                "severity": rng.choice(["High", "Low"])
+            }
+            for claim in primary_claims[:rng.randint(0, 3)]
+        ]
+        return {
+            "consistency_score": score,
+            "classification": _classify(score),
+            "reasoning": "Synthetic judgment from the fake provider.",
+            "discrepancies": discrepancies
+        }
+
+
+def _classify(score: int) -> str:
+    if score >= 80:
+        return "Consistent"
+    if score >= 40:
+        return "Nuanced"
+    return "Contradictory"
+
+
+def _field(prompt: str, name: str) -> Optional[str]:
+    match = re.search(rf"^\s*{name}:\s*(.+)$", prompt, re.MULTILINE)
+    return match.group(1).strip() if match else None
+
+
+def _source_ids(prompt: str) -> List[str]:
+    return re.findall(r"^\s*Source ID:\s*(\S+)\s*$", prompt, re.MULTILINE)
+
+
+def _claims_after(prompt: str, marker: str) -> List[str]:
+    """Recovers the JSON claim list that follows a section marker in the judge prompt."""
+    section = prompt.split(marker, 1)[-1]
+    match = re.search(r"Claims:\s*(\[.*?\])\s*$", section, re.MULTILINE)
+    if not match:
+        return []
+    try:
+        claims = json.loads(match.group(1))
+    except json.JSONDecodeError:
+        return []
+    return [c for c in claims if isinstance(c, str)]
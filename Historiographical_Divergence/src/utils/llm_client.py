@@ -1,96 +1,233 @@
 """
 Unified LLM Client wrapper.
-Supports OpenAI and Google (Gemini) with fallback model selection.
+Supports OpenAI and Google (Gemini) with fallback model selection,
+an offline 'fake' provider, and record/replay of raw responses.
 """
 import os
 import json
 import time
+import threading
+from pathlib import Path
 from typing import Dict, Any, Optional
 from src.utils.logger import get_logger
-from config.settings import OPENAI_API_KEY, GOOGLE_API_KEY
+from src.utils.schemas import repair_json_text, validate_payload
+from src.utils.tracing import annotate, span
+from config.settings import (
+    OPENAI_API_KEY, GOOGLE_API_KEY,
+    LLM_RECORD_MODE, LLM_CASSETTE_DIR, LLM_RATE_LIMIT_BACKOFF, LLM_MAX_REASKS,
+    FAKE_LLM_LATENCY, FAKE_LLM_LATENCY_MEAN, FAKE_LLM_LATENCY_STD,
+    FAKE_LLM_ERROR_RATE, FAKE_LLM_RATE_LIMIT_RATE, FAKE_LLM_SEED
+)
 logger = get_logger("llm_client")
 
+RECORD_MODES = ("off", "record", "replay")
+
+# Follow-up sent when a response fails schema validation. It carries only the
+# bad output and the validation errors, never the original document text.
+REASK_PROMPT = """Your previous response did not match the required JSON schema.
+
+VALIDATION ERRORS:
+{errors}
+
+PREVIOUS RESPONSE:
+{previous}
+
+Return ONLY the corrected JSON object, following the schema in your instructions exactly.
+"""
+
 class LLMClient:
-    def __init__(self, provider: str = "google"):
+    def __init__(self,
+                 provider: str = "google",
+                 mode: str = LLM_RECORD_MODE,
+                 cassette_dir: Path = LLM_CASSETTE_DIR,
+                 fake_options: Optional[Dict[str, Any]] = None):
+        """
+        Args:
+            provider: 'openai', 'google' or 'fake'
+            mode: 'off', 'record' (save live responses) or 'replay' (serve saved responses only)
+            cassette_dir: Where recorded responses live
+            fake_options: Overrides for FakeLLMBackend (latency, error_rate, ...)
+        """
+        if mode not in RECORD_MODES:
+            raise ValueError(f"Unknown LLM record mode: {mode}")
         self.provider = provider
-        
+        self.mode = mode
+        self.client = None
+        self.cassette = None
+        self.calls = 0  # requests issued (live or replayed), for cost accounting
+        self._calls_lock = threading.Lock()
+
+        if mode != "off":
+            from src.utils.llm_recorder import ResponseCassette
+            self.cassette = ResponseCassette(cassette_dir)
+
+        # Replay never touches the network, so no credentials are needed
+        if mode == "replay":
+            return
+
         if provider == "openai":
             from openai import OpenAI
             api_key = OPENAI_API_KEY
             if not api_key: raise ValueError("OPENAI_API_KEY missing")
             self.client = OpenAI(api_key=api_key)
-            
+
         elif provider == "google":
             import google.generativeai as genai
             api_key = GOOGLE_API_KEY
-            
-            if not api_key: 
+
+            if not api_key:
                 raise ValueError("GOOGLE_API_KEY missing. Please set it in your .env file.")
-                
+
             genai.configure(api_key=api_key)
             self.client = genai
 
-    def extract_json(self, 
-                     system_prompt: str, 
-                     user_prompt: str, 
+        elif provider == "fake":
+            from src.utils.fake_llm import FakeLLMBackend
+            options = {
+                "latency": FAKE_LLM_LATENCY,
+                "latency_mean": FAKE_LLM_LATENCY_MEAN,
+                "latency_std": FAKE_LLM_LATENCY_STD,
+                "error_rate": FAKE_LLM_ERROR_RATE,
+                "rate_limit_rate": FAKE_LLM_RATE_LIMIT_RATE,
+                "seed": FAKE_LLM_SEED
+            }
+            options.update(fake_options or {})
+            self.client = FakeLLMBackend(**options)
+
+        else:
+            raise ValueError(f"Unknown LLM provider: {provider}")
+
+    def extract_json(self,
+                     system_prompt: str,
+                     user_prompt: str,
                      model: str = "gemini-1.5-flash",
                      temperature: float = 0.0) -> Dict[str, Any]:
         """
         Routes the request to the configured provider.
         """
-        if self.provider == "openai":
-            return self._call_openai(system_prompt, user_prompt, model, temperature)
-        elif self.provider == "google":
+        result = self._call(system_prompt, user_prompt, model, temperature)
+        if self.provider == "google" and not result and model == "gemini-1.5-flash":
             # Try primary model, fallback to 'gemini-pro' if flash fails
-            result = self._call_gemini(system_prompt, user_prompt, model, temperature)
-            if not result and model == "gemini-1.5-flash":
-                logger.warning("Gemini Flash failed. Retrying with 'gemini-pro'...")
-                return self._call_gemini(system_prompt, user_prompt, "gemini-pro", temperature)
-            return result
-        return {}
-
-    def _call_openai(self, sys_p, user_p, model, temp):
+            logger.warning("Gemini Flash failed. Retrying with 'gemini-pro'...")
+            return self._call(system_prompt, user_prompt, "gemini-pro", temperature)
+        return result
+
+    def extract_structured(self,
+                           system_prompt: str,
+                           user_prompt: str,
+                           adapter,
+                           model: str = "gemini-1.5-flash",
+                           temperature: float = 0.0,
+                           max_reasks: int = LLM_MAX_REASKS) -> Optional[Any]:
+        """
+        Like extract_json, but validates the response against a compiled
+        pydantic TypeAdapter (see src.utils.schemas).
+
+        Returns the validated payload, or None if the provider failed or the
+        response was still invalid after `max_reasks` targeted re-asks.
+        """
+        raw = self._request(system_prompt, user_prompt, model, temperature)
+        if raw is None and self.provider == "google" and model == "gemini-1.5-flash":
+            logger.warning("Gemini Flash failed. Retrying with 'gemini-pro'...")
+            model = "gemini-pro"
+            raw = self._request(system_prompt, user_prompt, model, temperature)
+
+        for attempt in range(max_reasks + 1):
+            if raw is None:
+                return None
+            payload, errors = validate_payload(adapter, raw)
+            if payload is not None:
+                return payload
+            if attempt == max_reasks:
+                break
+            logger.warning(f"{self.provider} ({model}) response failed validation, re-asking ({attempt + 1}/{max_reasks})")
+            reask = REASK_PROMPT.format(errors=errors, previous=raw.strip()[:4000])
+            raw = self._request(system_prompt, reask, model, temperature)
+
+        logger.error(f"{self.provider} ({model}) response invalid after {max_reasks} re-ask(s):\n{errors}")
+        return None
+
+    def _call(self, sys_p, user_p, model, temp) -> Dict[str, Any]:
+        raw = self._request(sys_p, user_p, model, temp)
+        if raw is None:
+            return {}
         try:
-            response = self.client.chat.completions.create(
-                model=model,
-                messages=[
-                    {"role": "system", "content": sys_p},
-                    {"role": "user", "content": user_p}
-                ],
-                response_format={"type": "json_object"},
-                temperature=temp
-            )
-            return json.loads(response.choices[0].message.content)
-        except Exception as e:
-            logger.error(f"OpenAI Error: {e}")
+            return json.loads(raw)
+        except json.JSONDecodeError:
+            pass
+        try:
+            return json.loads(repair_json_text(raw))
+        except json.JSONDecodeError as e:
+            logger.error(f"{self.provider} ({model}) returned invalid JSON: {e}")
             return {}
 
-    def _call_gemini(self, sys_p, user_p, model, temp):
+    def _request(self, sys_p, user_p, model, temp) -> Optional[str]:
+        """Returns the raw response text, going through the cassette when enabled."""
+        with span("llm.call", provider=self.provider, model=model,
+                  prompt_chars=len(sys_p) + len(user_p)) as s:
+            raw = self._request_raw(sys_p, user_p, model, temp)
+            s.set(ok=raw is not None, response_chars=len(raw) if raw else 0)
+        return raw
+
+    def _request_raw(self, sys_p, user_p, model, temp) -> Optional[str]:
+        with self._calls_lock:
+            self.calls += 1
+        key = None
+        if self.cassette:
+            key = self.cassette.key(self.provider, model, temp, sys_p, user_p)
+            if self.mode == "replay":
+                raw = self.cassette.load(key)
+                annotate(replayed=raw is not None)
+                if raw is None:
+                    logger.error(f"Replay miss for {self.provider} ({model}): {key[:12]}")
+                return raw
+
         try:
-            # Gemini system instruction setup
-            model_instance = self.client.GenerativeModel(
-                model_name=model,
-                system_instruction=sys_p, # Move system prompt here for better adherence
-                generation_config={
-                    "temperature": temp,
-                    "response_mime_type": "application/json"
-                }
-            )
-            
-            response = model_instance.generate_content(user_p)
-            
-            text = response.text.strip()
-            # Clean markdown code blocks if present
-            if text.startswith("```"):
-                lines = text.split('\n')
-                if lines[0].startswith("```"): lines = lines[1:]
-                if lines[-1].startswith("```"): lines = lines[:-1]
-                text = "\n".join(lines)
-            
-            return json.loads(text)
-            
+            if self.provider == "openai":
+                raw = self._call_openai(sys_p, user_p, model, temp)
+            elif self.provider == "google":
+                raw = self._call_gemini(sys_p, user_p, model, temp)
+            else:
+                raw = self.client.complete(sys_p, user_p, model, temp)
         except Exception as e:
-            logger.error(f"Gemini ({model}) Error: {e}")
+            logger.error(f"{self.provider} ({model}) Error: {e}")
             if "429" in str(e):
-                time.sleep(5)
-            return {}
\ No newline at end of file
+                time.sleep(LLM_RATE_LIMIT_BACKOFF)
+            return None
+
+        if self.mode == "record":
+            self.cassette.save(key, raw, self.provider, model)
+        return raw
+
+    def _call_openai(self, sys_p, user_p, model, temp) -> str:
+        response = self.client.chat.completions.create(
+            model=model,
+            messages=[
+                {"role": "system", "content": sys_p},
+                {"role": "user", "content": user_p}
+            ],
+            response_format={"type": "json_object"},
+            temperature=temp
+        )
+        if response.usage is not None:
+            annotate(prompt_tokens=response.usage.prompt_tokens,
+                     completion_tokens=response.usage.completion_tokens)
+        return response.choices[0].message.content
+
+    def _call_gemini(self, sys_p, user_p, model, temp) -> str:
+        # Gemini system instruction setup
+        model_instance = self.client.GenerativeModel(
+            model_name=model,
+            system_instruction=sys_p, # Move system prompt here for better adherence
+            generation_config={
+                "temperature": temp,
+                "response_mime_type": "application/json"
+            }
+        )
+
+        response = model_instance.generate_content(user_p)
+        usage = getattr(response, "usage_metadata", None)
+        if usage is not None:
+            annotate(prompt_tokens=usage.prompt_token_count,
+                     completion_tokens=usage.candidates_token_count)
+        return response.text
@@ -0,0 +1,46 @@
+"""
+Record/replay cassette for LLM responses.
+Captures the raw response text of live calls to disk and replays it
+bit-for-bit, so pipeline runs can be repeated offline and benchmarked.
+"""
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Optional
+from src.utils.logger import get_logger
+
+logger = get_logger("llm_recorder")
+
+
+class ResponseCassette:
+    """
+    One JSON file per request, keyed by a hash of everything that can change
+    the response: provider, model, temperature and both prompts.
+    """
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def key(provider: str, model: str, temperature: float, system_prompt: str, user_prompt: str) -> str:
+        payload = json.dumps([provider, model, temperature, system_prompt, user_prompt], ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def load(self, key: str) -> Optional[str]:
+        """The recorded raw response, or None if this request was never recorded."""
+        path = self.directory / f"{key}.json"
+        if not path.exists():
+            return None
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)["raw"]
+
+    def save(self, key: str, raw: str, provider: str, model: str) -> None:
+        record = {"provider": provider, "model": model, "raw": raw}
+        # Write-then-rename so concurrent workers never see a partial file
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(record, f, ensure_ascii=False)
+        os.replace(tmp, self.directory / f"{key}.json")
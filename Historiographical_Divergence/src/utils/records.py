@@ -0,0 +1,178 @@
+"""
+Compact record types for documents, extractions and judgments.
+Slotted classes instead of per-record dicts: no per-instance key table, and
+the identifiers repeated across records (events, source IDs, authors) are
+interned so every record shares one copy. Records read like the JSON dicts
+they replace (`r['event']`, `r.get('claims', [])`), so existing code accepts
+either; `to_dict()` gives back the on-disk schema and save_json writes them as is.
+"""
+import keyword
+import sys
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Tuple, Type
+from src.utils.data_loader import iter_records
+
+_MISSING = object()
+
+
+def _plain(value: Any) -> Any:
+    if isinstance(value, Record):
+        return value.to_dict()
+    if isinstance(value, list):
+        return [_plain(v) for v in value]
+    return value
+
+
+class Record:
+    """
+    Base class. Subclasses list their JSON keys as `__slots__`, in schema
+    order (a key that is a Python keyword gets a trailing underscore, e.g.
+    'from' -> `from_`). Absent keys leave the slot unset, so a record
+    round-trips without gaining null fields; keys outside the schema are
+    kept in `extra`.
+    """
+
+    __slots__ = ("extra",)
+
+    # Keys whose string values are interned
+    INTERNED: Tuple[str, ...] = ()
+    # Key -> record type for nested objects (or lists of them)
+    NESTED: Dict[str, Type["Record"]] = {}
+
+    KEYS: Tuple[str, ...] = ()
+    _ATTRS: Dict[str, str] = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.KEYS = tuple(a[:-1] if keyword.iskeyword(a[:-1]) else a for a in cls.__slots__)
+        cls._ATTRS = dict(zip(cls.KEYS, cls.__slots__))
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "Record":
+        record = cls.__new__(cls)
+        extra = None
+        for key, value in data.items():
+            attr = cls._ATTRS.get(key)
+            if attr is None:
+                if extra is None:
+                    extra = {}
+                extra[key] = value
+                continue
+            if key in cls.INTERNED and type(value) is str:
+                value = sys.intern(value)
+            elif key in cls.NESTED:
+                value = cls.NESTED[key].convert(value)
+            setattr(record, attr, value)
+        record.extra = extra
+        return record
+
+    @classmethod
+    def convert(cls, value: Any) -> Any:
+        """A dict, or a list of dicts, as records; anything else unchanged."""
+        if isinstance(value, dict):
+            return cls.from_dict(value)
+        if isinstance(value, list):
+            return [cls.from_dict(v) if isinstance(v, dict) else v for v in value]
+        return value
+
+    def to_dict(self) -> Dict:
+        """The JSON schema: same keys and values, known keys in schema order."""
+        data = {}
+        for key, attr in self._ATTRS.items():
+            value = getattr(self, attr, _MISSING)
+            if value is not _MISSING:
+                data[key] = _plain(value)
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+    # ---------------------------------------------------------
+    # Read access in the style of the dicts records replace
+    # ---------------------------------------------------------
+
+    def __getitem__(self, key: str) -> Any:
+        attr = self._ATTRS.get(key)
+        if attr is not None:
+            value = getattr(self, attr, _MISSING)
+            if value is not _MISSING:
+                return value
+        elif self.extra and key in self.extra:
+            return self.extra[key]
+        raise KeyError(key)
+
+    def __setitem__(self, key: str, value: Any):
+        attr = self._ATTRS.get(key)
+        if attr is not None:
+            setattr(self, attr, value)
+        else:
+            if self.extra is None:
+                self.extra = {}
+            self.extra[key] = value
+
+    def get(self, key: str, default: Any = None) -> Any:
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+
+    def keys(self) -> List[str]:
+        return list(self.to_dict())
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, Record):
+            other = other.to_dict()
+        return isinstance(other, dict) and self.to_dict() == other
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+
+class Document(Record):
+    __slots__ = ("id", "title", "reference", "document_type", "date", "place", "from_", "to", "content")
+    INTERNED = ("id", "document_type", "from", "to")
+
+
+class TemporalDetails(Record):
+    __slots__ = ("date", "time")
+    INTERNED = ("date",)
+
+
+class Extraction(Record):
+    __slots__ = ("event", "author", "claims", "temporal_details", "tone", "source_id", "source_type")
+    INTERNED = ("event", "author", "tone", "source_id", "source_type")
+    NESTED = {"temporal_details": TemporalDetails}
+
+
+class Discrepancy(Record):
+    __slots__ = ("claim", "type", "severity")
+    INTERNED = ("type", "severity")
+
+
+class Judgment(Record):
+    __slots__ = ("consistency_score", "classification", "reasoning", "discrepancies",
+                 "event", "primary_source", "secondary_source", "historian", "alignment_summary",
+                 "judge_stage", "judge_model", "prescreen_overlap", "pair_id", "fingerprint")
+    INTERNED = ("classification", "event", "primary_source", "secondary_source", "historian",
+                "judge_stage", "judge_model")
+    NESTED = {"discrepancies": Discrepancy}
+
+
+def to_records(records: Iterable[Dict], record_type: Type[Record]) -> List[Record]:
+    return [record_type.from_dict(r) for r in records]
+
+
+def iter_typed(filepath: Path, record_type: Type[Record]) -> Iterator[Record]:
+    """Records of a JSON array or JSONL file, converted one at a time as they are read."""
+    for data in iter_records(filepath):
+        yield record_type.from_dict(data)
+
+
+def load_records(filepath: Path, record_type: Type[Record]) -> List[Record]:
+    """A JSON array or JSONL file as records, without holding the parsed dicts all at once."""
+    return list(iter_typed(filepath, record_type))
+
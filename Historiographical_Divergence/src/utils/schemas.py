@@ -0,0 +1,140 @@
+"""
+Structured-output schemas for LLM responses.
+Pydantic models for extraction and judgment payloads. Validators are compiled
+once at import time and run directly on the raw response text.
+"""
+import re
+from typing import Any, List, Literal, Optional, Tuple, Union
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter, ValidationError
+
+
+class TemporalDetails(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+    date: Optional[str] = None
+    time: Optional[str] = None
+
+
+class ExtractionPayload(BaseModel):
+    """What EventExtractor asks the model to return for one (document, event)."""
+    model_config = ConfigDict(extra="allow")
+
+    event: Optional[str] = None
+    author: Optional[str] = None
+    claims: List[str] = Field(default_factory=list)
+    temporal_details: Optional[TemporalDetails] = None
+    tone: Optional[str] = None
+
+
+class Discrepancy(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+    claim: str
+    type: Literal["Factual Error", "Omission", "Interpretive Difference"]
+    severity: Literal["High", "Low"]
+
+
+class JudgmentPayload(BaseModel):
+    """What LLMJudge asks the model to return for one (primary, secondary) pair."""
+    model_config = ConfigDict(extra="allow")
+
+    consistency_score: int = Field(ge=0, le=100)
+    classification: Literal["Consistent", "Nuanced", "Contradictory"]
+    reasoning: str
+    discrepancies: List[Discrepancy] = Field(default_factory=list)
+
+
+class ListwiseJudgment(JudgmentPayload):
+    """One entry of a listwise response; the usual judgment plus which secondary it scores."""
+    secondary_source: str
+
+
+class ListwisePayload(BaseModel):
+    """What LLMJudge asks for when scoring one primary against N secondaries in one call."""
+    model_config = ConfigDict(extra="allow")
+
+    judgments: List[ListwiseJudgment]
+
+
+# Compiled once; some models wrap the object in a one-element list.
+EXTRACTION_ADAPTER = TypeAdapter(Union[ExtractionPayload, List[ExtractionPayload]])
+JUDGMENT_ADAPTER = TypeAdapter(JudgmentPayload)
+LISTWISE_ADAPTER = TypeAdapter(ListwisePayload)
+
+_FENCE = re.compile(r"^```[a-zA-Z]*\s*\n?|\n?```\s*$")
+
+
+def repair_json_text(raw: Union[str, bytes]) -> str:
+    """
+    Cheap, deterministic repairs for common formatting slips:
+    markdown code fences, prose before the JSON, and trailing text after it.
+    """
+    if isinstance(raw, bytes):
+        raw = raw.decode("utf-8", errors="replace")
+    text = _FENCE.sub("", raw.strip()).strip()
+
+    starts = [i for i in (text.find("{"), text.find("[")) if i != -1]
+    if not starts:
+        return text
+    start = min(starts)
+    end = _matching_close(text, start)
+    return text[start:end + 1] if end != -1 else text[start:]
+
+
+def _matching_close(text: str, start: int) -> int:
+    """Index of the bracket closing text[start], honouring JSON strings."""
+    depth = 0
+    in_string = False
+    escaped = False
+    for i in range(start, len(text)):
+        ch = text[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch in "{[":
+            depth += 1
+        elif ch in "}]":
+            depth -= 1
+            if depth == 0:
+                return i
+    return -1
+
+
+def validate_payload(adapter: TypeAdapter, raw: Union[str, bytes]) -> Tuple[Any, Optional[str]]:
+    """
+    Validates raw response text against a compiled adapter.
+
+    Tries the raw text first (the fast path for well-formed output), then the
+    repaired text. Returns (parsed, None) on success or (None, error_summary).
+    """
+    try:
+        return adapter.validate_json(raw), None
+    except ValidationError:
+        pass
+    try:
+        return adapter.validate_json(repair_json_text(raw)), None
+    except ValidationError as e:
+        return None, _summarize_errors(e)
+
+
+def _summarize_errors(error: ValidationError, limit: int = 8) -> str:
+    lines = []
+    for err in error.errors()[:limit]:
+        loc = ".".join(str(p) for p in err["loc"]) or "<root>"
+        lines.append(f"- {loc}: {err['msg']}")
+    return "\n".join(lines)
+
+
+def to_dict(payload: Union[BaseModel, List[BaseModel], None]) -> Any:
+    """Back to the plain-dict JSON schema used on disk, without invented defaults."""
+    if payload is None:
+        return None
+    if isinstance(payload, list):
+        return [p.model_dump(exclude_unset=True) for p in payload]
+    return payload.model_dump(exclude_unset=True)
@@ -0,0 +1,308 @@
+"""
+SQLite store for documents, extractions and judgments.
+Indexed on source_id, event, historian and content hash, with transactional
+upserts and WAL journaling so readers are never blocked by a writer.
+Imports from and exports to the pipeline's JSON files.
+"""
+import hashlib
+import json
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+from src.utils.catalog import load_catalog
+from src.utils.data_loader import dumps, iter_records, loads, save_json
+from src.utils.logger import get_logger
+from config.settings import STORE_PATH
+
+logger = get_logger("store")
+
+SCHEMA_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    id            TEXT PRIMARY KEY,
+    title         TEXT,
+    document_type TEXT,
+    author        TEXT,
+    date          TEXT,
+    content_hash  TEXT NOT NULL,
+    record_hash   TEXT NOT NULL,
+    data          TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_documents_content_hash ON documents(content_hash);
+CREATE INDEX IF NOT EXISTS idx_documents_type ON documents(document_type);
+
+CREATE TABLE IF NOT EXISTS extractions (
+    source_id     TEXT NOT NULL,
+    event         TEXT NOT NULL,
+    author        TEXT,
+    source_type   TEXT,
+    tone          TEXT,
+    content_hash  TEXT NOT NULL,
+    record_hash   TEXT NOT NULL,
+    data          TEXT NOT NULL,
+    PRIMARY KEY (source_id, event)
+);
+CREATE INDEX IF NOT EXISTS idx_extractions_event ON extractions(event);
+CREATE INDEX IF NOT EXISTS idx_extractions_author ON extractions(author);
+CREATE INDEX IF NOT EXISTS idx_extractions_content_hash ON extractions(content_hash);
+
+CREATE TABLE IF NOT EXISTS judgments (
+    pair_id           TEXT PRIMARY KEY,
+    event             TEXT NOT NULL,
+    primary_source    TEXT,
+    secondary_source  TEXT,
+    historian         TEXT,
+    consistency_score REAL,
+    classification    TEXT,
+    fingerprint       TEXT,
+    record_hash       TEXT NOT NULL,
+    data              TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_judgments_event ON judgments(event);
+CREATE INDEX IF NOT EXISTS idx_judgments_historian ON judgments(historian);
+CREATE INDEX IF NOT EXISTS idx_judgments_secondary ON judgments(secondary_source);
+CREATE INDEX IF NOT EXISTS idx_judgments_fingerprint ON judgments(fingerprint);
+"""
+
+
+def content_hash(value) -> str:
+    """SHA-256 of a string, or of the canonical JSON of any other value."""
+    if not isinstance(value, str):
+        # ASCII-escaped output takes the encoder's fast path; the hash only needs to be stable
+        value = json.dumps(value, sort_keys=True)
+    return hashlib.sha256(value.encode("utf-8")).hexdigest()
+
+
+def _pair_id(j: Dict) -> str:
+    # Same format as llm_judge.make_pair_id, for judgments stored before pair ids existed
+    return j.get('pair_id') or f"{j['event']}|{j['primary_source']}|{j['secondary_source']}"
+
+
+def _canonical(table: str, records: Iterable[Dict]) -> Iterable[Dict]:
+    # Rows are keyed and indexed by event, so aliased keys are stored canonical
+    if "event" not in TABLES[table][1]:
+        return records
+    return map(load_catalog().canonical, records)
+
+
+# Table -> (key columns, column -> value getter). `data` (the full record as
+# JSON) and `record_hash` are added to every row; a row whose record_hash is
+# unchanged is left alone by an upsert.
+TABLES: Dict[str, tuple] = {
+    "documents": (("id",), {
+        "id": lambda r: r['id'],
+        "title": lambda r: r.get('title'),
+        "document_type": lambda r: r.get('document_type'),
+        "author": lambda r: r.get('from') or r.get('author'),
+        "date": lambda r: r.get('date'),
+        "content_hash": lambda r: content_hash(r.get('content', ''))
+    }),
+    "extractions": (("source_id", "event"), {
+        "source_id": lambda r: r['source_id'],
+        "event": lambda r: r['event'],
+        "author": lambda r: r.get('author'),
+        "source_type": lambda r: r.get('source_type'),
+        "tone": lambda r: r.get('tone'),
+        "content_hash": lambda r: content_hash(r.get('claims', []))
+    }),
+    "judgments": (("pair_id",), {
+        "pair_id": _pair_id,
+        "event": lambda r: r['event'],
+        "primary_source": lambda r: r.get('primary_source'),
+        "secondary_source": lambda r: r.get('secondary_source'),
+        "historian": lambda r: r.get('historian'),
+        "consistency_score": lambda r: r.get('consistency_score'),
+        "classification": lambda r: r.get('classification'),
+        "fingerprint": lambda r: r.get('fingerprint')
+    })
+}
+
+
+class SQLiteStore:
+    """
+    One connection per thread (sqlite3 connections must not be shared), all
+    on the same WAL-mode database, so any number of readers run alongside
+    one writer. Records round-trip unchanged through the `data` column.
+    """
+
+    def __init__(self, path: Path = STORE_PATH, timeout: float = 30.0):
+        """
+        Args:
+            path: Database file (created on first use)
+            timeout: Seconds a writer waits for another writer's lock
+        """
+        self.path = Path(path)
+        self.timeout = timeout
+        self._local = threading.local()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # executescript commits on its own; every statement is idempotent
+        self.conn.executescript(SCHEMA)
+        self.conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            conn.execute("PRAGMA journal_mode = WAL")
+            # WAL is crash-safe at NORMAL; FULL would fsync on every commit
+            conn.execute("PRAGMA synchronous = NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def close(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """BEGIN IMMEDIATE ... COMMIT, rolled back if the block raises."""
+        conn = self.conn
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    # ---------------------------------------------------------
+    # Writes
+    # ---------------------------------------------------------
+
+    def upsert(self, table: str, records: Iterable[Dict]) -> int:
+        """
+        Inserts or updates `records` in one transaction.
+
+        Returns:
+            Rows inserted or changed (rows whose record is identical are skipped)
+        """
+        keys, getters = TABLES[table]
+        columns = list(getters) + ["record_hash", "data"]
+        updates = ", ".join(f"{c} = excluded.{c}" for c in columns if c not in keys)
+        sql = (f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))}) "
+               f"ON CONFLICT({', '.join(keys)}) DO UPDATE SET {updates} "
+               f"WHERE {table}.record_hash != excluded.record_hash")
+
+        def rows():
+            for record in _canonical(table, records):
+                data = dumps(record)
+                yield [get(record) for get in getters.values()] + [content_hash(data), data]
+
+        with self.transaction() as conn:
+            before = conn.total_changes
+            conn.executemany(sql, rows())
+            return conn.total_changes - before
+
+    def upsert_documents(self, documents: Iterable[Dict]) -> int:
+        return self.upsert("documents", documents)
+
+    def upsert_extractions(self, extractions: Iterable[Dict]) -> int:
+        return self.upsert("extractions", extractions)
+
+    def upsert_judgments(self, judgments: Iterable[Dict]) -> int:
+        return self.upsert("judgments", judgments)
+
+    @staticmethod
+    def record_key(table: str, record: Dict) -> tuple:
+        keys, getters = TABLES[table]
+        return tuple(getters[k](record) for k in keys)
+
+    def delete_missing(self, table: str, records: Iterable[Dict]) -> int:
+        """Deletes rows whose key is not among `records`, so the table mirrors them."""
+        return self._delete_except(table, {self.record_key(table, r) for r in records})
+
+    def _delete_except(self, table: str, wanted: set) -> int:
+        keys, _ = TABLES[table]
+        with self.transaction() as conn:
+            stale = [row for row in conn.execute(f"SELECT {', '.join(keys)} FROM {table}") if tuple(row) not in wanted]
+            conn.executemany(f"DELETE FROM {table} WHERE {' AND '.join(f'{k} = ?' for k in keys)}", stale)
+        return len(stale)
+
+    # ---------------------------------------------------------
+    # Reads (every filter is served by an index)
+    # ---------------------------------------------------------
+
+    def _select(self, table: str, filters: Dict[str, Optional[str]]) -> List[Dict]:
+        return list(self._iter_select(table, filters))
+
+    def _iter_select(self, table: str, filters: Dict[str, Optional[str]]) -> Iterator[Dict]:
+        where = {column: value for column, value in filters.items() if value is not None}
+        sql = f"SELECT data FROM {table}"
+        if where:
+            sql += " WHERE " + " AND ".join(f"{column} = ?" for column in where)
+        sql += " ORDER BY rowid"
+        for row in self.conn.execute(sql, list(where.values())):
+            yield loads(row[0])
+
+    def get_document(self, doc_id: str) -> Optional[Dict]:
+        found = self._select("documents", {"id": doc_id})
+        return found[0] if found else None
+
+    def documents(self, document_type: Optional[str] = None, content_hash: Optional[str] = None) -> List[Dict]:
+        return self._select("documents", {"document_type": document_type, "content_hash": content_hash})
+
+    def extractions(self,
+                    event: Optional[str] = None,
+                    source_id: Optional[str] = None,
+                    author: Optional[str] = None) -> List[Dict]:
+        return self._select("extractions", {"event": event, "source_id": source_id, "author": author})
+
+    def judgments(self,
+                  event: Optional[str] = None,
+                  historian: Optional[str] = None,
+                  secondary_source: Optional[str] = None) -> List[Dict]:
+        return self._select("judgments", {"event": event, "historian": historian,
+                                          "secondary_source": secondary_source})
+
+    def get_judgment(self, pair_id: str) -> Optional[Dict]:
+        found = self._select("judgments", {"pair_id": pair_id})
+        return found[0] if found else None
+
+    def counts(self) -> Dict[str, int]:
+        return {table: self.conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0] for table in TABLES}
+
+    # ---------------------------------------------------------
+    # JSON import / export
+    # ---------------------------------------------------------
+
+    def import_json(self, table: str, path: Path, mirror: bool = False) -> Dict[str, int]:
+        """
+        Upserts the records of a JSON list file into `table`.
+
+        Args:
+            mirror: Also delete rows that are no longer in the file
+        """
+        # Streamed: only the keys are kept, for mirroring
+        seen = []
+
+        def records():
+            for record in _canonical(table, iter_records(path)):
+                seen.append(self.record_key(table, record))
+                yield record
+
+        changed = self.upsert(table, records())
+        deleted = self._delete_except(table, set(seen)) if mirror else 0
+        logger.info(f"Imported {path.name} into {table}: {len(seen)} records, "
+                    f"{changed} inserted or changed, {deleted} deleted")
+        return {"records": len(seen), "changed": changed, "deleted": deleted}
+
+    def export_json(self, table: str, path: Path, where: Optional[Callable[[Dict], bool]] = None) -> int:
+        """Writes `table` (in insertion order) as a JSON list file; returns the record count."""
+        count = 0
+
+        def records():
+            nonlocal count
+            for record in self._iter_select(table, {}):
+                if where is None or where(record):
+                    count += 1
+                    yield record
+
+        save_json(records(), path)
+        logger.info(f"Exported {count} {table} to {path}")
+        return count
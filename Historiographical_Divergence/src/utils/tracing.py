@@ -0,0 +1,200 @@
+"""
+Lightweight span tracing.
+`with span("llm.call", model=m) as s:` records the wall time, thread and
+attributes of a block; `s.set(...)` or `annotate(...)` add attributes on the
+way. Tracing is off unless TRACE_DIR is set, and a disabled span() returns a
+shared no-op object. Each process exports its spans at exit as a Chrome trace
+(chrome://tracing, ui.perfetto.dev) plus a flat CSV summary per span name.
+"""
+import atexit
+import csv
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+import numpy as np
+from src.utils.data_loader import save_json
+from src.utils.logger import get_logger
+from config.settings import TRACE_DIR
+
+logger = get_logger("tracing")
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def set(self, **attrs):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NOOP = _NoopSpan()
+
+
+class Span:
+    __slots__ = ("tracer", "name", "attrs", "start")
+
+    def __init__(self, tracer: "Tracer", name: str, attrs: Dict[str, Any]):
+        self.tracer = tracer
+        self.name = name
+        self.attrs = attrs
+        self.start = 0
+
+    def set(self, **attrs):
+        self.attrs.update(attrs)
+
+    def __enter__(self):
+        self.tracer._stack().append(self)
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        end = time.perf_counter_ns()
+        self.tracer._stack().pop()
+        if exc_type is not None:
+            self.attrs["error"] = exc_type.__name__
+        self.tracer.record(self.name, self.start, end, self.attrs)
+        return False
+
+
+class Tracer:
+    """
+    Collects finished spans as tuples (name, start_ns, end_ns, pid, tid, attrs).
+    Worker processes hand theirs back with drain(); the parent merge()s them.
+    """
+
+    def __init__(self):
+        self.events: List[tuple] = []
+        self.thread_names: Dict[tuple, str] = {}  # (pid, tid) -> thread name
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        # perf_counter is monotonic system-wide on Linux, so one offset places
+        # spans from every process on the same wall-clock axis
+        self._epoch = time.time_ns() - time.perf_counter_ns()
+
+    def _stack(self) -> List[Span]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def current(self) -> Optional[Span]:
+        stack = self._stack()
+        return stack[-1] if stack else None
+
+    def record(self, name: str, start_ns: int, end_ns: int, attrs: Dict[str, Any]):
+        thread, pid = threading.current_thread(), os.getpid()
+        with self._lock:
+            self.events.append((name, start_ns + self._epoch, end_ns + self._epoch, pid, thread.ident, attrs))
+            self.thread_names.setdefault((pid, thread.ident), thread.name)
+
+    def drain(self) -> Dict:
+        with self._lock:
+            drained = {"events": self.events, "thread_names": self.thread_names}
+            self.events, self.thread_names = [], {}
+        return drained
+
+    def merge(self, drained: Dict):
+        with self._lock:
+            self.events.extend(drained["events"])
+            self.thread_names.update(drained["thread_names"])
+
+    # ---------------------------------------------------------
+    # Export
+    # ---------------------------------------------------------
+
+    def chrome_trace(self) -> Dict:
+        """Complete ('X') events in microseconds, plus thread-name metadata."""
+        events = [
+            {"name": name, "cat": name.split(".")[0], "ph": "X", "ts": start / 1000,
+             "dur": (end - start) / 1000, "pid": pid, "tid": tid, "args": attrs}
+            for name, start, end, pid, tid, attrs in self.events
+        ]
+        events.extend({"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": name}}
+                      for (pid, tid), name in self.thread_names.items())
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def summary(self) -> List[Dict]:
+        """Per span name: count and total / mean / p50 / p95 / max milliseconds, slowest total first."""
+        durations: Dict[str, List[float]] = {}
+        for name, start, end, *_ in self.events:
+            durations.setdefault(name, []).append((end - start) / 1e6)
+        rows = []
+        for name, values in durations.items():
+            ms = np.asarray(values)
+            rows.append({"span": name, "count": len(ms), "total_ms": round(float(ms.sum()), 3),
+                         "mean_ms": round(float(ms.mean()), 3),
+                         "p50_ms": round(float(np.percentile(ms, 50)), 3),
+                         "p95_ms": round(float(np.percentile(ms, 95)), 3),
+                         "max_ms": round(float(ms.max()), 3)})
+        return sorted(rows, key=lambda r: r["total_ms"], reverse=True)
+
+    def export(self, trace_dir: Path, name: str) -> Optional[Path]:
+        """Writes <name>-<pid>.trace.json and .csv to `trace_dir`. Returns the trace path."""
+        if not self.events:
+            return None
+        stem = Path(trace_dir) / f"{name}-{os.getpid()}"
+        trace_path = stem.with_suffix(".trace.json")
+        save_json(self.chrome_trace(), trace_path, indent=None)
+        rows = self.summary()
+        with open(stem.with_suffix(".csv"), 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+            writer.writeheader()
+            writer.writerows(rows)
+        logger.info(f"Trace: {len(self.events)} spans -> {trace_path}")
+        return trace_path
+
+
+_tracer: Optional[Tracer] = None
+
+
+def span(name: str, **attrs):
+    """A timed block. Returns a no-op when tracing is disabled."""
+    if _tracer is None:
+        return _NOOP
+    return Span(_tracer, name, attrs)
+
+
+def annotate(**attrs):
+    """Adds attributes to the innermost open span of this thread, if any."""
+    if _tracer is None:
+        return
+    current = _tracer.current()
+    if current is not None:
+        current.attrs.update(attrs)
+
+
+def enabled() -> bool:
+    return _tracer is not None
+
+
+def get_tracer() -> Optional[Tracer]:
+    return _tracer
+
+
+def enable(trace_dir: Optional[Path] = None) -> Tracer:
+    """Starts collecting spans. With `trace_dir`, they are exported there when the process exits."""
+    global _tracer
+    if _tracer is None:
+        _tracer = Tracer()
+        if trace_dir is not None:
+            name = Path(sys.argv[0]).stem or "python"
+            atexit.register(_tracer.export, Path(trace_dir), name)
+    return _tracer
+
+
+def reset():
+    """Drops spans inherited from a parent process (a ProcessPoolExecutor initializer)."""
+    if _tracer is not None:
+        _tracer.drain()
+
+
+if TRACE_DIR is not None:
+    enable(TRACE_DIR)
@@ -0,0 +1,296 @@
+"""
+Stratified Budgeted Evaluation.
+Judges a sample of the (event, historian) pair space instead of every pair,
+stratified by historian (the secondary source): a pilot per stratum, then Neyman re-allocation of the
+remaining budget using running variance estimates, and stratified estimates
+(per event, as domains cutting across strata) with confidence intervals.
+"""
+import heapq
+import math
+import random
+from collections import OrderedDict
+from statistics import NormalDist
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from src.validation.streaming import RunningStats
+from src.utils.logger import get_logger
+from config.settings import (
+    JUDGE_MAX_WORKERS, SAMPLER_PILOT_PER_STRATUM, SAMPLER_ROUNDS, SAMPLER_CONFIDENCE
+)
+
+logger = get_logger("sampling")
+
+# Pseudo-observations of the pooled variance added to each stratum's estimate,
+# so a stratum whose first samples happen to agree is not starved of budget
+PRIOR_WEIGHT = 2
+
+# Floor on variance estimates (scores are integers): a partly judged stratum
+# whose scores happen to agree still leaves doubt about the unjudged pairs
+MIN_VARIANCE = 1.0
+
+# Author values the extractor writes when it could not name one
+UNKNOWN_AUTHORS = frozenset({"", "none", "null", "unknown", "author name"})
+
+Stratum = str  # secondary source id (one historian's book)
+
+
+def stratum_of(pair: Dict) -> Stratum:
+    """
+    The pair's secondary source. Each book meets each event's primary once,
+    so (event, historian) cells hold a single pair and cannot carry a
+    variance; a book's stratum holds one pair per event it covers. The source
+    id is used rather than the author, which extraction leaves out or varies.
+    """
+    return str(pair['secondary']['source_id'])
+
+
+def historian_of(members: List[Dict]) -> str:
+    """Report label of a stratum: its most common named author, else the source id."""
+    authors = [str(pair['secondary'].get('author') or "").strip() for pair in members]
+    named = [a for a in authors if a.lower() not in UNKNOWN_AUTHORS]
+    return max(set(named), key=named.count) if named else stratum_of(members[0])
+
+
+def stratify(pairs: List[Dict]) -> "OrderedDict[Stratum, List[Dict]]":
+    """Groups pairs by secondary source, keeping first-seen order."""
+    strata: "OrderedDict[Stratum, List[Dict]]" = OrderedDict()
+    for pair in pairs:
+        strata.setdefault(stratum_of(pair), []).append(pair)
+    return strata
+
+
+def neyman_allocation(sizes: Sequence[int],
+                      stds: Sequence[float],
+                      extra: int,
+                      taken: Optional[Sequence[int]] = None) -> List[int]:
+    """
+    Integer Neyman allocation of `extra` further samples on top of `taken`.
+
+    Greedily gives each sample to the stratum whose variance term
+    N_h^2 S_h^2 / n_h drops most, which is the optimal integer allocation for
+    the stratified-mean variance; strata never exceed their size N_h.
+
+    Returns:
+        Additional samples per stratum.
+    """
+    taken = list(taken or [0] * len(sizes))
+    add = [0] * len(sizes)
+
+    def gain(h: int) -> float:
+        n = taken[h] + add[h]
+        weight = (sizes[h] * stds[h]) ** 2
+        return math.inf if n == 0 else weight / (n * (n + 1))
+
+    heap = [(-gain(h), h) for h in range(len(sizes)) if taken[h] < sizes[h]]
+    heapq.heapify(heap)
+    for _ in range(extra):
+        if not heap:
+            break
+        _, h = heapq.heappop(heap)
+        add[h] += 1
+        if taken[h] + add[h] < sizes[h]:
+            heapq.heappush(heap, (-gain(h), h))
+    return add
+
+
+def stratified_estimate(strata: Iterable[Tuple[int, int, List[float], int]],
+                        pooled_variance: float,
+                        confidence: float = SAMPLER_CONFIDENCE) -> Dict:
+    """
+    Mean score of a domain (all pairs, one historian, one event) with a
+    finite-population-corrected normal interval.
+
+    Args:
+        strata: Per stratum: (population size, pairs of the domain in it,
+            judged scores of those pairs, pairs judged in the stratum)
+        pooled_variance: Variance used where a stratum cannot estimate its own
+        confidence: Interval coverage
+
+    The domain mean is the ratio of the weighted (N_h / n_h) judged scores,
+    with a linearised variance. Domain pairs in strata with no judged pair
+    are assumed to score like the rest but add pooled_variance times their
+    squared share to the variance; that share is `unobserved_share`.
+    """
+    strata = list(strata)
+    population = sum(domain for _, domain, _, _ in strata)
+    observed = [(size, domain, scores, judged) for size, domain, scores, judged in strata if judged]
+    unobserved = population - sum(domain for _, domain, _, _ in observed)
+    judged_in_domain = sum(len(scores) for _, _, scores, _ in observed)
+    size_hat = sum(size / judged * len(scores) for size, _, scores, judged in observed)
+    if not size_hat:
+        return {"estimate": None, "ci_low": None, "ci_high": None, "std_error": None,
+                "population": population, "judged": 0, "unobserved_share": 1.0 if population else 0.0}
+
+    mean = sum(size / judged * sum(scores) for size, _, scores, judged in observed) / size_hat
+    variance = 0.0
+    for size, domain, scores, judged in observed:
+        if not domain or judged == size:
+            continue
+        if judged > 1:
+            # Residuals of the domain's pairs; the stratum's other judged pairs contribute zeros
+            z = [y - mean for y in scores] + [0.0] * (judged - len(scores))
+            z_mean = sum(z) / judged
+            s2 = sum((v - z_mean) ** 2 for v in z) / (judged - 1)
+        else:
+            s2 = pooled_variance
+        variance += size * size * (1 - judged / size) * max(s2, MIN_VARIANCE) / judged
+    variance /= size_hat * size_hat
+
+    unobserved_share = unobserved / population
+    variance += unobserved_share ** 2 * max(pooled_variance, MIN_VARIANCE)
+
+    se = math.sqrt(variance)
+    z_crit = NormalDist().inv_cdf(0.5 + confidence / 2)
+    return {
+        "estimate": mean,
+        "ci_low": max(0.0, mean - z_crit * se),
+        "ci_high": min(100.0, mean + z_crit * se),
+        "std_error": se,
+        "population": population,
+        "judged": judged_in_domain,
+        "unobserved_share": unobserved_share
+    }
+
+
+class StratifiedSampler:
+    """Judges a budgeted, Neyman-allocated sample of pairs and estimates population scores."""
+
+    def __init__(self,
+                 judge,
+                 budget: int,
+                 pilot: int = SAMPLER_PILOT_PER_STRATUM,
+                 rounds: int = SAMPLER_ROUNDS,
+                 confidence: float = SAMPLER_CONFIDENCE,
+                 seed: Optional[int] = None,
+                 max_workers: int = JUDGE_MAX_WORKERS):
+        """
+        Args:
+            judge: An LLMJudge
+            budget: Maximum number of pairs to judge
+            pilot: Pairs per stratum judged first, to get variance estimates
+            rounds: Neyman re-allocations of the remaining budget
+            confidence: Interval coverage of the reported estimates
+            seed: Seed for the within-stratum random order
+            max_workers: Concurrent judge calls per round
+        """
+        self.judge = judge
+        self.budget = budget
+        self.pilot = max(1, pilot)
+        self.rounds = max(1, rounds)
+        self.confidence = confidence
+        self.rng = random.Random(seed)
+        self.max_workers = max_workers
+
+    def run(self, pairs: List[Dict]) -> Dict:
+        strata = stratify(pairs)
+        keys = list(strata)
+        queues = {key: self.rng.sample(members, len(members)) for key, members in strata.items()}
+        sizes = [len(strata[key]) for key in keys]
+        stats = {key: RunningStats() for key in keys}
+        scored: Dict[Stratum, List[Tuple[str, float]]] = {key: [] for key in keys}  # (event, score) per judged pair
+        drawn = [0] * len(keys)
+        judgments: List[Dict] = []
+        calls_before = self.judge.llm.calls
+        budget = min(self.budget, len(pairs))
+
+        # Pilot: up to `pilot` pairs per stratum, one pass at a time so every
+        # stratum is reached before any gets a second pair; largest strata
+        # first if the budget runs short. Beyond one pair per stratum it takes
+        # at most half the budget, so the Neyman rounds have some to allocate.
+        allocation = [0] * len(keys)
+        remaining = min(budget, max(len(keys), budget // 2))
+        order = sorted(range(len(keys)), key=lambda h: -sizes[h])
+        for _ in range(self.pilot):
+            for h in order:
+                if remaining and allocation[h] < sizes[h]:
+                    allocation[h] += 1
+                    remaining -= 1
+        self._judge_round(keys, queues, allocation, drawn, stats, scored, judgments, "pilot")
+
+        for r in range(self.rounds):
+            remaining = budget - sum(drawn)
+            if remaining <= 0:
+                break
+            step = math.ceil(remaining / (self.rounds - r))
+            pooled = self._pooled_variance(stats)
+            stds = [math.sqrt(self._shrunk_variance(stats[key], pooled)) for key in keys]
+            allocation = neyman_allocation(sizes, stds, step, drawn)
+            self._judge_round(keys, queues, allocation, drawn, stats, scored, judgments, f"round {r + 1}")
+
+        return self._report(strata, drawn, stats, scored, judgments, budget, self.judge.llm.calls - calls_before)
+
+    def _judge_round(self, keys, queues, allocation, drawn, stats, scored, judgments, label):
+        batch, owner = [], {}
+        for h, count in enumerate(allocation):
+            for pair in queues[keys[h]][drawn[h]:drawn[h] + count]:
+                batch.append(pair)
+                owner[pair['pair_id']] = keys[h]
+            drawn[h] += count
+        if not batch:
+            return
+
+        results = self.judge.judge_pairs(batch, max_workers=self.max_workers)
+        for judgment in results:
+            score = float(judgment['consistency_score'])
+            stats[owner[judgment['pair_id']]].push(score)
+            scored[owner[judgment['pair_id']]].append((judgment['event'], score))
+        judgments.extend(results)
+        logger.info(f"Sampler {label}: judged {len(results)}/{len(batch)} pairs "
+                    f"({sum(drawn)} drawn so far)")
+
+    @staticmethod
+    def _pooled_variance(stats: Dict[Stratum, RunningStats]) -> float:
+        dof = sum(s.count - 1 for s in stats.values() if s.count > 1)
+        if dof:
+            return max(MIN_VARIANCE, sum(s.m2 for s in stats.values() if s.count > 1) / dof)
+        # Not enough repeats within strata yet: fall back to the spread across all scores
+        overall = RunningStats()
+        for s in stats.values():
+            overall.merge(s)
+        return max(MIN_VARIANCE, overall.variance(ddof=1)) if overall.count > 1 else MIN_VARIANCE
+
+    @staticmethod
+    def _shrunk_variance(stats: RunningStats, pooled: float) -> float:
+        dof = max(0, stats.count - 1)
+        return (stats.m2 + PRIOR_WEIGHT * pooled) / (dof + PRIOR_WEIGHT)
+
+    def _report(self, strata, drawn, stats, scored, judgments, budget, calls) -> Dict:
+        pooled = self._pooled_variance(stats)
+        keys = list(strata)
+        sizes = [len(strata[key]) for key in keys]
+        judged = [stats[key].count for key in keys]
+
+        def estimate(domain_sizes: List[int], domain_scores: List[List[float]]) -> Dict:
+            return stratified_estimate(zip(sizes, domain_sizes, domain_scores, judged), pooled, self.confidence)
+
+        overall = estimate(sizes, [[y for _, y in scored[key]] for key in keys])
+        labels = [historian_of(strata[key]) for key in keys]
+        by_historian = {
+            label: estimate([sizes[h] if labels[h] == label else 0 for h in range(len(keys))],
+                            [[y for _, y in scored[key]] if labels[h] == label else [] for h, key in enumerate(keys)])
+            for label in OrderedDict.fromkeys(labels)
+        }
+        events = list(OrderedDict.fromkeys(pair['primary']['event'] for key in keys for pair in strata[key]))
+        by_event = {
+            event: estimate([sum(1 for pair in strata[key] if pair['primary']['event'] == event) for key in keys],
+                            [[y for e, y in scored[key] if e == event] for key in keys])
+            for event in events
+        }
+        return {
+            "population_pairs": sum(sizes),
+            "strata": len(keys),
+            "budget": budget,
+            "pairs_drawn": sum(drawn),
+            "pairs_judged": len(judgments),
+            "llm_calls": calls,
+            "confidence": self.confidence,
+            "overall": overall,
+            "by_historian": by_historian,
+            "by_event": by_event,
+            "per_stratum": [
+                {"source": key, "historian": labels[h], "population": sizes[h], "judged": stats[key].count,
+                 "mean": stats[key].mean if stats[key].count else None,
+                 "std_dev": stats[key].std(ddof=1) if stats[key].count > 1 else None}
+                for h, key in enumerate(keys)
+            ],
+            "judgments": judgments
+        }
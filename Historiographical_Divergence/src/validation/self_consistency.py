@@ -0,0 +1,112 @@
+"""
+Adaptive Self-Consistency Sampling.
+Re-judges many pairs in parallel, drawing samples for each pair only until a
+sequential stopping rule is met: the confidence interval on the pair's mean
+score is narrower than a target. Stable pairs stop after the minimum number
+of samples; noisy ones get more.
+"""
+import math
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+from scipy import stats as sps
+from src.utils.logger import get_logger
+from config.settings import (
+    JUDGE_MAX_WORKERS, SELF_CONSISTENCY_MIN_SAMPLES, SELF_CONSISTENCY_MAX_SAMPLES,
+    SELF_CONSISTENCY_CI_HALF_WIDTH, SELF_CONSISTENCY_CONFIDENCE
+)
+
+logger = get_logger("self_consistency")
+
+
+def ci_half_width(scores: List[float], confidence: float = SELF_CONSISTENCY_CONFIDENCE) -> float:
+    """Student-t half-width of the confidence interval on the mean of `scores`."""
+    n = len(scores)
+    if n < 2:
+        return math.inf
+    mean = sum(scores) / n
+    std = math.sqrt(sum((s - mean) ** 2 for s in scores) / (n - 1))
+    return float(sps.t.ppf(0.5 + confidence / 2, n - 1) * std / math.sqrt(n))
+
+
+class AdaptiveSelfConsistency:
+    """Sequential per-pair sampling of judge scores, parallel across pairs."""
+
+    def __init__(self,
+                 judge,
+                 min_samples: int = SELF_CONSISTENCY_MIN_SAMPLES,
+                 max_samples: int = SELF_CONSISTENCY_MAX_SAMPLES,
+                 target_half_width: float = SELF_CONSISTENCY_CI_HALF_WIDTH,
+                 confidence: float = SELF_CONSISTENCY_CONFIDENCE,
+                 max_workers: int = JUDGE_MAX_WORKERS):
+        """
+        Args:
+            judge: An LLMJudge (anything with judge_pair(primary, secondary))
+            min_samples: Samples drawn before the stopping rule is checked (>= 2)
+            max_samples: Hard cap per pair
+            target_half_width: Stop once the CI half-width on the mean score (points) is at most this
+            confidence: Confidence level of that interval
+            max_workers: Pairs sampled concurrently
+        """
+        self.judge = judge
+        self.min_samples = max(2, min_samples)
+        self.max_samples = max(self.min_samples, max_samples)
+        self.target_half_width = target_half_width
+        self.confidence = confidence
+        self.max_workers = max_workers
+
+    def sample_pair(self, pair: Dict) -> Dict:
+        scores, failures = [], 0
+        # Failed calls count against the cap so a broken pair cannot loop forever
+        while len(scores) + failures < self.max_samples:
+            judgment = self.judge.judge_pair(pair['primary'], pair['secondary'])
+            if judgment:
+                scores.append(judgment['consistency_score'])
+            else:
+                failures += 1
+            if len(scores) >= self.min_samples and \
+                    ci_half_width(scores, self.confidence) <= self.target_half_width:
+                break
+
+        n = len(scores)
+        mean = sum(scores) / n if n else 0.0
+        variance = sum((s - mean) ** 2 for s in scores) / (n - 1) if n > 1 else 0.0
+        half_width = ci_half_width(scores, self.confidence)
+        return {
+            "pair_id": pair['pair_id'],
+            "scores": scores,
+            "n": n,
+            "calls": n + failures,
+            "mean": mean,
+            "variance": variance,
+            "std_dev": math.sqrt(variance),
+            "ci_half_width": half_width if math.isfinite(half_width) else None,
+            "converged": math.isfinite(half_width) and half_width <= self.target_half_width
+        }
+
+    def run(self, pairs: List[Dict]) -> Dict:
+        """
+        Samples every pair and summarises the judged set.
+        The pooled within-pair standard deviation is the headline noise figure.
+        """
+        with ThreadPoolExecutor(max_workers=max(1, self.max_workers)) as pool:
+            per_pair = list(pool.map(self.sample_pair, pairs))
+
+        for result in per_pair:
+            logger.info(f"  {result['pair_id']}: n={result['n']} mean={result['mean']:.1f} "
+                        f"sd={result['std_dev']:.2f} {'converged' if result['converged'] else 'capped'}")
+
+        dof = sum(r['n'] - 1 for r in per_pair if r['n'] > 1)
+        pooled_var = sum((r['n'] - 1) * r['variance'] for r in per_pair if r['n'] > 1) / dof if dof else 0.0
+        calls = sum(r['calls'] for r in per_pair)
+        sampled = [r for r in per_pair if r['n']]
+        return {
+            "pairs": len(per_pair),
+            "calls": calls,
+            "fixed_n_calls": self.max_samples * len(per_pair),
+            "mean": sum(r['mean'] for r in sampled) / len(sampled) if sampled else 0.0,
+            "std_dev": math.sqrt(pooled_var),
+            "variance": pooled_var,
+            "converged": sum(r['converged'] for r in per_pair),
+            "max_pair_std_dev": max((r['std_dev'] for r in per_pair), default=0.0),
+            "per_pair": per_pair
+        }
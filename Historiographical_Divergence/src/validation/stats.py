@@ -1,22 +1,435 @@
 """
 Statistical Utilities for Validation.
-Calculates Cohen's Kappa, Variance, and Standard Deviation.
+Calculates agreement (Cohen's, weighted and Fleiss' kappa, Krippendorff's
+alpha), Variance, and Standard Deviation, with bootstrap and jackknife
+confidence intervals from vectorised resampling. NumPy only.
 """
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from statistics import NormalDist
+from typing import Callable, Dict, Iterable, Optional, Sequence
 import numpy as np
-from sklearn.metrics import cohen_kappa_score
+from src.utils.tracing import span
+from src.validation.streaming import RunningStats
 
-def calculate_consistency_stats(scores: list) -> dict:
-    """Calculates mean and standard deviation for a list of scores."""
-    if not scores:
+# Resample index matrices are built in batches of at most this many entries
+RESAMPLE_BATCH_ELEMENTS = 4_000_000
+
+def calculate_consistency_stats(scores: Iterable[float]) -> dict:
+    """
+    Calculates mean and standard deviation for scores, in one pass.
+    Accepts any iterable (e.g. a generator over a JSONL log), so memory stays constant.
+    """
+    running = RunningStats()
+    for score in scores:
+        running.push(float(score))
+    if running.count == 0:
         return {"mean": 0, "std_dev": 0}
     return {
-        "mean": np.mean(scores),
-        "std_dev": np.std(scores),
-        "variance": np.var(scores)
+        "mean": running.mean,
+        "std_dev": running.std(),
+        "variance": running.variance()
     }
 
 def calculate_kappa(human_labels: list, llm_labels: list) -> float:
-    """Calculates Cohen's Kappa between human and LLM labels."""
-    # Ensure labels are aligned
-    min_len = min(len(human_labels), len(llm_labels))
-    return cohen_kappa_score(human_labels[:min_len], llm_labels[:min_len])
\ No newline at end of file
+    """Calculates Cohen's Kappa between human and LLM labels (one label each per item)."""
+    confusion, _ = confusion_matrix(human_labels, llm_labels)
+    return kappa_from_matrix(confusion)
+
+# ---------------------------------------------------------
+# Agreement metrics
+# Labels are encoded to integer codes once; confusion and coincidence
+# matrices are then single np.bincount calls over combined codes.
+# ---------------------------------------------------------
+
+KAPPA_WEIGHTS = (None, "linear", "quadratic")
+
+
+def _encode(values: np.ndarray, labels: Optional[Sequence] = None):
+    """Integer codes for `values` and the label order they index (sorted unless given)."""
+    if labels is None:
+        labels, codes = np.unique(values, return_inverse=True)
+        return codes.ravel(), labels
+    lookup = {label: i for i, label in enumerate(labels)}
+    try:
+        codes = np.fromiter((lookup[v] for v in values.tolist()), dtype=np.int64, count=len(values))
+    except KeyError as e:
+        raise ValueError(f"Label {e.args[0]!r} is not in the given labels") from None
+    return codes, np.asarray(labels)
+
+
+def confusion_matrix(rater_a: Sequence, rater_b: Sequence, labels: Optional[Sequence] = None):
+    """
+    Rater A x rater B count matrix.
+
+    Args:
+        rater_a, rater_b: One label per item, same length
+        labels: Row/column order (default: sorted union of observed labels)
+
+    Returns:
+        (matrix, labels)
+    """
+    if len(rater_a) != len(rater_b):
+        raise ValueError(f"Label lists differ in length: {len(rater_a)} vs {len(rater_b)}")
+    if len(rater_a) == 0:
+        raise ValueError("No labelled items")
+    codes, labels = _encode(np.concatenate([np.asarray(rater_a), np.asarray(rater_b)]), labels)
+    n, k = len(rater_a), len(labels)
+    matrix = np.bincount(codes[:n] * k + codes[n:], minlength=k * k).reshape(k, k)
+    return matrix, labels
+
+
+def _disagreement_weights(k: int, weights: Optional[str]) -> np.ndarray:
+    if weights not in KAPPA_WEIGHTS:
+        raise ValueError(f"Unknown kappa weights: {weights}")
+    distance = np.abs(np.subtract.outer(np.arange(k), np.arange(k))).astype(float)
+    if weights is None:
+        return (distance > 0).astype(float)
+    return distance if weights == "linear" else distance ** 2
+
+
+def kappa_from_matrix(confusion: np.ndarray, weights: Optional[str] = None) -> float:
+    """
+    Cohen's kappa from a confusion matrix; `weights` 'linear' or 'quadratic'
+    for ordered categories. Returns 1.0 when no disagreement is possible
+    (a single category used by both raters).
+    """
+    confusion = np.asarray(confusion, dtype=float)
+    w = _disagreement_weights(confusion.shape[0], weights)
+    total = confusion.sum()
+    expected = np.outer(confusion.sum(axis=1), confusion.sum(axis=0)) / total
+    expected_disagreement = (w * expected).sum()
+    if expected_disagreement == 0:
+        return 1.0
+    return float(1 - (w * confusion).sum() / expected_disagreement)
+
+
+def weighted_kappa(rater_a: Sequence[float],
+                   rater_b: Sequence[float],
+                   weights: str = "quadratic",
+                   bins: Optional[Sequence[float]] = None) -> float:
+    """
+    Weighted Cohen's kappa for ordinal scores.
+
+    Args:
+        rater_a, rater_b: Scores per item
+        weights: 'linear' or 'quadratic' disagreement weights
+        bins: Optional bin edges (e.g. [0, 20, 40, 60, 80, 100]); scores are
+              binned first, and every bin is a category even if unused
+    """
+    a = np.asarray(rater_a, dtype=float)
+    b = np.asarray(rater_b, dtype=float)
+    labels = None
+    if bins is not None:
+        edges = np.asarray(bins, dtype=float)
+        # Right-closed last bin, so the top score (e.g. 100) lands in the last bin
+        a = np.clip(np.digitize(a, edges[1:-1]), 0, len(edges) - 2)
+        b = np.clip(np.digitize(b, edges[1:-1]), 0, len(edges) - 2)
+        labels = list(range(len(edges) - 1))
+    confusion, _ = confusion_matrix(a, b, labels)
+    return kappa_from_matrix(confusion, weights)
+
+
+def _rating_table(ratings: Sequence[Sequence]):
+    """
+    (items, categories) count table from per-item rating lists of any length.
+    None/NaN entries are missing ratings. Returns (table, labels).
+    """
+    flat, item_index = [], []
+    for i, item in enumerate(ratings):
+        for r in item:
+            if r is None or (isinstance(r, float) and np.isnan(r)):
+                continue
+            flat.append(r)
+            item_index.append(i)
+    if not flat:
+        raise ValueError("No ratings")
+    codes, labels = _encode(np.asarray(flat))
+    k = len(labels)
+    table = np.bincount(np.asarray(item_index) * k + codes, minlength=len(ratings) * k).reshape(len(ratings), k)
+    return table, labels
+
+
+def fleiss_kappa(ratings: Sequence[Sequence]) -> float:
+    """
+    Fleiss' kappa for many raters (or many judge runs) on nominal labels.
+
+    Args:
+        ratings: One list of labels per item; every item needs the same number of ratings
+    """
+    table, _ = _rating_table(ratings)
+    per_item = table.sum(axis=1)
+    m = per_item[0]
+    if m < 2 or np.any(per_item != m):
+        raise ValueError("Fleiss' kappa needs the same number (>= 2) of ratings for every item; "
+                         "use krippendorff_alpha for missing or uneven ratings")
+    observed = ((table * (table - 1)).sum(axis=1) / (m * (m - 1))).mean()
+    p = table.sum(axis=0) / table.sum()
+    expected = (p * p).sum()
+    if expected == 1:
+        return 1.0
+    return float((observed - expected) / (1 - expected))
+
+
+def krippendorff_alpha(ratings: Sequence[Sequence], level: str = "nominal") -> float:
+    """
+    Krippendorff's alpha for any number of raters/runs, tolerating missing ratings.
+
+    Args:
+        ratings: One list of ratings per item (any length; None/NaN = missing).
+                 Items with fewer than two ratings are not pairable and are ignored.
+        level: 'nominal', 'ordinal' (ordered labels) or 'interval' (numeric scores)
+
+    Returns 1.0 when no disagreement is possible (a single value used throughout).
+    """
+    table, labels = _rating_table(ratings)
+    m = table.sum(axis=1)
+    table = table[m >= 2].astype(float)
+    m = m[m >= 2]
+    if len(table) == 0:
+        raise ValueError("Krippendorff's alpha needs at least one item with two ratings")
+
+    # Coincidence matrix: every ordered pair of ratings within an item, weighted 1/(m_u - 1)
+    scaled = table / (m - 1)[:, None]
+    coincidence = table.T @ scaled - np.diag(scaled.sum(axis=0))
+    n_c = coincidence.sum(axis=1)
+    n = n_c.sum()
+
+    if level == "nominal":
+        delta = 1.0 - np.eye(len(labels))
+    elif level == "ordinal":
+        cum = np.concatenate([[0.0], np.cumsum(n_c)])
+        lo = np.minimum.outer(np.arange(len(labels)), np.arange(len(labels)))
+        hi = np.maximum.outer(np.arange(len(labels)), np.arange(len(labels)))
+        delta = (cum[hi + 1] - cum[lo] - (n_c[lo] + n_c[hi]) / 2) ** 2
+    elif level == "interval":
+        values = labels.astype(float)
+        delta = np.subtract.outer(values, values) ** 2
+    else:
+        raise ValueError(f"Unknown measurement level: {level}")
+
+    expected = (np.outer(n_c, n_c) * delta).sum() / (n * (n - 1))
+    if expected == 0:
+        return 1.0
+    observed = (coincidence * delta).sum() / n
+    return float(1 - observed / expected)
+
+def compare_scores(reference: list, candidate: list) -> dict:
+    """
+    Agreement between two score lists for the same items
+    (e.g. pairwise vs. listwise judging of identical pairs).
+    """
+    if len(reference) != len(candidate):
+        raise ValueError(f"Score lists differ in length: {len(reference)} vs {len(candidate)}")
+    if not reference:
+        return {"n": 0, "mean_abs_error": 0.0, "max_abs_error": 0.0, "bias": 0.0, "pearson_r": None}
+
+    ref = np.asarray(reference, dtype=float)
+    cand = np.asarray(candidate, dtype=float)
+    diff = cand - ref
+    pearson = None
+    if len(ref) > 1 and ref.std() > 0 and cand.std() > 0:
+        pearson = float(np.corrcoef(ref, cand)[0, 1])
+    return {
+        "n": int(len(ref)),
+        "mean_abs_error": float(np.abs(diff).mean()),
+        "max_abs_error": float(np.abs(diff).max()),
+        "bias": float(diff.mean()),
+        "pearson_r": pearson
+    }
+
+
+# ---------------------------------------------------------
+# Resampling confidence intervals
+# Items are collapsed into distinct cells (a score, an (event, score) pair, a
+# (label, label) pair) with their frequencies. A resample is then a row of
+# cell counts, and every statistic below maps a (batch, cells) count matrix to
+# one value (or row) per resample with matrix products -- no Python loop over
+# resamples or items.
+# ---------------------------------------------------------
+
+def _mean_stat(values: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    return weights @ values / weights.sum(axis=1)
+
+
+def _group_mean_stat(values: np.ndarray, onehot: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    """(batch, groups) group means; NaN where a resample drew nothing from a group."""
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return (weights @ (onehot * values[:, None])) / (weights @ onehot)
+
+
+def _kappa_stat(cell_onehot: np.ndarray, n_labels: int, weights: np.ndarray) -> np.ndarray:
+    """Cohen's kappa per resample, from (batch, k, k) confusion matrices."""
+    confusion = (weights @ cell_onehot).reshape(-1, n_labels, n_labels)
+    n = weights.sum(axis=1)
+    observed = np.trace(confusion, axis1=1, axis2=2) / n
+    expected = (confusion.sum(axis=2) * confusion.sum(axis=1)).sum(axis=1) / (n * n)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(expected < 1, (observed - expected) / (1 - expected), 1.0)
+
+
+def _bootstrap_chunk(stat: Callable, inverse: np.ndarray, freq: np.ndarray,
+                     n_resamples: int, seed) -> np.ndarray:
+    """
+    Bootstrap statistics for one chunk of resamples.
+    With few distinct cells the cell counts are drawn directly from a
+    multinomial (exactly a bootstrap resample, at O(cells) per draw);
+    otherwise an index matrix over items is drawn and binned into cells.
+    """
+    rng = np.random.default_rng(seed)
+    n, k = len(inverse), len(freq)
+    direct = k * 4 <= n
+    batch = max(1, RESAMPLE_BATCH_ELEMENTS // (k if direct else n))
+    out = []
+    for start in range(0, n_resamples, batch):
+        size = min(batch, n_resamples - start)
+        if direct:
+            weights = rng.multinomial(n, freq / n, size=size)
+        else:
+            idx = rng.integers(0, n, size=(size, n))
+            bins = (np.arange(size)[:, None] * k + inverse[idx]).ravel()
+            weights = np.bincount(bins, minlength=size * k).reshape(size, k)
+        out.append(stat(weights.astype(float)))
+    return np.concatenate(out)
+
+
+def _bootstrap(stat: Callable, inverse: np.ndarray, freq: np.ndarray,
+               n_resamples: int, seed: Optional[int], workers: int) -> np.ndarray:
+    """
+    Statistic over `n_resamples` bootstrap samples.
+    With workers > 1 the resamples are split across a process pool, each
+    worker drawing from an independent child seed. `stat` must be picklable
+    (a functools.partial of the module-level statistics above is).
+    """
+    if workers <= 1:
+        return _bootstrap_chunk(stat, inverse, freq, n_resamples, seed)
+
+    seeds = np.random.SeedSequence(seed).spawn(workers)
+    counts = [n_resamples // workers + (i < n_resamples % workers) for i in range(workers)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        parts = pool.map(_bootstrap_chunk, [stat] * workers, [inverse] * workers, [freq] * workers, counts, seeds)
+        return np.concatenate(list(parts))
+
+
+def _jackknife(stat: Callable, freq: np.ndarray) -> np.ndarray:
+    """
+    Leave-one-out statistics, one per cell: dropping any of a cell's items
+    gives the same sample. Callers weight each row by `freq`.
+    """
+    return stat(freq[None, :] - np.eye(len(freq)))
+
+
+def _interval(estimate, samples: np.ndarray, freq: np.ndarray, method: str, confidence: float) -> Dict:
+    """Percentile interval for bootstrap samples; normal interval on the jackknife standard error."""
+    alpha = (1 - confidence) / 2
+    if method == "bootstrap":
+        low, high = np.nanpercentile(samples, [100 * alpha, 100 * (1 - alpha)], axis=0)
+        se = np.nanstd(samples, axis=0, ddof=1)
+    else:
+        n = freq.sum()
+        w = freq.reshape((-1,) + (1,) * (samples.ndim - 1))
+        centre = np.nansum(w * samples, axis=0) / n
+        se = np.sqrt((n - 1) / n * np.nansum(w * (samples - centre) ** 2, axis=0))
+        z = NormalDist().inv_cdf(1 - alpha)
+        low, high = estimate - z * se, estimate + z * se
+    return {"estimate": estimate, "ci_low": low, "ci_high": high, "std_error": se}
+
+
+def _resample(stat: Callable, inverse: np.ndarray, freq: np.ndarray, method: str,
+              n_resamples: int, seed: Optional[int], workers: int) -> np.ndarray:
+    if method == "bootstrap":
+        with span("stats.bootstrap", items=int(freq.sum()), cells=len(freq), resamples=n_resamples, workers=workers):
+            return _bootstrap(stat, inverse, freq, n_resamples, seed, workers)
+    if method == "jackknife":
+        with span("stats.jackknife", items=int(freq.sum()), cells=len(freq)):
+            return _jackknife(stat, freq)
+    raise ValueError(f"Unknown resampling method: {method}")
+
+
+def mean_ci(scores: list,
+            method: str = "bootstrap",
+            n_resamples: int = 10000,
+            confidence: float = 0.95,
+            seed: Optional[int] = None,
+            workers: int = 1) -> Dict:
+    """
+    Confidence interval for the mean consistency score.
+
+    Args:
+        scores: Judge scores
+        method: 'bootstrap' (percentile interval) or 'jackknife' (normal interval)
+        n_resamples: Bootstrap resamples (ignored by the jackknife)
+        confidence: Interval coverage
+        seed: RNG seed, for reproducible intervals
+        workers: Processes for the bootstrap; only worth it for very large resample counts
+
+    Returns:
+        Dict with estimate, ci_low, ci_high, std_error, method, n.
+    """
+    if len(scores) < 2:
+        raise ValueError("At least two scores are needed for a confidence interval")
+    values, inverse, freq = np.unique(np.asarray(scores, dtype=float), return_inverse=True, return_counts=True)
+    stat = partial(_mean_stat, values)
+    samples = _resample(stat, inverse, freq, method, n_resamples, seed, workers)
+    result = _interval(float(stat(freq[None, :].astype(float))[0]), samples, freq, method, confidence)
+    return {k: float(v) for k, v in result.items()} | {"method": method, "n": int(len(scores))}
+
+
+def group_means_ci(scores: list,
+                   groups: list,
+                   method: str = "bootstrap",
+                   n_resamples: int = 10000,
+                   confidence: float = 0.95,
+                   seed: Optional[int] = None,
+                   workers: int = 1) -> Dict[str, Dict]:
+    """
+    Confidence intervals for per-group means (e.g. mean score per event).
+    Items are resampled jointly, so group sizes vary across resamples as they
+    would in new data. Arguments as in mean_ci; `groups` gives each score's
+    group label. Groups with a single item get no interval.
+    """
+    if len(scores) != len(groups):
+        raise ValueError(f"Scores and groups differ in length: {len(scores)} vs {len(groups)}")
+    if len(scores) < 2:
+        raise ValueError("At least two scores are needed for a confidence interval")
+    labels, codes = np.unique(np.asarray(groups, dtype=str), return_inverse=True)
+    cells, inverse, freq = np.unique(
+        np.column_stack([codes, np.asarray(scores, dtype=float)]), axis=0, return_inverse=True, return_counts=True
+    )
+    onehot = np.eye(len(labels))[cells[:, 0].astype(int)]
+    stat = partial(_group_mean_stat, cells[:, 1], onehot)
+    samples = _resample(stat, inverse.ravel(), freq, method, n_resamples, seed, workers)
+    result = _interval(stat(freq[None, :].astype(float))[0], samples, freq, method, confidence)
+
+    counts = np.bincount(codes, minlength=len(labels))
+    report = {}
+    for g, label in enumerate(labels):
+        entry = {k: float(v[g]) for k, v in result.items()}
+        if counts[g] < 2:
+            entry.update({"ci_low": None, "ci_high": None, "std_error": None})
+        report[str(label)] = entry | {"method": method, "n": int(counts[g])}
+    return report
+
+
+def kappa_ci(labels_a: list,
+             labels_b: list,
+             method: str = "bootstrap",
+             n_resamples: int = 10000,
+             confidence: float = 0.95,
+             seed: Optional[int] = None,
+             workers: int = 1) -> Dict:
+    """
+    Confidence interval for Cohen's kappa between two raters, resampling labelled items.
+    Arguments as in mean_ci.
+    """
+    if len(labels_a) != len(labels_b):
+        raise ValueError(f"Label lists differ in length: {len(labels_a)} vs {len(labels_b)}")
+    if len(labels_a) < 2:
+        raise ValueError("At least two labelled items are needed for a confidence interval")
+    labels, codes = np.unique(np.asarray(list(labels_a) + list(labels_b), dtype=str), return_inverse=True)
+    k, n = len(labels), len(labels_a)
+    cells, inverse, freq = np.unique(codes[:n] * k + codes[n:], return_inverse=True, return_counts=True)
+    stat = partial(_kappa_stat, np.eye(k * k)[cells], k)
+    samples = _resample(stat, inverse, freq, method, n_resamples, seed, workers)
+    result = _interval(float(stat(freq[None, :].astype(float))[0]), samples, freq, method, confidence)
+    return {k: float(v) for k, v in result.items()} | {"method": method, "n": n}
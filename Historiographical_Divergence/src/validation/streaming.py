@@ -0,0 +1,208 @@
+"""
+Streaming Statistics for Judgment Logs.
+Constant-memory accumulators (Welford mean/variance, fixed-bin score
+histograms with approximate quantiles) that consume judgments one record at
+a time and merge across worker shards.
+"""
+import math
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from functools import reduce
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence
+from src.utils.data_loader import iter_records
+from src.utils.logger import get_logger
+
+logger = get_logger("streaming")
+
+DEFAULT_QUANTILES = (0.1, 0.25, 0.5, 0.75, 0.9)
+
+
+class RunningStats:
+    """Welford's online mean/variance; merge() combines shards exactly (Chan et al.)."""
+
+    __slots__ = ("count", "mean", "m2", "min", "max")
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def push(self, x: float):
+        self.count += 1
+        delta = x - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (x - self.mean)
+        if x < self.min:
+            self.min = x
+        if x > self.max:
+            self.max = x
+
+    def merge(self, other: "RunningStats") -> "RunningStats":
+        if other.count == 0:
+            return self
+        total = self.count + other.count
+        delta = other.mean - self.mean
+        self.m2 += other.m2 + delta * delta * self.count * other.count / total
+        self.mean += delta * other.count / total
+        self.count = total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    def variance(self, ddof: int = 0) -> float:
+        return self.m2 / (self.count - ddof) if self.count > ddof else 0.0
+
+    def std(self, ddof: int = 0) -> float:
+        return math.sqrt(self.variance(ddof))
+
+    def to_dict(self) -> Dict:
+        empty = self.count == 0
+        return {
+            "count": self.count,
+            "mean": self.mean,
+            "std_dev": self.std(),
+            "variance": self.variance(),
+            "min": None if empty else self.min,
+            "max": None if empty else self.max
+        }
+
+
+class ScoreHistogram:
+    """
+    Fixed-width histogram over a bounded score range, with bins centred on
+    lo, lo + width, ..., hi (values outside are clipped). Quantiles use the
+    nearest-rank rule on bin centres, so they are exact for scores on the
+    bin grid (integer 0-100 scores by default) and within width/2 otherwise.
+    """
+
+    __slots__ = ("lo", "width", "counts")
+
+    def __init__(self, lo: float = 0.0, hi: float = 100.0, width: float = 1.0):
+        self.lo = lo
+        self.width = width
+        self.counts = [0] * (int(round((hi - lo) / width)) + 1)
+
+    def push(self, x: float):
+        b = int(round((x - self.lo) / self.width))
+        self.counts[min(len(self.counts) - 1, max(0, b))] += 1
+
+    def merge(self, other: "ScoreHistogram") -> "ScoreHistogram":
+        if (other.lo, other.width, len(other.counts)) != (self.lo, self.width, len(self.counts)):
+            raise ValueError("Cannot merge histograms with different bins")
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+        return self
+
+    @property
+    def total(self) -> int:
+        return sum(self.counts)
+
+    def quantile(self, q: float) -> Optional[float]:
+        total = self.total
+        if total == 0:
+            return None
+        rank = max(1, math.ceil(q * total))
+        seen = 0
+        for b, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return self.lo + b * self.width
+        return self.lo + (len(self.counts) - 1) * self.width
+
+    def to_dict(self, quantiles: Sequence[float] = DEFAULT_QUANTILES) -> Dict:
+        return {f"p{int(round(q * 100))}": self.quantile(q) for q in quantiles}
+
+
+class ScoreAccumulator:
+    """Moments plus histogram for one slice of the judgments (overall, an event, a historian)."""
+
+    __slots__ = ("stats", "histogram")
+
+    def __init__(self):
+        self.stats = RunningStats()
+        self.histogram = ScoreHistogram()
+
+    def push(self, x: float):
+        self.stats.push(x)
+        self.histogram.push(x)
+
+    def merge(self, other: "ScoreAccumulator") -> "ScoreAccumulator":
+        self.stats.merge(other.stats)
+        self.histogram.merge(other.histogram)
+        return self
+
+    def to_dict(self, quantiles: Sequence[float] = DEFAULT_QUANTILES) -> Dict:
+        return self.stats.to_dict() | self.histogram.to_dict(quantiles)
+
+
+class JudgmentSummary:
+    """
+    Streaming summary of a judgment log: score moments and quantiles overall,
+    per event and per historian, plus classification and discrepancy-type counts.
+    Memory grows with the number of events/historians, not of judgments.
+    """
+
+    def __init__(self):
+        self.overall = ScoreAccumulator()
+        self.by_event: Dict[str, ScoreAccumulator] = {}
+        self.by_historian: Dict[str, ScoreAccumulator] = {}
+        self.classifications = Counter()
+        self.discrepancy_types = Counter()
+        self.skipped = 0  # records without a score (failed judgments)
+
+    def update(self, record: Dict):
+        score = record.get('consistency_score')
+        if score is None:
+            self.skipped += 1
+            return
+        score = float(score)
+        self.overall.push(score)
+        self.by_event.setdefault(record.get('event', 'unknown'), ScoreAccumulator()).push(score)
+        self.by_historian.setdefault(record.get('historian', 'unknown'), ScoreAccumulator()).push(score)
+        self.classifications[record.get('classification', 'Unknown')] += 1
+        for d in record.get('discrepancies') or []:
+            self.discrepancy_types[d.get('type', 'Unknown')] += 1
+
+    def update_all(self, records: Iterable[Dict]) -> "JudgmentSummary":
+        for record in records:
+            self.update(record)
+        return self
+
+    def merge(self, other: "JudgmentSummary") -> "JudgmentSummary":
+        self.overall.merge(other.overall)
+        for mine, theirs in ((self.by_event, other.by_event), (self.by_historian, other.by_historian)):
+            for key, acc in theirs.items():
+                mine.setdefault(key, ScoreAccumulator()).merge(acc)
+        self.classifications.update(other.classifications)
+        self.discrepancy_types.update(other.discrepancy_types)
+        self.skipped += other.skipped
+        return self
+
+    def to_dict(self, quantiles: Sequence[float] = DEFAULT_QUANTILES) -> Dict:
+        return {
+            "overall": self.overall.to_dict(quantiles),
+            "by_event": {k: v.to_dict(quantiles) for k, v in sorted(self.by_event.items())},
+            "by_historian": {k: v.to_dict(quantiles) for k, v in sorted(self.by_historian.items())},
+            "classifications": dict(self.classifications.most_common()),
+            "discrepancy_types": dict(self.discrepancy_types.most_common()),
+            "skipped": self.skipped
+        }
+
+    @classmethod
+    def from_file(cls, path: Path) -> "JudgmentSummary":
+        """Summary of a .jsonl log or a JSON array file, streamed either way."""
+        return cls().update_all(iter_records(path))
+
+
+def summarize_files(paths: List[Path], max_workers: int = 1) -> JudgmentSummary:
+    """
+    Summarises one or more judgment files (JSONL shards or JSON arrays). With
+    max_workers > 1 each file is summarised in its own process and the
+    partial summaries are merged.
+    """
+    if max_workers <= 1 or len(paths) <= 1:
+        return reduce(JudgmentSummary.merge, map(JudgmentSummary.from_file, paths), JudgmentSummary())
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        return reduce(JudgmentSummary.merge, pool.map(JudgmentSummary.from_file, paths), JudgmentSummary())
@@ -24,13 +24,14 @@ def test_project_structure():
     try:
         from src.utils.logger import get_logger
         from src.utils.data_loader import load_json, save_json
-        from config.settings import DATA_DIR, EVENTS
+        from src.utils.catalog import load_catalog
+        from config.settings import DATA_DIR
         
         logger = get_logger('test')
         logger.info("Test log message")
         
         print(f"  DATA_DIR: {DATA_DIR}")
-        print(f"  Events: {len(EVENTS)}")
+        print(f"  Events: {len(load_catalog().events)}")
         print("✓ Project structure works")
         return True
     except Exception as e: